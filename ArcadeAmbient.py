@@ -0,0 +1,251 @@
+"""
+Arcade Commander - ArcadeAmbient
+
+Screen-ambient lighting, as Adalight was first built for: every LED takes
+the average color of a region of incoming video frames.
+
+Sources:
+    a directory of images    PNG / JPG sequence, played at `fps` and looped (needs Pillow)
+    "-" or a FIFO / file     raw RGB24 frames of `size` (w, h), e.g. from ffmpeg
+    "mmap:<path>"            a raw RGB24 frame buffer file some other program keeps updating
+
+A capture thread reduces each frame to a small GRID by sampling (the full
+frame is never converted or copied) and keeps only the newest one, so a
+60 FPS source never queues up behind the render rate: frames that arrive
+between two renders are dropped, not buffered. The renderer turns the grid
+into per-LED region averages with one summed-area table.
+
+    capture = FrameCapture("-", size=(1280, 720))
+    engine.update(UiSnapshot(leds, ambient=ScreenAmbient(capture), since=time.monotonic()))
+
+    ffmpeg -i game.mp4 -f rawvideo -pix_fmt rgb24 -s 640x360 - | python ArcadeAmbient.py - --size 640x360
+"""
+
+import argparse
+import glob
+import mmap
+import os
+import stat
+import sys
+import threading
+import time
+
+import numpy as np
+
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+GRID = (160, 90)            # sampled frame size (w, h) the regions are averaged over
+DEFAULT_FPS = 60.0          # image sequences play / frame buffers are polled at this rate
+EDGE = 0.15                 # default regions: this fraction of the frame along the edges
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".bmp")
+
+
+def default_regions(names) -> list:
+    """
+    Normalized (x0, y0, x1, y1) per name: P1 LEDs stacked down the left edge,
+    P2 down the right edge, everything else spread along the top.
+    """
+    names = list(names)
+    p1 = [n for n in names if n.startswith("P1_")]
+    p2 = [n for n in names if n.startswith("P2_")]
+    rest = [n for n in names if n not in p1 and n not in p2]
+    out = {}
+    for group, x0, x1 in ((p1, 0.0, EDGE), (p2, 1.0 - EDGE, 1.0)):
+        for i, n in enumerate(group):
+            out[n] = (x0, i / len(group), x1, (i + 1) / len(group))
+    for i, n in enumerate(rest):
+        out[n] = (i / len(rest), 0.0, (i + 1) / len(rest), EDGE)
+    return [out[n] for n in names]
+
+
+class FrameCapture:
+    """Reads frames on its own thread; `grid` is the newest one as (GRID h, GRID w, 3) uint8."""
+
+    def __init__(self, source: str, size: tuple | None = None, fps: float = DEFAULT_FPS, loop: bool = True):
+        self.source = source
+        self.fps = float(fps)
+        self.loop = loop
+        self.grid = None
+        self.seq = 0                # frames sampled (the renderer shows the newest of them)
+        self.error = None
+        self._files = None
+        self._file = None
+        self._map = None
+        self._frame = None
+        if os.path.isdir(source):
+            if not PIL_AVAILABLE:
+                raise RuntimeError("image sequences need Pillow (pip install pillow)")
+            self._files = sorted(f for f in glob.glob(os.path.join(glob.escape(source), "*"))
+                                 if f.lower().endswith(IMAGE_EXTS))
+            if not self._files:
+                raise ValueError(f"no images in {source}")
+        else:
+            if not size:
+                raise ValueError("raw frames need a size (w, h)")
+            w, h = (int(v) for v in size)
+            if source.startswith("mmap:"):
+                path = source[5:]
+                with open(path, "rb") as f:
+                    self._map = mmap.mmap(f.fileno(), w * h * 3, access=mmap.ACCESS_READ)
+                self._frame = np.frombuffer(self._map, dtype=np.uint8).reshape(h, w, 3)
+            else:
+                self._file = sys.stdin.buffer if source == "-" else open(source, "rb")
+                self._raw = bytearray(w * h * 3)
+                self._frame = np.frombuffer(self._raw, dtype=np.uint8).reshape(h, w, 3)
+                # a regular file reads instantly: pace it; a pipe / stdin paces itself
+                self._paced = source != "-" and not stat.S_ISFIFO(os.stat(source).st_mode)
+            self._set_sampler(w, h)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="ArcadeCapture", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._stop.set()
+
+    def _set_sampler(self, w: int, h: int):
+        """Pixel rows / columns nearest the GRID cell centers (computed once per frame size)."""
+        gw, gh = GRID
+        self._ys = ((np.arange(gh) + 0.5) * h / gh).astype(np.intp)[:, None]
+        self._xs = ((np.arange(gw) + 0.5) * w / gw).astype(np.intp)[None, :]
+        self._size = (w, h)
+
+    def _publish(self, grid):
+        self.grid = grid    # one reference swap: the renderer only ever sees whole frames
+        self.seq += 1
+
+    def _loop(self):
+        period = 1.0 / self.fps
+        next_t = time.monotonic()
+        try:
+            i = 0
+            while not self._stop.is_set():
+                if self._files is not None:
+                    if i == len(self._files):
+                        if not self.loop:
+                            break
+                        i = 0
+                    self._publish(self._load_image(self._files[i]))
+                    i += 1
+                elif self._map is not None:
+                    self._publish(self._frame[self._ys, self._xs])
+                else:
+                    view = memoryview(self._raw)
+                    got = 0
+                    while got < len(self._raw):
+                        n = self._file.readinto(view[got:])
+                        if not n:
+                            return
+                        got += n
+                    self._publish(self._frame[self._ys, self._xs])
+                    if not self._paced:
+                        continue
+                next_t += period
+                now = time.monotonic()
+                if next_t < now - 1.0:
+                    next_t = now  # fell far behind: resync instead of bursting
+                self._stop.wait(max(0.0, next_t - now))
+        except (OSError, ValueError) as e:
+            self.error = e
+            print(f"Frame capture stopped: {e}")
+        finally:
+            if self._map is not None:
+                self._frame = None
+                self._map.close()
+            elif self._file is not None and self._file is not sys.stdin.buffer:
+                self._file.close()
+
+    def _load_image(self, path):
+        with Image.open(path) as img:
+            img.draft("RGB", (GRID[0] * 2, GRID[1] * 2))  # JPEG: decode at reduced size
+            return np.asarray(img.convert("RGB").resize(GRID, Image.BOX))
+
+
+class ScreenAmbient:
+    """Ambient effect: each named LED shows the average color of its region of the captured frame."""
+
+    label = "SCREEN"    # status bar mode
+    live = True         # runs until stopped, attract mode stays off
+
+    def __init__(self, capture: FrameCapture, regions: dict | None = None):
+        self.capture = capture
+        self.regions = regions      # {"P1_A": [x0, y0, x1, y1], ...} normalized; None = default_regions
+        self._leds = None
+        self._seq = -1
+        self._sat = np.zeros((GRID[1] + 1, GRID[0] + 1, 3), dtype=np.float64)
+
+    def close(self):
+        self.capture.close()
+
+    def _bind(self, leds):
+        self._leds = leds
+        rects = default_regions(leds.names)
+        if self.regions:
+            rects = [tuple(self.regions.get(n, r)) for n, r in zip(leds.names, rects)]
+        r = np.clip(np.array(rects, dtype=np.float64), 0.0, 1.0)
+        gw, gh = GRID
+        # grid cell edges for every region; at least one cell each
+        self._x0 = np.minimum((r[:, 0] * gw).astype(np.intp), gw - 1)
+        self._y0 = np.minimum((r[:, 1] * gh).astype(np.intp), gh - 1)
+        self._x1 = np.maximum(np.ceil(r[:, 2] * gw).astype(np.intp), self._x0 + 1)
+        self._y1 = np.maximum(np.ceil(r[:, 3] * gh).astype(np.intp), self._y0 + 1)
+        self._area = ((self._x1 - self._x0) * (self._y1 - self._y0)).astype(np.float64)[:, None]
+        self._seq = -1
+
+    def draw(self, layer, leds, now: float):
+        """Paint `layer` from the newest frame. Returns False when no new frame arrived."""
+        if leds is None:
+            return False
+        if leds is not self._leds:
+            self._bind(leds)
+        grid, seq = self.capture.grid, self.capture.seq
+        if grid is None or seq == self._seq:
+            return False
+        self._seq = seq
+        sat = self._sat
+        np.cumsum(grid, axis=0, out=sat[1:, 1:])
+        np.cumsum(sat[1:, 1:], axis=1, out=sat[1:, 1:])
+        x0, y0, x1, y1 = self._x0, self._y0, self._x1, self._y1
+        sums = sat[y1, x1] - sat[y0, x1] - sat[y1, x0] + sat[y0, x0]
+        layer.alpha[:] = 0.0
+        layer.rgb[leds.index] = sums / self._area
+        layer.alpha[leds.index] = 1.0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Arcade Commander screen-ambient lighting")
+    ap.add_argument("source", help="image directory, '-' (stdin), a FIFO / raw file, or mmap:<path>")
+    ap.add_argument("--size", default=None, help="raw frame size WxH (e.g. 640x360)")
+    ap.add_argument("--fps", type=float, default=DEFAULT_FPS, help="image / frame buffer rate")
+    ap.add_argument("--port", default=None, help="LED output port (default: driver DEFAULT_PORT)")
+    args = ap.parse_args()
+
+    from ArcadeDriver import Arcade
+    from ArcadeEngine import LedState, RenderEngine, Renderer, UiSnapshot
+
+    size = tuple(int(v) for v in args.size.lower().split("x")) if args.size else None
+    capture = FrameCapture(args.source, size=size, fps=args.fps)
+    cab = Arcade(port=args.port)
+    engine = RenderEngine(Renderer(cab))
+    engine.update(UiSnapshot(LedState(cab.LEDS).snapshot(cab.LEDS), ScreenAmbient(capture), time.monotonic()))
+    t0, seq0, ticks0 = time.monotonic(), capture.seq, engine.ticks
+    try:
+        while capture._thread.is_alive():
+            time.sleep(1.0)
+            dt = time.monotonic() - t0
+            print(f"\rcapture {(capture.seq - seq0) / dt:5.1f} FPS | render {(engine.ticks - ticks0) / dt:5.1f} FPS",
+                  end="", flush=True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print()
+        capture.close()
+        engine.close()
+        cab.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Arcade Commander - ArcadeAudio
+
+Audio-reactive lighting from a PCM stream: a WAV file (looped), stdin or a
+named pipe. A reader thread takes fixed-size blocks, runs one windowed FFT
+per block and publishes the latest features (band energies, level, beat
+onsets); the render thread maps them onto LED groups at the frame rate.
+
+Everything is preallocated, so memory stays flat and the CPU cost is one
+1024-point real FFT per block, however long the cabinet plays.
+
+    stream = AudioStream("SystemReady.wav")            # or "-" (stdin), or a FIFO path
+    engine.update(UiSnapshot(leds, ambient=AudioReactive(stream), since=time.monotonic()))
+    ...
+    stream.close()
+
+Raw PCM sources default to signed 16-bit little endian, 44100 Hz, stereo:
+
+    arecord -f S16_LE -r 44100 -c 2 | python ArcadeAudio.py - --port COM3
+    python ArcadeAudio.py SystemReady.wav              # band meter in the terminal
+"""
+
+import argparse
+import os
+import stat
+import sys
+import threading
+import time
+import wave
+from typing import NamedTuple
+
+import numpy as np
+
+BLOCK = 1024                # samples per analysis block (23 ms at 44.1 kHz)
+NUM_BANDS = 8               # log-spaced from MIN_FREQ to Nyquist
+MIN_FREQ = 40.0
+ATTACK = 0.6                # band smoothing per block (rise / fall)
+RELEASE = 0.15
+NORM_DECAY = 0.999          # per-block decay of the running peak used to normalize bands
+ONSET_HISTORY = 43          # blocks (about 1 s) of spectral flux for the adaptive threshold
+ONSET_SENSITIVITY = 1.5     # flux above mean + this many std devs is an onset
+ONSET_HOLD = 0.1            # seconds; no second onset inside this window
+ONSET_DECAY = 0.15          # seconds for the onset flash to fade on the LEDs
+
+# LED groups: name prefix -> (bands, color). Everything else is the system group.
+GROUP_P1 = "P1"
+GROUP_P2 = "P2"
+GROUP_SYSTEM = "system"
+DEFAULT_GROUPS = {
+    GROUP_P1: ((0, 2), (255, 0, 40)),           # bass
+    GROUP_P2: ((2, 5), (0, 80, 255)),           # mids
+    GROUP_SYSTEM: ((5, NUM_BANDS), (255, 255, 255)),  # highs, plus a flash on every onset
+}
+
+_DTYPES = {1: np.uint8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+
+
+class AudioFeatures(NamedTuple):
+    """One analysis block. Arrays are read-only and replaced, never mutated."""
+    bands: np.ndarray       # (NUM_BANDS,) float32, 0..1 (normalized to the running peak)
+    level: float            # overall RMS, 0..1 of full scale
+    onset_at: float         # time.monotonic() of the latest onset (0.0 = none yet)
+    t: float                # time.monotonic() when the block was analyzed
+
+
+class AudioAnalyzer:
+    """Band energies and spectral-flux onsets, one fixed-size block at a time."""
+
+    def __init__(self, rate: int, block: int = BLOCK, num_bands: int = NUM_BANDS):
+        self.rate = int(rate)
+        self.block = int(block)
+        self.window = np.hanning(self.block).astype(np.float32)
+        freqs = np.fft.rfftfreq(self.block, 1.0 / self.rate)
+        edges = np.geomspace(MIN_FREQ, self.rate / 2, num_bands + 1)
+        # bin -> band index; bins below MIN_FREQ are dropped
+        band = np.searchsorted(edges, freqs, side="right") - 1
+        keep = (band >= 0) & (band < num_bands)
+        self._bins = np.flatnonzero(keep)
+        self._band = band[keep]
+        self._counts = np.maximum(np.bincount(self._band, minlength=num_bands), 1)
+        self.num_bands = num_bands
+        self.bands = np.zeros(num_bands, dtype=np.float32)
+        self._peak = np.full(num_bands, 1e-6, dtype=np.float32)
+        self._prev_mag = np.zeros(len(self._bins), dtype=np.float32)
+        self._flux = np.zeros(ONSET_HISTORY, dtype=np.float32)
+        self._flux_i = 0
+        self._flux_n = 0
+        self.onset_at = 0.0
+
+    def process(self, mono, now: float) -> AudioFeatures:
+        """`mono`: (block,) float32 samples in -1..1."""
+        level = float(np.sqrt(np.mean(mono * mono)))
+        mag = np.abs(np.fft.rfft(mono * self.window))[self._bins].astype(np.float32)
+        energy = np.bincount(self._band, weights=mag, minlength=self.num_bands) / self._counts
+
+        # normalize to a slowly decaying per-band peak, then smooth (fast attack, slow release)
+        self._peak = np.maximum(self._peak * NORM_DECAY, energy)
+        target = (energy / self._peak).astype(np.float32)
+        k = np.where(target > self.bands, ATTACK, RELEASE)
+        self.bands += (target - self.bands) * k
+
+        # onset: positive spectral flux well above its recent average
+        flux = float(np.maximum(mag - self._prev_mag, 0.0).sum())
+        self._prev_mag = mag
+        hist = self._flux[:self._flux_n]
+        if self._flux_n >= 8 and flux > hist.mean() + ONSET_SENSITIVITY * hist.std() \
+                and now - self.onset_at > ONSET_HOLD:
+            self.onset_at = now
+        self._flux[self._flux_i] = flux
+        self._flux_i = (self._flux_i + 1) % ONSET_HISTORY
+        self._flux_n = min(self._flux_n + 1, ONSET_HISTORY)
+
+        bands = self.bands.copy()
+        bands.flags.writeable = False
+        return AudioFeatures(bands, min(level, 1.0), self.onset_at, now)
+
+
+class AudioStream:
+    """
+    Reads `source` on its own thread and keeps `features` current.
+    source: a .wav path (looped by default), "-" for stdin, or a path to a
+    FIFO / raw PCM file (format from rate / channels / width).
+    """
+
+    def __init__(self, source: str, rate: int = 44100, channels: int = 2, width: int = 2,
+                 loop: bool = True, block: int = BLOCK):
+        self.source = source
+        self.loop = loop
+        self.features = None
+        self.blocks = 0
+        self.error = None
+        self._wav = None
+        if source.lower().endswith(".wav"):
+            self._wav = wave.open(source, "rb")
+            rate, channels, width = self._wav.getframerate(), self._wav.getnchannels(), self._wav.getsampwidth()
+            self._file = None
+            self._realtime = True    # a file reads instantly: pace it at its sample rate
+        elif source == "-":
+            self._file = sys.stdin.buffer
+            self._realtime = False   # a live pipe paces itself
+        else:
+            self._file = open(source, "rb")
+            self._realtime = not stat.S_ISFIFO(os.stat(source).st_mode)
+        if width not in _DTYPES:
+            self._close_source()
+            raise ValueError(f"unsupported sample width {width} bytes (8, 16 or 32 bit PCM)")
+        self.rate, self.channels, self.width = int(rate), int(channels), int(width)
+        self.block = int(block)
+        self.analyzer = AudioAnalyzer(self.rate, self.block)
+        self._dtype = _DTYPES[width]
+        self._raw = bytearray(self.block * self.channels * self.width)
+        self._mono = np.zeros(self.block, dtype=np.float32)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="ArcadeAudio", daemon=True)
+        self._thread.start()
+
+    def close(self):
+        """Stop reading; the thread closes the source (a blocked pipe read ends with the pipe)."""
+        self._stop.set()
+
+    def _close_source(self):
+        if self._wav:
+            self._wav.close()
+        elif self._file and self._file is not sys.stdin.buffer:
+            self._file.close()
+
+    def _read_block(self) -> bool:
+        if self._wav:
+            data = self._wav.readframes(self.block)
+            if len(data) < len(self._raw) and self.loop:
+                self._wav.rewind()
+                data += self._wav.readframes(self.block - len(data) // (self.channels * self.width))
+            if len(data) < len(self._raw):
+                return False
+            self._raw[:] = data
+            return True
+        view = memoryview(self._raw)
+        got = 0
+        while got < len(self._raw):
+            n = self._file.readinto(view[got:])
+            if not n:
+                return False
+            got += n
+        return True
+
+    def _loop(self):
+        scale = 1.0 / float(1 << (8 * self.width - 1))
+        period = self.block / self.rate
+        next_t = time.monotonic()
+        try:
+            while not self._stop.is_set():
+                if not self._read_block():
+                    break
+                pcm = np.frombuffer(self._raw, dtype=self._dtype).reshape(-1, self.channels)
+                np.mean(pcm, axis=1, out=self._mono)
+                if self.width == 1:
+                    self._mono -= 128.0  # 8-bit PCM is unsigned
+                self._mono *= scale
+                now = time.monotonic()
+                self.features = self.analyzer.process(self._mono, now)
+                self.blocks += 1
+                if self._realtime:
+                    next_t += period
+                    if next_t < now - 1.0:
+                        next_t = now  # fell far behind (suspend, debugger): don't burst
+                    self._stop.wait(max(0.0, next_t - time.monotonic()))
+        except (OSError, ValueError) as e:
+            self.error = e
+            print(f"Audio stream stopped: {e}")
+        finally:
+            self._close_source()
+
+
+class AudioReactive:
+    """Ambient effect: each LED group follows its bands; the system group also flashes on onsets."""
+
+    label = "AUDIO"     # status bar mode
+    live = True         # runs until stopped, attract mode stays off
+
+    def __init__(self, stream: AudioStream, groups: dict | None = None):
+        self.stream = stream
+        self.groups = dict(DEFAULT_GROUPS if groups is None else groups)
+        self._leds = None
+        self._slices = []
+        self._drawn = None
+
+    def close(self):
+        self.stream.close()
+
+    def _bind(self, leds):
+        """Group the named LEDs by prefix (cached per LedArrays)."""
+        self._leds = leds
+        self._slices = []
+        claimed = set()
+        for group, ((b0, b1), color) in self.groups.items():
+            if group == GROUP_SYSTEM:
+                continue
+            rows = [i for i, n in enumerate(leds.names) if n.startswith(group + "_")]
+            claimed.update(rows)
+            self._slices.append((leds.index[rows], b0, b1, np.asarray(color, dtype=np.float32), False))
+        if GROUP_SYSTEM in self.groups:
+            (b0, b1), color = self.groups[GROUP_SYSTEM]
+            rows = [i for i in range(len(leds.names)) if i not in claimed]
+            self._slices.append((leds.index[rows], b0, b1, np.asarray(color, dtype=np.float32), True))
+
+    def draw(self, layer, leds, now: float):
+        """Paint `layer` (an ArcadeCompositor Layer). Returns False when nothing new to show."""
+        if leds is None:
+            return False
+        if leds is not self._leds:
+            self._bind(leds)
+            self._drawn = None
+        f = self.stream.features
+        flash = 0.0
+        if f is not None and f.onset_at:
+            flash = max(0.0, 1.0 - (now - f.onset_at) / ONSET_DECAY)
+        key = (f.t if f is not None else None, flash)
+        if key == self._drawn:
+            return False
+        self._drawn = key
+        layer.alpha[:] = 0.0
+        for idx, b0, b1, color, onset in self._slices:
+            if not len(idx):
+                continue
+            e = float(f.bands[b0:b1].mean()) if f is not None else 0.0
+            if onset:
+                e = max(e, flash)
+            layer.rgb[idx] = color * e
+            layer.alpha[idx] = 1.0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Arcade Commander audio-reactive lighting")
+    ap.add_argument("source", help=".wav file, '-' for stdin, or a FIFO / raw PCM path")
+    ap.add_argument("--rate", type=int, default=44100, help="raw PCM sample rate")
+    ap.add_argument("--channels", type=int, default=2, help="raw PCM channels")
+    ap.add_argument("--width", type=int, default=2, help="raw PCM bytes per sample (1, 2 or 4)")
+    ap.add_argument("--port", default=None, help="drive the LEDs on this port instead of printing a meter")
+    args = ap.parse_args()
+
+    stream = AudioStream(args.source, args.rate, args.channels, args.width)
+    engine = cab = None
+    if args.port:
+        from ArcadeDriver import Arcade
+        from ArcadeEngine import LedState, RenderEngine, Renderer, UiSnapshot
+        cab = Arcade(port=args.port)
+        engine = RenderEngine(Renderer(cab))
+        engine.update(UiSnapshot(LedState(cab.LEDS).snapshot(cab.LEDS), AudioReactive(stream), time.monotonic()))
+    try:
+        while stream._thread.is_alive():
+            f = stream.features
+            if f is not None and not engine:
+                bars = "".join(" .:-=+*#%@"[min(int(b * 10), 9)] for b in f.bands)
+                beat = "BEAT" if time.monotonic() - f.onset_at < ONSET_DECAY else "    "
+                print(f"\r[{bars}] level {f.level:.2f} {beat}", end="", flush=True)
+            time.sleep(0.03)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print()
+        stream.close()
+        if engine:
+            engine.close()
+            cab.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# ArcadeBench.py
+# Micro-benchmarks for the ArcadeDriver hot path (no hardware needed).
+# Usage:
+#   python ArcadeBench.py            # encode cost per frame, legacy vs FrameEncoder
+#                                    # + pulse tick cost, per-LED loop vs array renderer
+
+import math
+import struct
+import sys
+import timeit
+
+import numpy as np
+
+from ArcadeDriver import BUTTON_ORDER, TRACKBALL_ORDER, Arcade, FrameEncoder, wheel
+from ArcadeEngine import LedState, Renderer, UiSnapshot
+
+
+def legacy_encode(pixels):
+    """The pre-FrameEncoder show() body: per-pixel order parsing + fresh buffers."""
+    count = len(pixels) - 1
+    checksum = ((count >> 8) & 0xFF) ^ (count & 0xFF) ^ 0x55
+    header = struct.pack(">3sBBB", b"Ada", (count >> 8) & 0xFF, count & 0xFF, checksum)
+
+    payload = bytearray()
+    for i, (r, g, b) in enumerate(pixels):
+        if i == 16:
+            mode = TRACKBALL_ORDER.strip().upper()
+        else:
+            mode = BUTTON_ORDER.strip().upper()
+
+        if mode == "GRB":
+            payload.extend((g, r, b))
+        elif mode == "BGR":
+            payload.extend((b, g, r))
+        elif mode == "RBG":
+            payload.extend((r, b, g))
+        elif mode == "GBR":
+            payload.extend((g, b, r))
+        elif mode == "BRG":
+            payload.extend((b, r, g))
+        else:
+            payload.extend((r, g, b))
+    return header + payload
+
+
+def _per_frame_us(fn, number):
+    best = min(timeit.repeat(fn, number=number, repeat=5))
+    return best / number * 1e6
+
+
+def bench_encode(num_leds: int, number: int = 2000):
+    pixels = [wheel(i * 7) for i in range(num_leds)]
+    rgb = bytearray(b"".join(bytes(c) for c in pixels))
+    rgb_view = np.frombuffer(rgb, dtype=np.uint8)
+    enc = FrameEncoder(num_leds)
+
+    # both paths must produce identical wire bytes
+    assert bytes(legacy_encode(pixels)) == bytes(enc.encode(rgb_view))
+
+    before = _per_frame_us(lambda: legacy_encode(pixels), number)
+    after = _per_frame_us(lambda: enc.encode(rgb_view), number)
+
+    # same encoder with gamma + white balance tables and the current limiter on
+    enc.set_correction(gamma=2.2, brightness=0.8, white_balance=(1.0, 0.9, 0.8))
+    enc.power_budget_ma = 1000.0
+    corrected = _per_frame_us(lambda: enc.encode(rgb_view), number)
+    return before, after, corrected
+
+
+def legacy_pulse_tick(cab, led_state):
+    """The pre-ArcadeEngine pulse tick: a dict per LED, math.sin and cab.set() each."""
+    with cab.batch():
+        for n, d in led_state.items():
+            if not d['pulse']:
+                continue
+            d['phase'] += 0.1 * d['speed']
+            f = (math.sin(d['phase']) + 1) / 2
+            c1, c2 = d['primary'], d['secondary']
+            cab.set(n, (int(c1[0] + (c2[0] - c1[0]) * f), int(c1[1] + (c2[1] - c1[1]) * f),
+                        int(c1[2] + (c2[2] - c1[2]) * f)))
+
+
+def bench_pulse(num_leds: int, number: int = 500):
+    cab = Arcade(port="null://", num_leds=num_leds)
+    cab.close_port()  # render cost only: show() returns before encoding
+    cab.LEDS = {f"L{i}": i for i in range(num_leds)}
+    legacy = {n: {'primary': (255, 0, 0), 'secondary': (0, 0, 255), 'pulse': True, 'speed': 1.0, 'phase': 0.0}
+              for n in cab.LEDS}
+    state = LedState(cab.LEDS)
+    state.primary[:] = (255, 0, 0)
+    state.secondary[:] = (0, 0, 255)
+    state.pulse[:] = True
+    render = Renderer(cab)
+    snap = UiSnapshot(state.snapshot(cab.LEDS))
+    render(0.0, snap)
+    clock = iter(range(1, 10 ** 9))
+
+    before = _per_frame_us(lambda: legacy_pulse_tick(cab, legacy), number)
+    after = _per_frame_us(lambda: render(next(clock) * 0.03, snap), number)
+    cab.close()
+    return before, after
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [30, 150, 600]
+    print("=== ENCODE COST PER FRAME ===")
+    print(f"{'LEDs':>6} {'legacy us':>12} {'encoder us':>12} {'speedup':>9} {'+LUT/power us':>14}")
+    for n in sizes:
+        before, after, corrected = bench_encode(n)
+        print(f"{n:>6} {before:>12.2f} {after:>12.2f} {before / after:>8.1f}x {corrected:>14.2f}")
+
+    print()
+    print("=== PULSE TICK COST (all LEDs pulsing) ===")
+    print(f"{'LEDs':>6} {'per-LED us':>12} {'arrays us':>12} {'speedup':>9}")
+    for n in sizes:
+        before, after = bench_pulse(n)
+        print(f"{n:>6} {before:>12.2f} {after:>12.2f} {before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
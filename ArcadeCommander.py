@@ -1,5 +1,5 @@
 import tkinter as tk
-from tkinter import colorchooser, messagebox, filedialog
+from tkinter import colorchooser, messagebox, filedialog, font as tkfont
 import json
 import time
 import math
@@ -34,21 +34,56 @@ except ImportError:
 
 # --- DRIVER IMPORTS ---
 try:
-    from ArcadeDriver import Arcade, available_ports, wheel
+    from ArcadeDriver import Arcade, ArcadeGroup, available_ports, wheel
 except ImportError:
     # Fallback if driver missing
+    import contextlib
     class Arcade:
         LEDS = {}
-        def __init__(self, port=None): pass
+        def __init__(self, port=None, **kwargs): pass
         def set(self, n, c): pass
         def set_all(self, c): pass
         def show(self): pass
         def close(self): pass
         def is_connected(self): return False
         def reconnect(self, port): pass
+        def batch(self): return contextlib.nullcontext(self)
+    ArcadeGroup = Arcade
     def available_ports(): return []
     def wheel(p): return (0,0,0)
 
+# --- GUI SCHEDULER (all periodic Tk work on one timer) ---
+from ArcadeScheduler import Scheduler
+
+# --- NETWORK OUTPUT IMPORT ---
+try:
+    from ArcadeNetwork import open_output
+    NETWORK_AVAILABLE = True
+except ImportError:
+    NETWORK_AVAILABLE = False
+
+# --- RENDER ENGINE IMPORT ---
+try:
+    from ArcadeEngine import (RenderEngine, Renderer, UiSnapshot, LedState,
+                              EFFECT_CYCLE, EFFECT_DEMO, EFFECT_ATTRACT)
+    from ArcadeTimeline import load_timeline
+    from ArcadeEffects import Flash, Release
+    from ArcadeAudio import AudioStream, AudioReactive
+    from ArcadeAmbient import FrameCapture, ScreenAmbient
+    from ArcadePlugins import PluginManager, PluginEffect
+    ENGINE_AVAILABLE = True
+except ImportError:
+    ENGINE_AVAILABLE = False
+    EFFECT_CYCLE, EFFECT_DEMO, EFFECT_ATTRACT = "cycle", "demo", "attract"
+    print("DEBUG: ArcadeEngine.py not found. Effects disabled.")
+
+# --- INPUT THREAD IMPORT ---
+try:
+    from ArcadeInput import InputThread, KIND_DOWN, KIND_HAT, KIND_AXIS
+    INPUT_AVAILABLE = PYGAME_AVAILABLE
+except ImportError:
+    INPUT_AVAILABLE = False
+
 # --- HARDWARE TESTER IMPORT ---
 try:
     from ArcadeTester import quick_sanity_test, button_finder, attract_demo
@@ -58,6 +93,9 @@ except ImportError:
     print("DEBUG: ArcadeTester.py not found. LED Tests disabled.")
 
 APP_VERSION = "V1.2"
+IDLE_TIMEOUT = 600  # seconds without input before attract mode
+GUI_FPS = 30        # cosmetic animation (title) frame rate cap; "gui_fps" in ac_settings.json, 0 = static
+GUI_BUDGET = 0.05   # share of the Tk thread it may use ("gui_budget"); slower frames stretch the interval
 
 # --- HARDCODED INPUT MAP ---
 INPUT_MAP = {
@@ -133,6 +171,46 @@ class ModernButton(tk.Button):
         self.hover_bg = self.adjust_brightness(hex_color, 1.25)
         self.configure(bg=hex_color, activebackground=self.hover_bg)
 
+class LedPreview(tk.Canvas):
+    """
+    One dot per button LED showing the frame last written to the controller.
+    It is a driver frame sink: the writer thread only stores the frame and queues a wakeup
+    (wake_threadsafe, no Tk calls) for the "preview" scheduler task, which repaints at most `fps` times a second and only the
+    dots whose color changed. No new frames (or the window hidden): the task sleeps.
+    """
+    DOT, GAP = 12, 5
+    def __init__(self, master, leds_map, sched, fps=15.0, **kwargs):
+        kwargs.setdefault('bg', COLORS["BG"])
+        super().__init__(master, height=self.DOT + 4, highlightthickness=0, bd=0, **kwargs)
+        self.leds, self.sched, self.interval = leds_map, sched, 1.0 / fps
+        groups = [[n for n in leds_map if n.startswith("P1_")], [n for n in leds_map if not n.startswith(("P1_", "P2_"))], [n for n in leds_map if n.startswith("P2_")]]
+        self._dots, x = [], 2
+        for g in groups:
+            for n in g:
+                self._dots.append([n, self.create_oval(x, 2, x + self.DOT, 2 + self.DOT, fill="#000000", outline=COLORS["SURFACE_LIGHT"]), None])
+                x += self.DOT + self.GAP
+            x += self.GAP * 2
+        self.configure(width=x)
+        self._frame, self.seq, self._seen, self._armed = b"", 0, 0, False
+        sched.add("preview", self.update_dots)
+        self.bind("<Map>", lambda e: sched.wake("preview"))
+    def __call__(self, rgb):
+        # driver writer thread: copy the frame, wake the Tk task once per burst
+        self._frame = bytes(rgb); self.seq += 1
+        if not self._armed: self._armed = True; self.sched.wake_threadsafe("preview")
+    def update_dots(self):
+        if not self.winfo_viewable(): return None  # stays armed: <Map> resumes it
+        if self.seq == self._seen:
+            self._armed = False
+            if self.seq == self._seen: return None  # re-checked: a frame may have landed in between
+        self._seen, f = self.seq, self._frame
+        for dot in self._dots:
+            o = self.leds.get(dot[0], -1) * 3
+            if o < 0 or o + 3 > len(f): continue
+            col = f"#{f[o]:02x}{f[o+1]:02x}{f[o+2]:02x}"
+            if col != dot[2]: dot[2] = col; self.itemconfigure(dot[1], fill=col)
+        return self.interval
+
 # =========================================================
 #  INTEGRATED DEBUGGER WINDOW (BTN TEST)
 # =========================================================
@@ -160,8 +238,11 @@ class InputTestWindow(tk.Toplevel):
         self.init_hardware()
 
     def init_hardware(self):
-        """Set all LEDs to White on open."""
-        if self.controller.is_connected():
+        """Set all LEDs to White on open (the engine's base layer while this window is up)."""
+        if ENGINE_AVAILABLE:
+            self.led_state = LedState(self.controller.cab.LEDS.keys())
+            self.led_state.primary[:] = 255
+        elif self.controller.is_connected():
             self.controller.cab.set_all((255, 255, 255))
             self.controller.cab.show()
 
@@ -172,7 +253,7 @@ class InputTestWindow(tk.Toplevel):
         
         # 1. Swap Inputs Checkbox
         self.swap_var = tk.BooleanVar(value=False)
-        tk.Checkbutton(f, text="Swap P1/P2", variable=self.swap_var, 
+        tk.Checkbutton(f, text="Swap P1/P2", variable=self.swap_var, command=self.on_swap_toggle,
                        bg="#1E1E1E", fg="white", selectcolor="#333333",
                        activebackground="#1E1E1E", activeforeground="white").pack(side="left", padx=10)
 
@@ -210,18 +291,14 @@ class InputTestWindow(tk.Toplevel):
         panel("SYSTEM", [["TRACKBALL"], ["SPINNER_X", "SPINNER_Y"], ["MENU", "REWIND"]])
         panel("PLAYER 2", [["P2_UP"], ["P2_LEFT", "P2_DOWN", "P2_RIGHT"], ["P2_A", "P2_B", "P2_C"], ["P2_X", "P2_Y", "P2_Z"], ["P2_START"]])
 
-    def handle_pygame_event(self, event):
-        if event.type == pygame.JOYBUTTONDOWN:
-            real_id = self.get_swapped_id(event.joy)
-            key = f"{real_id}_{event.button}"
-            if key in INPUT_MAP:
-                self.activate_button(INPUT_MAP[key])
-        elif event.type == pygame.JOYHATMOTION:
-            real_id = self.get_swapped_id(event.joy)
-            self.handle_dpad(real_id, event.value)
-        elif event.type == pygame.JOYAXISMOTION:
-            real_id = self.get_swapped_id(event.joy)
-            self.handle_axis(real_id, event.axis, event.value)
+    def handle_input_event(self, ev):
+        # ArcadeInput events: joy is already swapped, the name already resolved
+        if ev.kind == KIND_DOWN:
+            if ev.name: self.activate_button(ev.name)
+        elif ev.kind == KIND_HAT:
+            self.handle_dpad(ev.joy, ev.value)
+        elif ev.kind == KIND_AXIS:
+            self.handle_axis(ev.joy, ev.code, ev.value)
 
     def handle_mouse(self, event):
         if not self.trackball_var.get():
@@ -236,8 +313,8 @@ class InputTestWindow(tk.Toplevel):
         if abs(event.y - self.last_mouse_y) > 2: self.gui_flash("SPINNER_Y", lock=True)
         self.last_mouse_x, self.last_mouse_y = event.x, event.y
 
-    def get_swapped_id(self, original):
-        return (1 if original == 0 else 0) if self.swap_var.get() else original
+    def on_swap_toggle(self):
+        if self.controller.input: self.controller.input.set_swap(self.swap_var.get())
 
     def handle_dpad(self, joy, val):
         p = "P1" if joy == 0 else "P2"
@@ -259,8 +336,9 @@ class InputTestWindow(tk.Toplevel):
 
     def activate_button(self, name):
         self.gui_flash(name, lock=True)
-        if self.controller.is_connected() and name in self.controller.cab.LEDS:
-            threading.Thread(target=self.cycle_led, args=(name,), daemon=True).start()
+        # the LED effect (R -> B -> G, hold green) was posted straight from the input thread
+        if not self.controller.engine and self.controller.is_connected() and name in self.controller.cab.LEDS:
+            with self.controller.cab.batch(): self.controller.cab.set(name, (0, 255, 0))
 
     def gui_flash(self, name, lock=False):
         if name in self.gui_buttons:
@@ -268,14 +346,6 @@ class InputTestWindow(tk.Toplevel):
             if not lock:
                 self.after(200, lambda: self.gui_buttons[name].configure(bg="#333333", fg="white"))
 
-    def cycle_led(self, name):
-        try:
-            cab = self.controller.cab
-            cab.set(name, (255,0,0)); cab.show(); time.sleep(0.1)
-            cab.set(name, (0,0,255)); cab.show(); time.sleep(0.1)
-            cab.set(name, (0,255,0)); cab.show()
-        except: pass
-
 # =========================================================
 #  MAIN APPLICATION
 # =========================================================
@@ -284,12 +354,8 @@ class ArcadeGUI_V1_2:
         self.root = root
         self.root.withdraw()
         
-        if PYGAME_AVAILABLE:
-            os.environ["SDL_VIDEODRIVER"] = "dummy"
-            pygame.init()
-            pygame.display.init()
-            pygame.joystick.init()
-            if WINSOUND_AVAILABLE: pygame.mixer.init()
+        # display + joystick are initialized on the input thread (InputThread)
+        if PYGAME_AVAILABLE and WINSOUND_AVAILABLE: pygame.mixer.init()
 
         self.show_splash()
 
@@ -330,29 +396,65 @@ class ArcadeGUI_V1_2:
             self.root.geometry("1100x820")
             
             self.test_window = None 
+            self.sched = Scheduler(self.root)  # title animation, input drain, idle timeout
             self.config_file = "last_profile.cfg"
             self.settings_file = "ac_settings.json"
-            self.port = self.load_settings().get("port", None)
-            self.cab = Arcade(port=self.port) if self.port else Arcade()
+            settings = self.load_settings()
+            self.port = settings.get("port", None)
+            self._port_prompt = None
+            # async output: the Tk thread never blocks on ser.write
+            # block=False: the port opens (or is auto-detected) in the background
+            # auto_reconnect: the driver's supervisor brings an unplugged controller back
+            conn = {"async_output": True, "block": False, "on_connect": self.on_cab_connect,
+                    "auto_reconnect": True}
+            if settings.get("devices"):
+                # multi-controller cabinet: [{"port": "COM3", "num_leds": 30}, ...]
+                self.cab = ArcadeGroup(settings["devices"], **conn)
+            else:
+                ids = (settings["vid"], settings["pid"]) if settings.get("vid") is not None else None
+                self.cab = Arcade(port=self.port, autodetect=not self.port, usb_id=ids,
+                                  boot_delay=settings.get("boot_delay"), **conn)
+            
+            if hasattr(self.cab, 'add_state_listener'): self.cab.add_state_listener(self.on_cab_state)
+            # optional output correction: {"gamma": 2.2, "brightness": 0.8, "white_balance": [1, 0.9, 0.8], "power_budget_ma": 2000}
+            out = settings.get("output")
+            if out and hasattr(self.cab, 'set_correction'):
+                self.cab.set_correction(out.get("gamma"), out.get("brightness"), out.get("white_balance"))
+                self.cab.set_power_budget(out.get("power_budget_ma"))
+            # optional field telemetry: "stats_file": "arcade_stats.json" (driver stats() rewritten every 10 s)
+            if settings.get("stats_file") and hasattr(self.cab, 'start_stats_file'):
+                self.cab.start_stats_file(settings["stats_file"], settings.get("stats_interval", 10.0))
+            # optional UDP outputs (WLED marquee etc.): [{"url": "ddp://192.168.1.60", "num_leds": 30, "first": 0, "fps": 40}]
+            self.net_outputs = []
+            # fed from every committed frame, so they keep running while the PicoCTR is unplugged
+            if NETWORK_AVAILABLE and hasattr(self.cab, 'add_output'):
+                for spec in settings.get("network_outputs", []):
+                    try:
+                        spec = dict(spec); o = open_output(spec.pop("url"), total_leds=self.cab.num_leds, **spec)
+                        self.cab.add_output(o); self.net_outputs.append(o)
+                    except Exception as e: print(f"Network output {spec}: {e}")
             
             if not hasattr(self.cab, 'LEDS'):
                 self.cab.LEDS = {"P1_A":0, "P1_B":1, "P1_C":2, "P1_X":3, "P1_Y":4, "P1_Z":5, "P1_START":13, "MENU":14}
 
-            self.joysticks = []
-            if PYGAME_AVAILABLE: self.refresh_joysticks()
+            self.input = None           # ArcadeInput thread (joysticks)
+            self._test_active = False   # plain flag the input thread may read
             
             self.buttons = {}
             self.master_refs = [] # List to store refs to Master buttons for Profile Refresh
-            self.led_state = {}
-            for name in self.cab.LEDS.keys():
-                self.led_state[name] = {'primary': (0, 0, 0), 'secondary': (0, 0, 0), 'pulse': False, 'speed': 1.0, 'phase': 0.0}
+            # NumPy struct-of-arrays (dict-style access: self.led_state[name]['primary'])
+            if ENGINE_AVAILABLE: self.led_state = LedState(self.cab.LEDS.keys())
+            else: self.led_state = {name: {'primary': (0, 0, 0), 'secondary': (0, 0, 0), 'pulse': False, 'speed': 1.0, 'phase': 0.0} for name in self.cab.LEDS.keys()}
             
-            self.animating = False
             self.mapping_mode = False
-            self.diag_mode = False
-            self.attract_active = False
+            self.diag_mode = False      # an external test owns the LEDs
+            self.ambient = None         # EFFECT_*, a compiled Timeline or a live effect (audio / screen) on the engine's ambient layer
+            self.attract_effect = None  # what start_attract_mode put there (attract.show.json or EFFECT_ATTRACT)
+            self.lights_off = False     # system overlay: ALL OFF until the next apply_settings_to_hardware
+            self.engine = None
+            self.plugins = None
+            self._ambient_since = time.monotonic()
             self.last_activity_ts = time.time()
-            self._attract_offset = 0
             self.status_var = tk.StringVar(value="Initializing...")
             
             self.build_header()
@@ -371,14 +473,11 @@ class ArcadeGUI_V1_2:
             self.build_utilities()
             self.build_status_strip()
             
-            if not self.is_connected():
-                self.prompt_for_port(initial=True)
-                
             self.autoload_last_profile()
-            self.start_pulse_engine()
-            self.check_inputs()
-            self.start_idle_watchdog()
-            self.update_status_loop()
+            self.start_render_engine()
+            self.start_input_thread()
+            self.sched.add("idle", self.idle_timeout, delay=IDLE_TIMEOUT)
+            self.refresh_status()
             
             # Global Activity Hooks
             self.root.bind_all("<Key>", lambda e: self.note_activity())
@@ -401,15 +500,62 @@ class ArcadeGUI_V1_2:
         except: return False
     def set_port(self, port):
         self.port = port
-        self.save_settings({"port": port})
-        try: self.cab.reconnect(port)
-        except: self.cab = Arcade(port=port)
-        self.apply_settings_to_hardware()
+        data = self.load_settings(); data["port"] = port
+        self.save_settings(data)
+        try: self.cab.reconnect(port, block=False)
+        except: self.cab = Arcade(port=port, async_output=True, block=False, on_connect=self.on_cab_connect)
+    def auto_detect_port(self):
+        if not hasattr(self.cab, "autodetect"): return
+        self.status_var.set("Searching for controller...")
+        self.cab.autodetect(block=False)
+    def on_cab_connect(self, cab):
+        # driver thread -> Tk thread
+        self.root.after(0, lambda: self._on_cab_connect(cab))
+    def _on_cab_connect(self, cab):
+        if cab.is_connected():
+            if hasattr(cab, "connection_info") and cab is self.cab:
+                # cache port + USB id so the next start connects without probing
+                data = self.load_settings(); data.update(cab.connection_info())
+                self.save_settings(data)
+                self.port = cab.port
+            self.load_link_calibration(cab)
+            self.apply_settings_to_hardware()
+        elif not (self._port_prompt and self._port_prompt.winfo_exists()):
+            self.prompt_for_port(initial=True)
+    # --- Link calibration (cached per port in ac_settings.json) ---
+    def load_link_calibration(self, cab):
+        if not hasattr(cab, "calibrate"): return
+        cal = self.load_settings().get("calibration", {}).get(str(cab.port))
+        if cal: cab.apply_calibration(cal)
+        else: self.calibrate_link(cab)  # first time on this port
+    def calibrate_link(self, cab=None, report=False):
+        devs = [cab] if cab else getattr(self.cab, "devices", [self.cab])
+        devs = [d for d in devs if hasattr(d, "calibrate") and d.is_connected()]
+        if not devs:
+            if report: messagebox.showerror("Error", "Controller not connected.")
+            return
+        # optional: "try_bauds": [460800, 921600] if the firmware supports them
+        bauds = self.load_settings().get("try_bauds")
+        def work():
+            results = [(d.port, d.calibrate(try_bauds=bauds)) for d in devs]
+            self.root.after(0, lambda: self._store_link_calibration(results, report))
+        threading.Thread(target=work, daemon=True).start()
+    def _store_link_calibration(self, results, report):
+        data = self.load_settings(); cal = data.setdefault("calibration", {}); lines = []
+        for port, r in results:
+            if not r: lines.append(f"{port}: failed"); continue
+            cal[str(port)] = r
+            lines.append(f"{port}: {r['max_fps']:.0f} FPS max @ {r['baud']} baud (p95 write {r['latency_p95_ms']:.2f} ms)")
+        self.save_settings(data)
+        if report: messagebox.showinfo("Link Calibration", "\n".join(lines))
     def prompt_for_port(self, initial=False):
-        ports = available_ports()
+        # ports autodetect could open but not identify come first
+        cand = getattr(self.cab, "port_candidates", [])
+        ports = cand + [p for p in available_ports() if p not in cand]
         win = tk.Toplevel(self.root)
+        self._port_prompt = win
         win.title("Select Port")
-        win.geometry("400x240")
+        win.geometry("400x280")
         tk.Label(win, text="Select PicoCTR COM Port", font=("Segoe UI", 12, "bold")).pack(pady=10)
         box = tk.Listbox(win, height=5); box.pack(fill="x", padx=20)
         for p in ports: box.insert("end", p)
@@ -419,47 +565,70 @@ class ArcadeGUI_V1_2:
         
         # CHANGED: "CONNECT" instead of "APPLY"
         ModernButton(win, text="CONNECT", bg=COLORS["SUCCESS"], command=apply).pack(pady=10)
+        ModernButton(win, text="AUTO DETECT", command=lambda: (win.destroy(), self.auto_detect_port())).pack()
         if initial: win.protocol("WM_DELETE_WINDOW", apply)
-    def refresh_joysticks(self):
-        self.joysticks = []
-        pygame.joystick.quit(); pygame.joystick.init()
-        for i in range(pygame.joystick.get_count()):
-            j = pygame.joystick.Joystick(i); j.init(); self.joysticks.append(j)
+    def start_input_thread(self):
+        # joysticks are read on their own thread (blocking on SDL); LEDs react there, Tk only drains the queue
+        # the drain task sleeps until the input thread wakes it through the scheduler inbox
+        if INPUT_AVAILABLE: self.input = InputThread(INPUT_MAP, self.cab.LEDS, on_event=self.on_input_event)
+        self.sched.add("inputs", self.check_inputs)
+    def on_input_event(self, ev):
+        # input thread: no Tk calls here (wake_threadsafe only puts the name in the scheduler inbox)
+        if self._test_active and self.engine and ev.kind == KIND_DOWN and ev.led >= 0: self.engine.post(Flash(ev.led))
+        self.sched.wake_threadsafe("inputs")
     def check_inputs(self):
-        if PYGAME_AVAILABLE:
-            for event in pygame.event.get():
-                if event.type in [pygame.JOYBUTTONDOWN, pygame.JOYAXISMOTION, pygame.JOYHATMOTION]:
-                    self.note_activity()
-                if self.test_window and self.test_window.winfo_exists():
-                    self.test_window.handle_pygame_event(event)
-        self.root.after(16, self.check_inputs)
+        if not self.input: return None
+        events = self.input.poll()
+        if any(ev.kind in (KIND_DOWN, KIND_HAT, KIND_AXIS) for ev in events): self.note_activity()
+        if self.test_window and self.test_window.winfo_exists():
+            for ev in events: self.test_window.handle_input_event(ev)
+        return None  # suspend until the next event
 
     # --- UI Builders ---
     def _rgb_to_hex(self, r, g, b): return f"#{int(r):02x}{int(g):02x}{int(b):02x}"
     def _blend(self, c1, c2, t): return (int(c1[0]+(c2[0]-c1[0])*t), int(c1[1]+(c2[1]-c1[1])*t), int(c1[2]+(c2[2]-c1[2])*t))
     def _title_anim_step(self):
-        if not getattr(self, "_title_anim_running", False): return
-        phase = getattr(self, "_title_anim_phase", 0.0)
-        for i, (main, glow) in enumerate(getattr(self, "_title_letters", [])):
+        if not getattr(self, "_title_anim_running", False): return None
+        # minimized / behind the game: no frames at all until <Map> / <FocusIn> (see _title_anim_resume)
+        if not self.root.winfo_viewable() or not self.root.tk.call("focus", "-displayof", self.root):
+            self._title_anim_paused = True; return None
+        t0 = time.perf_counter()
+        phase = (time.monotonic() - self._title_anim_t0) * 2.0  # rad/s, independent of the frame rate
+        c = self._title_canvas
+        for i, item in enumerate(self._title_items):
             t = (math.sin(phase + i * 0.35) + 1.0) / 2.0
             r, g, b = self._blend((0, 229, 255), (255, 0, 85), t)
-            main.configure(fg=self._rgb_to_hex(r,g,b))
-            glow.configure(fg=self._rgb_to_hex(int(r*0.3),int(g*0.3),int(b*0.3)))
-        self._title_anim_phase = phase + 0.06
-        self.root.after(30, self._title_anim_step)
+            col = self._rgb_to_hex(r,g,b)
+            if col == item[2]: continue  # one canvas item update per letter that actually changed
+            item[2] = col
+            c.itemconfigure(item[0], fill=col); c.itemconfigure(item[1], fill=self._rgb_to_hex(int(r*0.3),int(g*0.3),int(b*0.3)))
+        # capped at gui_fps; a slow frame stretches the interval so it stays within gui_budget of the Tk thread
+        return max(self._gui_frame, (time.perf_counter() - t0) / self._gui_budget)
+    def _title_anim_resume(self, e=None):
+        if getattr(self, "_title_anim_paused", False): self._title_anim_paused = False; self.sched.wake("title")
     def build_header(self):
         h = tk.Frame(self.root, bg=COLORS["BG"]); h.pack(fill="x", pady=(14,2), padx=30)
-        tf = tk.Frame(h, bg=COLORS["BG"]); tf.pack(side="left")
-        self._title_letters = []
-        for ch in "ARCADE COMMANDER":
-            if ch == " ": tk.Label(tf, text=" ", bg=COLORS["BG"], font=("Segoe UI", 18)).pack(side="left"); continue
-            cell = tk.Frame(tf, bg=COLORS["BG"]); cell.pack(side="left")
-            glow = tk.Label(cell, text=ch, font=("Segoe UI", 18, "bold"), bg=COLORS["BG"], fg=COLORS["TEXT"])
-            main = tk.Label(cell, text=ch, font=("Segoe UI", 18, "bold"), bg=COLORS["BG"], fg=COLORS["TEXT"])
-            glow.grid(row=0, column=0, padx=(1,0), pady=(1,0)); main.grid(row=0, column=0)
-            self._title_letters.append((main, glow))
+        # the whole title is one canvas (glow + main text item per letter) instead of 30 Labels
+        f = self._title_font = tkfont.Font(family="Segoe UI", size=18, weight="bold")
+        text = "ARCADE COMMANDER"
+        c = self._title_canvas = tk.Canvas(h, width=f.measure(text)+2, height=f.metrics("linespace")+2, bg=COLORS["BG"], highlightthickness=0, bd=0)
+        c.pack(side="left")
+        self._title_items = []; x = 0
+        for ch in text:
+            if ch != " ":
+                glow = c.create_text(x+1, 1, text=ch, font=f, fill=COLORS["TEXT"], anchor="nw")
+                main = c.create_text(x, 0, text=ch, font=f, fill=COLORS["TEXT"], anchor="nw")
+                self._title_items.append([main, glow, None])  # [main, glow, last color]
+            x += f.measure(ch)
         tk.Label(h, text=f"{APP_VERSION}", font=("Consolas", 10), bg=COLORS["BG"], fg=COLORS["P1"]).pack(side="left", padx=12)
-        self._title_anim_phase = 0.0; self._title_anim_running = True; self._title_anim_step()
+        settings = self.load_settings()
+        fps, self._gui_budget = settings.get("gui_fps", GUI_FPS), max(0.001, settings.get("gui_budget", GUI_BUDGET))
+        if not fps: return  # static title
+        self._gui_frame = 1.0 / fps
+        self._title_anim_t0 = time.monotonic(); self._title_anim_running = True
+        self.root.bind("<Map>", self._title_anim_resume, add="+")
+        self.root.bind_all("<FocusIn>", self._title_anim_resume, add="+")
+        self.sched.add("title", self._title_anim_step, delay=0.0)
     def build_banner(self):
         wrap = tk.Frame(self.root, bg=COLORS["BG"]); wrap.pack(fill="x", padx=30, pady=(0,10))
         path = asset_path("ArcadeCommanderBanner.png")
@@ -554,6 +723,10 @@ class ArcadeGUI_V1_2:
 
         btn("CYCLE", COLORS["SURFACE_LIGHT"], self.start_cycle_mode, w=8)
         btn("DEMO", COLORS["SURFACE_LIGHT"], self.start_demo_mode, w=8)
+        btn("SHOW", COLORS["SURFACE_LIGHT"], self.play_show, w=8)
+        btn("AUDIO", COLORS["SURFACE_LIGHT"], self.start_audio_mode, w=8)
+        btn("SCREEN", COLORS["SURFACE_LIGHT"], self.start_screen_mode, w=8)
+        btn("FX", COLORS["SURFACE_LIGHT"], self.show_plugin_menu, w=6)
         sep()
         
         # Store PORT button for Red/Green updates
@@ -566,11 +739,23 @@ class ArcadeGUI_V1_2:
         # Store Label for Color Updates
         self.status_lbl = tk.Label(s, textvariable=self.status_var, bg=COLORS["BG"], fg=COLORS["TEXT_DIM"])
         self.status_lbl.pack(side="right")
+        # live mirror of the controller output ("preview_fps" in ac_settings.json, 0 = off)
+        self.preview = None
+        fps = self.load_settings().get("preview_fps", 15)
+        if fps and hasattr(self.cab, 'add_sink'):
+            tk.Label(s, text="LIVE", font=("Consolas", 9), bg=COLORS["BG"], fg=COLORS["TEXT_DIM"]).pack(side="left", padx=(0,6))
+            self.preview = LedPreview(s, self.cab.LEDS, self.sched, fps); self.preview.pack(side="left")
+            self.cab.add_sink(self.preview)
     
-    def update_status_loop(self):
+    def on_cab_state(self, cab, state):
+        # driver thread -> Tk thread (replaces the old 500 ms is_connected() poll)
+        self.root.after(0, self.refresh_status)
+
+    def refresh_status(self):
         connected = self.is_connected()
-        c_txt = "CONNECTED" if connected else "DISCONNECTED"
-        m_txt = "TESTING" if (self.test_window and self.test_window.winfo_exists()) else ("ANIM" if self.animating else ("DIAG" if self.diag_mode else ("ATTRACT" if self.attract_active else "IDLE")))
+        state = getattr(self.cab, "state", None)
+        c_txt = "CONNECTED" if connected else ("CONNECTING" if state in ("connecting", "reconnecting") else "DISCONNECTED")
+        m_txt = "TESTING" if (self.test_window and self.test_window.winfo_exists()) else ("DIAG" if self.diag_mode else ("ATTRACT" if self.in_attract() else "ANIM" if self.ambient in (EFFECT_CYCLE, EFFECT_DEMO) else getattr(self.ambient, "label", "SHOW") if self.ambient else "IDLE"))
         
         # TWEAK: Green text if connected, Dim if not
         if connected:
@@ -581,7 +766,7 @@ class ArcadeGUI_V1_2:
             self.port_btn.set_base_bg(COLORS["DANGER"]) # Red Port Button
 
         self.status_var.set(f"{c_txt} on {getattr(self.cab,'port',self.port)} | Mode: {m_txt}")
-        self.root.after(500, self.update_status_loop)
+        self.publish_state()
 
     def create_visual_btn(self, p, n, r, c, pack=False, width=6, height=2):
         l = "BALL" if n == "TRACKBALL" else n.split("_")[-1]
@@ -594,8 +779,9 @@ class ArcadeGUI_V1_2:
         v = tk.BooleanVar()
         def toggle():
             for b in bl: self.led_state[b]['pulse'] = v.get()
+            self.publish_state()
         tk.Checkbutton(p, text="PULSE", variable=v, bg=COLORS["SURFACE"], fg=tc, selectcolor=COLORS["SURFACE"], command=toggle).pack()
-        s = tk.Scale(p, from_=0.2, to=3.0, resolution=0.1, orient="horizontal", bg=COLORS["SURFACE"], fg=tc, showvalue=0, length=120, command=lambda val: [self.led_state[b].update({'speed': float(val)}) for b in bl])
+        s = tk.Scale(p, from_=0.2, to=3.0, resolution=0.1, orient="horizontal", bg=COLORS["SURFACE"], fg=tc, showvalue=0, length=120, command=lambda val: ([self.led_state[b].update({'speed': float(val)}) for b in bl], self.publish_state()))
         s.set(1.0); s.pack()
 
     def show_context_menu(self, e, n):
@@ -609,9 +795,8 @@ class ArcadeGUI_V1_2:
     def pick_color(self, n, mode):
         c = colorchooser.askcolor()[0]
         if c:
-            rgb = tuple(map(int, c)); self.led_state[n][mode] = rgb
+            rgb = tuple(map(int, c)); self.led_state[n][mode] = rgb; self.publish_state()
             if mode == 'primary': self.buttons[n].set_base_bg('#{:02x}{:02x}{:02x}'.format(*rgb))
-            if self.is_connected() and not self.led_state[n]['pulse']: self.cab.set(n, rgb); self.cab.show()
 
     def set_group_color(self, bl, mode, btn_ref=None):
         initial = None
@@ -625,17 +810,20 @@ class ArcadeGUI_V1_2:
             for n in bl:
                 self.led_state[n][mode] = rgb
                 if mode == 'primary' and n in self.buttons: self.buttons[n].set_base_bg(c[1])
-            if self.is_connected(): 
-                for n in bl: self.cab.set(n, rgb)
-                self.cab.show()
+            self.publish_state()
 
     def open_button_test(self):
         if self.test_window and self.test_window.winfo_exists():
             self.test_window.lift()
             return
-        self.animating = False; self.attract_active = False
+        self.set_ambient(None)
         self.test_window = InputTestWindow(self.root, self)
+        self._test_active = True
+        self.refresh_status()
         def on_test_close():
+            self._test_active = False
+            if self.input: self.input.set_swap(False)
+            if self.engine: self.engine.post(Release())
             self.test_window.destroy()
             self.apply_settings_to_hardware()
         self.test_window.protocol("WM_DELETE_WINDOW", on_test_close)
@@ -648,6 +836,8 @@ class ArcadeGUI_V1_2:
         m.add_command(label="Quick Sanity Test (Pin 1 & 17)", command=lambda: self.run_external_test(quick_sanity_test))
         m.add_command(label="Pin Finder (Cycle RGBW)", command=lambda: self.run_external_test(button_finder))
         m.add_command(label="Attract Mode (Rainbow)", command=lambda: self.run_external_test(attract_demo))
+        m.add_separator()
+        m.add_command(label="Calibrate Link (FPS / Baud)", command=lambda: self.calibrate_link(report=True))
         if event: m.post(event.x_root, event.y_root)
         else:
             x, y = self.root.winfo_pointerxy()
@@ -658,9 +848,10 @@ class ArcadeGUI_V1_2:
             messagebox.showerror("Error", "Controller not connected.")
             return
         # PAUSE ENGINE
-        self.animating = False
+        self.set_ambient(None)
         self.mapping_mode = False
-        self.diag_mode = True # Locks pulse engine
+        self.diag_mode = True # Pauses the render engine
+        self.refresh_status()
         self.hw_set_all((0,0,0)); self.hw_show()
         
         def _thread_target():
@@ -673,81 +864,123 @@ class ArcadeGUI_V1_2:
                 self.root.after(0, _restore)
         threading.Thread(target=_thread_target, daemon=True).start()
 
-    def start_pulse_engine(self):
-        def loop():
-            test_active = (self.test_window and self.test_window.winfo_exists())
-            if not any([self.animating, test_active, self.diag_mode]):
-                upd = False
-                for n, d in self.led_state.items():
-                    if d.get('pulse'):
-                        upd = True; d['phase'] += 0.1 * d.get('speed', 1.0)
-                        f = (math.sin(d['phase'])+1)/2; c1, c2 = d['primary'], d['secondary']
-                        self.cab.set(n, (int(c1[0]+(c2[0]-c1[0])*f), int(c1[1]+(c2[1]-c1[1])*f), int(c1[2]+(c2[2]-c1[2])*f)))
-                if upd: self.cab.show()
-            self.root.after(30, loop)
-        loop()
+    def start_render_engine(self):
+        # effects run on their own fixed-timestep thread; Tk only publishes snapshots
+        if ENGINE_AVAILABLE:
+            self.engine = RenderEngine(Renderer(self.cab))
+            # effect plugins: every *.py in "plugin_dir" with render(t, frame, state); "plugin_budget_ms" per frame
+            s = self.load_settings()
+            self.plugins = PluginManager(s.get("plugin_dir", "effects"), s.get("plugin_budget_ms", 4.0) / 1000.0)
+        self.publish_state()
+
+    def publish_state(self):
+        # Tk thread -> render thread: a fresh immutable snapshot per change
+        if not self.engine: return
+        if self.test_window and self.test_window.winfo_exists():
+            # test mode: white base + press effects only
+            self.engine.update(UiSnapshot(self.test_window.led_state.snapshot(self.cab.LEDS)))
+            return
+        self.engine.update(UiSnapshot(self.led_state.snapshot(self.cab.LEDS), self.ambient, self._ambient_since,
+                                      off=self.lights_off, paused=self.diag_mode))
+
+    def set_ambient(self, effect):
+        if effect != self.ambient:
+            if hasattr(self.ambient, "close"): self.ambient.close()  # audio / screen: stop the reader thread
+            self.ambient, self._ambient_since = effect, time.monotonic()
+        if effect: self.lights_off = False
+        self.refresh_status()
 
     def note_activity(self):
         self.last_activity_ts = time.time()
-        if self.attract_active:
-            self.attract_active = False; self.apply_settings_to_hardware()
+        self.sched.wake("idle", IDLE_TIMEOUT)  # push the idle timeout back (no polling watchdog)
+        if self.in_attract(): self.apply_settings_to_hardware()
 
     def apply_settings_to_hardware(self):
-        self.animating = False; self.attract_active = False
-        if not self.is_connected(): return
-        self.cab.set_all((0,0,0))
-        for n, d in self.led_state.items():
-            self.cab.set(n, d['primary'])
-        self.cab.show()
+        # back to the plain profile: no ambient effect, no overlay (the engine redraws the base layer)
+        self.lights_off = False
+        self.set_ambient(None)
 
     def all_off(self):
-        self.animating = False
+        self.lights_off = True
         for n in self.led_state: self.led_state[n]['pulse'] = False
-        self.cab.set_all((0,0,0)); self.cab.show()
+        self.set_ambient(None)
 
     def swap_fight_buttons(self):
         m = self.cab.LEDS
         for s in ["_A", "_B", "_C", "_X", "_Y", "_Z"]:
             p1, p2 = "P1"+s, "P2"+s
             m[p1], m[p2] = m[p2], m[p1]
+        if self.input: self.input.set_map(INPUT_MAP, m)
         self.apply_settings_to_hardware(); messagebox.showinfo("Done", "Buttons Swapped")
 
     def swap_start_buttons(self):
         m = self.cab.LEDS
         m["P1_START"], m["P2_START"] = m["P2_START"], m["P1_START"]
+        if self.input: self.input.set_map(INPUT_MAP, m)
         self.apply_settings_to_hardware(); messagebox.showinfo("Done", "Start Swapped")
 
-    def start_cycle_mode(self): self.animating = True; self._cycle_step = 0; self._run_cycle()
-    def _run_cycle(self):
-        if not self.animating: return
-        self.cab.set_all([(255,0,0),(0,255,0),(0,0,255),(255,255,255)][self._cycle_step % 4])
-        self.cab.show(); self._cycle_step += 1; self.root.after(1000, self._run_cycle)
-
-    def start_demo_mode(self): self.animating = True; self._run_demo()
-    def _run_demo(self):
-        if not self.animating: return
-        import random
-        for k in self.cab.LEDS: self.cab.set(k, (random.randint(0,255), random.randint(0,255), random.randint(0,255)))
-        self.cab.show(); self.root.after(150, self._run_demo)
-
-    def start_idle_watchdog(self): self.idle_watchdog_loop()
-    def idle_watchdog_loop(self):
+    # cycle / demo / attract run on the render engine's ambient layer
+    def start_cycle_mode(self): self.set_ambient(EFFECT_CYCLE)
+    def start_demo_mode(self): self.set_ambient(EFFECT_DEMO)
+    def start_audio_mode(self):
+        # "audio_source": a .wav (looped), "-" (stdin) or a FIFO of raw PCM ("audio_format": {"rate", "channels", "width"})
+        if not ENGINE_AVAILABLE: return
+        settings = self.load_settings()
+        src = settings.get("audio_source") or asset_path("SystemReady.wav")
+        try: self.set_ambient(AudioReactive(AudioStream(src, **settings.get("audio_format", {}))))
+        except Exception as e: messagebox.showerror("Audio", f"Could not open {src}:\n{e}")
+    def show_plugin_menu(self, event=None):
+        if not self.plugins: return
+        m = tk.Menu(self.root, tearoff=0, bg=COLORS["SURFACE_LIGHT"], fg="white")
+        for name, p in self.plugins.scan().items():
+            label = p.label + (" (error)" if p.render is None else " (disabled)" if p.disabled else "")
+            m.add_command(label=label, command=lambda p=p: self.set_ambient(PluginEffect(p)))
+        if not self.plugins.plugins: m.add_command(label=f"No effects in {self.plugins.directory}/", state="disabled")
+        x, y = self.root.winfo_pointerxy()
+        m.post(x, y)
+    def start_screen_mode(self):
+        # "ambient_source": an image folder, "-" / a FIFO of raw RGB24, or "mmap:<file>"; raw needs "ambient_size": [w, h]
+        # optional "ambient_fps" and "ambient_regions": {"P1_A": [x0, y0, x1, y1], ...} (0..1 of the frame)
+        if not ENGINE_AVAILABLE: return
+        settings = self.load_settings()
+        src = settings.get("ambient_source")
+        if not src:
+            src = filedialog.askdirectory(title="Image sequence folder")
+            if not src: return
+        try:
+            cap = FrameCapture(src, size=settings.get("ambient_size"), fps=settings.get("ambient_fps", 60.0))
+            self.set_ambient(ScreenAmbient(cap, settings.get("ambient_regions")))
+        except Exception as e: messagebox.showerror("Screen Ambient", f"Could not open {src}:\n{e}")
+
+    def idle_timeout(self):
+        # scheduler task, due IDLE_TIMEOUT after the last note_activity(); sleeps again once attract runs
         test_active = (self.test_window and self.test_window.winfo_exists())
-        if not any([test_active, self.diag_mode]):
-            if time.time() - self.last_activity_ts > 600 and not self.attract_active: self.start_attract_mode()
-        self.root.after(5000, self.idle_watchdog_loop)
+        if test_active or self.diag_mode: return IDLE_TIMEOUT
+        if not self.in_attract() and not self.in_live(): self.start_attract_mode()
+        return None if self.in_attract() or self.in_live() else 60.0  # not connected yet: try again later
+
+    def in_attract(self): return self.ambient is not None and self.ambient is self.attract_effect
+    def in_live(self): return getattr(self.ambient, "live", False)  # runs until stopped, no attract
 
     def start_attract_mode(self):
         if not self.is_connected(): return
-        self.attract_active = True; self.animating = False; self._attract_offset = 0; self.attract_tick()
+        # assets/attract.show.json when present (compiled once into the user cache), else the built-in effect
+        self.attract_effect = self.load_show(asset_path("attract.show.json"), silent=True) or EFFECT_ATTRACT
+        self.set_ambient(self.attract_effect)
+
+    def load_show(self, path, silent=False):
+        if not ENGINE_AVAILABLE or not os.path.exists(path): return None
+        try: return load_timeline(path, self.cab.LEDS, self.cab.num_leds)
+        except Exception as e:
+            if not silent: messagebox.showerror("Light Show", f"Could not load {os.path.basename(path)}:\n{e}")
+            else: print(f"Light show {path} not loaded: {e}")
+            return None
 
-    def attract_tick(self):
-        if not self.attract_active or not self.is_connected(): return
-        off = self._attract_offset
-        for i in range(12): self.cab.pixels[i] = wheel((i*20 + off)%255)
-        pulse = int((math.sin(time.time()*3)+1)*127.5)
-        self.cab.set("P1_START", (pulse,0,0)); self.cab.set("P2_START", (0,0,pulse))
-        self.cab.show(); self._attract_offset = (off+2)%255; self.root.after(30, self.attract_tick)
+    def play_show(self):
+        f = filedialog.askopenfilename(filetypes=[("Light Show", "*.json")])
+        if not f: return
+        show = self.load_show(f)
+        if show is not None: self.set_ambient(show)
 
     def show_about(self): messagebox.showinfo("About", f"Arcade Commander {APP_VERSION}")
     
@@ -766,7 +999,7 @@ class ArcadeGUI_V1_2:
     def save_profile(self):
         f = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("Profile", "*.json")])
         if f:
-            with open(f, "w") as j: json.dump({"leds": self.led_state}, j, indent=4)
+            with open(f, "w") as j: json.dump({"leds": self.led_state.to_dict() if ENGINE_AVAILABLE else self.led_state}, j, indent=4)
             self.update_last_profile_path(f); messagebox.showinfo("Saved", "Profile Saved")
 
     def load_profile(self):
@@ -780,6 +1013,7 @@ class ArcadeGUI_V1_2:
             for n, s in leds.items():
                 if n in self.led_state:
                     self.led_state[n].update({'primary': tuple(s.get('primary', (0,0,0))), 'secondary': tuple(s.get('secondary', (0,0,0))), 'pulse': bool(s.get('pulse', False)), 'speed': float(s.get('speed', 1.0))})
+            self.publish_state()
             
             # --- BRAIN VS FACE FIX ---
             self.refresh_gui_from_state()
@@ -815,9 +1049,14 @@ class ArcadeGUI_V1_2:
         if self.cab: self.cab.show()
 
     def on_close(self):
-        self.animating = False
+        if getattr(self, "preview", None): self.cab.remove_sink(self.preview)
+        self.sched.close()
+        if hasattr(self.ambient, "close"): self.ambient.close()
+        if self.input: self.input.close()
+        if self.engine: self.engine.close()
         try: self.cab.close()
         except: pass
+        for o in getattr(self, "net_outputs", []): o.close()
         if PYGAME_AVAILABLE: pygame.quit()
         self.root.destroy()
         sys.exit(0)
@@ -0,0 +1,240 @@
+"""
+Arcade Commander - ArcadeCompositor
+
+Ordered stack of lighting layers flattened into one frame.
+
+Each layer draws into its own float RGB buffer plus a per-LED coverage
+(`alpha`, 0 = transparent). When the stack is evaluated, every layer is
+blended onto everything below it:
+
+    weight = alpha * opacity * mask
+    out    = below + (blend(below, layer) - below) * weight
+
+Blend modes are replace, add (clipped at 255), multiply (layer / 255 scales
+what is below) and max.
+
+Static layers redraw only after invalidate(); layers with animated = True
+redraw every frame and may return False from draw() when nothing changed.
+The composite after each layer is kept, so a change in an upper layer only
+re-blends from that layer up, and an unchanged stack costs nothing.
+
+    comp = Compositor(cab.num_leds)
+    comp.add(SolidLayer("base", (0, 0, 40)))
+    comp.add(SolidLayer("glow", (255, 0, 0), blend=BLEND_ADD, opacity=0.5, mask=[0, 1, 2]))
+    if comp.evaluate(time.monotonic()):
+        cab.back_buffer[:] = comp.out
+"""
+
+import numpy as np
+
+BLEND_REPLACE = "replace"
+BLEND_ADD = "add"
+BLEND_MULTIPLY = "multiply"
+BLEND_MAX = "max"
+BLEND_MODES = (BLEND_REPLACE, BLEND_ADD, BLEND_MULTIPLY, BLEND_MAX)
+
+
+class Layer:
+    """Base layer: subclasses fill self.rgb (n, 3) / self.alpha (n,) in draw(now)."""
+
+    animated = False
+
+    def __init__(self, name: str, blend: str = BLEND_REPLACE, opacity: float = 1.0, mask=None):
+        if blend not in BLEND_MODES:
+            raise ValueError(f"unknown blend mode {blend!r}")
+        self.name = name
+        self.blend = blend
+        self._opacity = float(opacity)
+        self._enabled = True
+        self._mask_spec = mask
+        self.mask = None
+        self.num_leds = 0
+        self.rgb = None
+        self.alpha = None
+        self._dirty = True
+
+    def attach(self, num_leds: int):
+        """Called by Compositor.add(): allocate buffers for the strip size."""
+        self.num_leds = int(num_leds)
+        self.rgb = np.zeros((self.num_leds, 3), dtype=np.float32)
+        self.alpha = np.zeros(self.num_leds, dtype=np.float32)
+        self.set_mask(self._mask_spec)
+
+    def draw(self, now: float):
+        """Render into rgb / alpha. Return False if the output did not change."""
+
+    def invalidate(self):
+        self._dirty = True
+
+    def update(self, now: float) -> bool:
+        if not (self._dirty or self.animated):
+            return False
+        changed = self.draw(now) is not False or self._dirty
+        self._dirty = False
+        return changed
+
+    @property
+    def opacity(self) -> float:
+        return self._opacity
+
+    @opacity.setter
+    def opacity(self, value: float):
+        value = min(max(float(value), 0.0), 1.0)
+        if value != self._opacity:
+            self._opacity = value
+            self._dirty = True
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value: bool):
+        if bool(value) != self._enabled:
+            self._enabled = bool(value)
+            self._dirty = True
+
+    def set_mask(self, mask):
+        """None (all LEDs), a list of LED indices, or a per-LED weight array (0..1)."""
+        self._mask_spec = mask
+        if self.rgb is not None:
+            if mask is None:
+                self.mask = None
+            else:
+                arr = np.asarray(mask)
+                if arr.dtype == bool or (arr.ndim == 1 and len(arr) == self.num_leds and arr.dtype.kind == "f"):
+                    self.mask = arr.astype(np.float32)
+                else:
+                    self.mask = np.zeros(self.num_leds, dtype=np.float32)
+                    self.mask[arr.astype(np.intp)] = 1.0
+        self._dirty = True
+
+
+class SolidLayer(Layer):
+    """One color over the whole strip (use the mask to limit it)."""
+
+    def __init__(self, name: str, color=(0, 0, 0), **kwargs):
+        super().__init__(name, **kwargs)
+        self.color = tuple(color)
+
+    def set_color(self, color):
+        self.color = tuple(color)
+        self._dirty = True
+
+    def draw(self, now):
+        self.rgb[:] = self.color
+        self.alpha[:] = 1.0
+
+
+class PixelLayer(Layer):
+    """Static per-LED overlay: hold() pixels on top, release() them, fill() everything."""
+
+    def hold(self, index, color):
+        self.rgb[index] = color
+        self.alpha[index] = 1.0
+        self._dirty = True
+
+    def release(self, index):
+        self.alpha[index] = 0.0
+        self._dirty = True
+
+    def fill(self, color):
+        self.rgb[:] = color
+        self.alpha[:] = 1.0
+        self._dirty = True
+
+    def clear(self):
+        if self.alpha.any():
+            self.alpha[:] = 0.0
+            self._dirty = True
+
+    def draw(self, now):
+        pass  # content is set directly by hold / fill
+
+
+class Compositor:
+    """Evaluates an ordered layer stack (bottom first) into `out`, a (n, 3) float32 frame."""
+
+    def __init__(self, num_leds: int):
+        self.num_leds = int(num_leds)
+        self.layers = []
+        self._prefix = []      # composite after each layer
+        self._blank = np.zeros((self.num_leds, 3), dtype=np.float32)
+        self._top = np.zeros((self.num_leds, 3), dtype=np.float32)
+        self._w = np.zeros(self.num_leds, dtype=np.float32)
+        self._restack = True
+        self.out = self._blank
+
+    def add(self, layer: Layer, index: int | None = None) -> Layer:
+        """Insert `layer` (default: on top). Names must be unique."""
+        if self.get(layer.name) is not None:
+            raise ValueError(f"layer {layer.name!r} already in the stack")
+        layer.attach(self.num_leds)
+        if index is None:
+            self.layers.append(layer)
+        else:
+            self.layers.insert(index, layer)
+        self._prefix.append(np.zeros((self.num_leds, 3), dtype=np.float32))
+        self._restack = True
+        return layer
+
+    def remove(self, name: str):
+        layer = self.get(name)
+        if layer is not None:
+            self.layers.remove(layer)
+            self._prefix.pop()
+            self._restack = True
+
+    def get(self, name: str) -> Layer | None:
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        return None
+
+    def invalidate(self):
+        """Force a full re-blend on the next evaluate()."""
+        self._restack = True
+
+    def evaluate(self, now: float) -> bool:
+        """Update every layer and re-blend from the lowest changed one. True if `out` changed."""
+        first = 0 if self._restack else None
+        for i, layer in enumerate(self.layers):
+            if layer.update(now) and first is None:
+                first = i
+        if first is None:
+            return False
+        self._restack = False
+
+        below = self._blank if first == 0 else self._prefix[first - 1]
+        for i in range(first, len(self.layers)):
+            dst = self._prefix[i]
+            np.copyto(dst, below)
+            layer = self.layers[i]
+            if layer.enabled:
+                self._blend(dst, layer)
+            below = dst
+        self.out = below
+        return True
+
+    def _blend(self, dst, layer: Layer):
+        w = self._w
+        np.multiply(layer.alpha, layer.opacity, out=w)
+        if layer.mask is not None:
+            w *= layer.mask
+        if not w.any():
+            return
+        top = self._top
+        src = layer.rgb
+        if layer.blend == BLEND_REPLACE:
+            np.copyto(top, src)
+        elif layer.blend == BLEND_ADD:
+            np.add(dst, src, out=top)
+            np.minimum(top, 255.0, out=top)
+        elif layer.blend == BLEND_MULTIPLY:
+            np.multiply(dst, src, out=top)
+            top *= 1.0 / 255.0
+        else:
+            np.maximum(dst, src, out=top)
+        top -= dst
+        top *= w[:, None]
+        dst += top
@@ -11,6 +11,13 @@ except ImportError:
     print("CRITICAL ERROR: 'ArcadeDriver.py' not found. Please place it in the same folder.")
     exit()
 
+try:
+    from ArcadeEngine import RenderEngine, Renderer, UiSnapshot, LedState
+    from ArcadeEffects import Flash
+    ENGINE_AVAILABLE = True
+except ImportError:
+    ENGINE_AVAILABLE = False
+
 # ==========================================
 # KEY MAPPING CONFIGURATION
 # ==========================================
@@ -40,6 +47,7 @@ class ArcadeDebugger:
         self.root.configure(bg="#121212")
 
         self.arcade = None # This will hold the Arcade driver instance
+        self.engine = None # Render thread: white wall + key press effects
         self.gui_buttons = {} # Stores UI widgets
 
         # 1. Setup the GUI Layout
@@ -129,6 +137,9 @@ class ArcadeDebugger:
             return
 
         # Close existing if any
+        if self.engine:
+            self.engine.close()
+            self.engine = None
         if self.arcade:
             self.arcade.close()
         
@@ -150,8 +161,14 @@ class ArcadeDebugger:
         time.sleep(0.5) # Let connection settle
         if self.arcade:
             print("Setting all LEDs to WHITE")
-            self.arcade.set_all((255, 255, 255))
-            self.arcade.show()
+            if ENGINE_AVAILABLE:
+                state = LedState(self.arcade.LEDS.keys())
+                state.primary[:] = 255
+                self.engine = RenderEngine(Renderer(self.arcade))
+                self.engine.update(UiSnapshot(state.snapshot(self.arcade.LEDS)))
+            else:
+                self.arcade.set_all((255, 255, 255))
+                self.arcade.show()
 
     def handle_keypress(self, event):
         """Maps Key -> GUI Green -> LED Cycle"""
@@ -169,33 +186,21 @@ class ArcadeDebugger:
             if self.arcade and self.arcade.is_connected():
                 # Check if this button has an LED mapping in the driver
                 if btn_name in self.arcade.LEDS:
-                    threading.Thread(target=self.cycle_led, args=(btn_name,), daemon=True).start()
+                    self.cycle_led(btn_name)
 
     def cycle_led(self, btn_name):
         """Flashes Red -> Green -> Blue -> White"""
-        delay = 0.15
-        
-        # Red
-        self.arcade.set(btn_name, (255, 0, 0))
-        self.arcade.show()
-        time.sleep(delay)
-        
-        # Green
-        self.arcade.set(btn_name, (0, 255, 0))
-        self.arcade.show()
-        time.sleep(delay)
-        
-        # Blue
-        self.arcade.set(btn_name, (0, 0, 255))
-        self.arcade.show()
-        time.sleep(delay)
-        
-        # Back to White
-        self.arcade.set(btn_name, (255, 255, 255))
-        self.arcade.show()
+        if not self.engine:
+            return
+        # Red, Green, Blue 0.15s each, then the white base shows through again.
+        # Posted to the render thread: mashing keys never piles up threads.
+        self.engine.post(Flash(self.arcade.LEDS[btn_name],
+                               colors=((255, 0, 0), (0, 255, 0), (0, 0, 255)), step=0.15, hold=False))
 
     def on_closing(self):
         """Cleanly closes serial port to prevent 'Access Denied' next time."""
+        if self.engine:
+            self.engine.close()
         if self.arcade:
             print("Closing Serial Connection...")
             self.arcade.close()
@@ -1,8 +1,6 @@
 import tkinter as tk
 from tkinter import ttk
-import threading
 import time
-import os
 import warnings
 
 # ---------------------------------------------------------
@@ -34,6 +32,19 @@ except ImportError:
         def is_connected(self): return False
     def available_ports(): return []
 
+try:
+    from ArcadeInput import InputThread, KIND_DOWN, KIND_HAT, KIND_AXIS
+    INPUT_AVAILABLE = PYGAME_AVAILABLE
+except ImportError:
+    INPUT_AVAILABLE = False
+
+try:
+    from ArcadeEngine import RenderEngine, Renderer, UiSnapshot, LedState
+    from ArcadeEffects import Flash
+    ENGINE_AVAILABLE = True
+except ImportError:
+    ENGINE_AVAILABLE = False
+
 # ---------------------------------------------------------
 # INPUT MAP (Standard: Joy 0 = P1, Joy 1 = P2)
 # ---------------------------------------------------------
@@ -57,8 +68,9 @@ class ArcadeDebugger:
         self.root.configure(bg="#121212")
 
         self.arcade = None 
+        self.engine = None   # renders the white wall + press effects on its own thread
         self.gui_buttons = {} 
-        self.joysticks = []
+        self.input = None    # ArcadeInput thread: blocks on SDL, no polling loop
         
         # Mouse/Spinner Tracking
         self.last_mouse_x = 0
@@ -73,13 +85,9 @@ class ArcadeDebugger:
         # MOUSE LISTENER
         self.root.bind('<Motion>', self.handle_mouse_motion)
 
-        # JOYSTICK LISTENER
-        if PYGAME_AVAILABLE:
-            os.environ["SDL_VIDEODRIVER"] = "dummy"
-            pygame.init()
-            pygame.display.init()
-            pygame.joystick.init()
-            threading.Thread(target=self.joystick_listener, daemon=True).start()
+        # JOYSTICK LISTENER (initializes the SDL display + joystick on its own thread)
+        if INPUT_AVAILABLE:
+            self.input = InputThread(INPUT_MAP, Arcade.LEDS, on_event=self.handle_input_event)
 
     # -----------------------------------------------------
     # UI SETUP
@@ -102,6 +110,7 @@ class ArcadeDebugger:
         # Swap Inputs Checkbox
         self.swap_players_var = tk.BooleanVar(value=False)
         tk.Checkbutton(top_frame, text="Swap P1/P2 Inputs", variable=self.swap_players_var,
+                       command=lambda: self.input and self.input.set_swap(self.swap_players_var.get()),
                        bg="#1e1e1e", fg="white", selectcolor="#333333", 
                        activebackground="#1e1e1e", activeforeground="white").pack(side="left", padx=20)
         
@@ -151,6 +160,7 @@ class ArcadeDebugger:
     # -----------------------------------------------------
     def connect_hardware(self):
         port = self.port_var.get()
+        if self.engine: self.engine.close(); self.engine = None
         if self.arcade: self.arcade.close()
         
         # 1. CLEAN SLATE: Reset GUI Buttons to Gray
@@ -166,7 +176,7 @@ class ArcadeDebugger:
             self.connection_time = time.time()
             
             # 2. CLEAN SLATE: Reset Hardware LEDs to White
-            threading.Thread(target=self.startup_sequence, daemon=True).start()
+            self.startup_sequence()
         except Exception as e:
             self.status_lbl.config(text=str(e))
 
@@ -174,8 +184,14 @@ class ArcadeDebugger:
         """Forces all LEDs to White on connect."""
         if self.arcade:
             print("System Start: Setting all LEDs to White...")
-            self.arcade.set_all((255, 255, 255))
-            self.arcade.show()
+            if ENGINE_AVAILABLE:
+                state = LedState(self.arcade.LEDS.keys())
+                state.primary[:] = 255
+                self.engine = RenderEngine(Renderer(self.arcade))
+                self.engine.update(UiSnapshot(state.snapshot(self.arcade.LEDS)))
+            else:
+                self.arcade.set_all((255, 255, 255))
+                self.arcade.show()
 
     # -----------------------------------------------------
     # LOGIC: INPUT HANDLING
@@ -205,46 +221,15 @@ class ArcadeDebugger:
         self.last_mouse_x = event.x
         self.last_mouse_y = event.y
 
-    def joystick_listener(self):
-        while True:
-            if not PYGAME_AVAILABLE: break
-            
-            if not self.joysticks:
-                pygame.joystick.quit()
-                pygame.joystick.init()
-                for i in range(pygame.joystick.get_count()):
-                    j = pygame.joystick.Joystick(i)
-                    j.init()
-                    self.joysticks.append(j)
-
-            try:
-                for event in pygame.event.get():
-                    if event.type == pygame.JOYBUTTONDOWN:
-                        real_joy_id = self.get_swapped_id(event.joy)
-                        map_key = f"{real_joy_id}_{event.button}"
-                        
-                        if map_key in INPUT_MAP:
-                            btn_name = INPUT_MAP[map_key]
-                            print(f"Input: {btn_name}") # Debug Print
-                            self.activate_button(btn_name)
-
-                    elif event.type == pygame.JOYHATMOTION:
-                        real_joy_id = self.get_swapped_id(event.joy)
-                        self.handle_dpad(real_joy_id, event.value)
-
-                    elif event.type == pygame.JOYAXISMOTION:
-                        real_joy_id = self.get_swapped_id(event.joy)
-                        self.handle_axis(real_joy_id, event.axis, event.value)
-            except Exception as e:
-                pass
-            
-            time.sleep(0.01)
-
-    def get_swapped_id(self, original_id):
-        """Swaps 0 and 1 if checkbox is checked."""
-        if self.swap_players_var.get():
-            return 1 if original_id == 0 else 0
-        return original_id
+    def handle_input_event(self, ev):
+        """Runs on the input thread (joy already swapped, name already resolved)."""
+        if ev.kind == KIND_DOWN and ev.name:
+            print(f"Input: {ev.name}") # Debug Print
+            self.activate_button(ev.name)
+        elif ev.kind == KIND_HAT:
+            self.handle_dpad(ev.joy, ev.value)
+        elif ev.kind == KIND_AXIS:
+            self.handle_axis(ev.joy, ev.code, ev.value)
 
     def handle_dpad(self, joy_id, value):
         prefix = "P1" if joy_id == 0 else "P2"
@@ -271,7 +256,7 @@ class ArcadeDebugger:
         # 2. Update Hardware
         if self.arcade and self.arcade.is_connected():
             if btn_name in self.arcade.LEDS:
-                threading.Thread(target=self.cycle_led_and_hold_green, args=(btn_name,), daemon=True).start()
+                self.cycle_led_and_hold_green(btn_name)
 
     def trigger_gui_update(self, btn_name, lock=False):
         self.root.after(0, lambda: self._gui_turn_green(btn_name, lock))
@@ -283,24 +268,20 @@ class ArcadeDebugger:
                 self.root.after(200, lambda: self.gui_buttons[btn_name].configure(bg="#333333", fg="white"))
 
     def cycle_led_and_hold_green(self, btn_name):
-        """RGB Cycle -> Green Hold"""
+        """RGB Cycle -> Green Hold (posted to the render engine; no thread per press)"""
         try:
-            delay = 0.15 # Slightly slower for visibility
-            # Red
-            self.arcade.set(btn_name, (255, 0, 0))
-            self.arcade.show()
-            time.sleep(delay)
-            # Blue
-            self.arcade.set(btn_name, (0, 0, 255))
-            self.arcade.show()
-            time.sleep(delay)
-            # Green (FINAL STATE)
-            self.arcade.set(btn_name, (0, 255, 0))
-            self.arcade.show()
+            if self.engine:
+                # Red -> Blue -> Green (FINAL STATE), slightly slower for visibility
+                self.engine.post(Flash(self.arcade.LEDS[btn_name], step=0.15))
+            else:
+                self.arcade.set(btn_name, (0, 255, 0))
+                self.arcade.show()
         except Exception as e:
             print(f"LED Error: {e}")
 
     def on_closing(self):
+        if self.input: self.input.close()
+        if self.engine: self.engine.close()
         if self.arcade: self.arcade.close()
         if PYGAME_AVAILABLE: pygame.quit()
         self.root.destroy()
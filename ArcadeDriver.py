@@ -7,15 +7,57 @@ Key improvements:
 - available_ports() helper for GUI port picker
 - send_frame(frame) for direct 30-LED frame writes (used by ArcadeTester / attract)
 - wheel(pos) color helper
+- FrameEncoder: color orders compiled once into a per-LED permutation table,
+  pixel state kept in a flat bytearray, frames encoded into a reused buffer
+- async_output=True: show() publishes into a latest-frame-wins mailbox and a
+  writer thread sends the newest frame at the configured rate
+- ArcadeGroup: one logical LED namespace spread over several controllers
+  (own port / baud / LED count each), written in parallel every frame
+- identical frames are not rewritten; a keepalive resend goes out every
+  `keepalive` seconds so the controller does not time out
+- non-blocking connect (block=False / connect_async) and parallel Adalight
+  port discovery (discover_ports): only a handshake or a KNOWN_USB_IDS id
+  selects a port, other ports are left as port_candidates for the user; the
+  found port is identified by USB VID/PID
+- auto_reconnect=True: a supervisor thread notices write failures / unplugged
+  devices, reconnects with exponential backoff and replays the current frame;
+  add_state_listener() reports connection state changes
+- output goes through ArcadeTransport, so `port` may also be null://,
+  file://path, pty://, tcp://host:port (or any pyserial URL)
+- add_sink() / start_recording(): every written frame can be handed to sinks,
+  e.g. the ArcadeRecorder binary frame log
+- add_output(): every committed frame, connected or not, for outputs that pace
+  themselves (ArcadeNetwork DDP / E1.31)
+- set_correction() / set_power_budget(): gamma, per-LED white balance and a
+  brightness cap folded into per-channel lookup tables, plus a frame-level
+  current limiter
+- double-buffered frame state: writers stage in a back buffer, show()/commit()
+  publish it in one atomic copy, and the encoder only reads that snapshot;
+  batch() groups several changes into one frame
+- calibrate(): measures write throughput / completion latency on the live
+  link, sets the frame-rate cap from it (optionally trying faster bauds);
+  write timeouts back the rate off and clean writes recover it
+- stats(): frame / byte / timeout / error counters plus rolling encode and
+  write duration windows, and a bottleneck hint (cpu / link / None);
+  start_stats_file() snapshots them to JSON periodically
+- back_buffer / wheel_array(): (num_leds, 3) NumPy view of the staged frame
+  so effects can write every LED in one array operation
 
 This module keeps the Adalight header format and your per-index color order rules.
 """
 
+import json
+import os
 import struct
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
-import serial
-from serial import SerialTimeoutException
+import numpy as np
+
+from ArcadeRecorder import FrameRecorder
+from ArcadeTransport import SerialTimeoutException, open_transport
 
 try:
     from serial.tools import list_ports
@@ -25,17 +67,75 @@ except Exception:
 
 
 # --- DEFAULT CONFIGURATION ---
-DEFAULT_PORT = "COM3"
+DEFAULT_PORT = os.environ.get("ARCADE_PORT", "COM3")  # e.g. ARCADE_PORT=null:// for hardware-free runs
 DEFAULT_BAUD = 230400
 NUM_LEDS = 30
 
 # 0.02 = 50 FPS cap (smooth + safer on serial)
 THROTTLE = 0.02
 
+# Unchanged frames are suppressed; the last frame is resent this often (seconds).
+# None disables the keepalive resend.
+KEEPALIVE = 2.0
+
+# Arduino-style boards reset when the port opens and greet with HANDSHAKE once
+# booted. Opening waits up to BOOT_DELAY for the greeting; boards that don't
+# reset (PicoCTR) can be opened with boot_delay=0.
+BOOT_DELAY = 2.0
+HANDSHAKE = b"Ada"
+
+# Port discovery only auto-selects a port that greets with HANDSHAKE or whose
+# USB id is listed here ((vid, pid); pid None = any product of that vendor).
+# Anything else that opens is only offered as an unconfirmed candidate.
+# Listed boards don't reset on open, so they are opened without the boot wait.
+KNOWN_USB_IDS = ((0x2E8A, None),)  # Raspberry Pi RP2040 boards (PicoCTR)
+
+# Supervisor (auto_reconnect): retry backoff bounds and device presence poll (seconds)
+RECONNECT_MIN = 0.5
+RECONNECT_MAX = 8.0
+PRESENCE_POLL = 1.0
+
+# Connection states reported to state listeners
+STATE_CONNECTING = "connecting"
+STATE_CONNECTED = "connected"
+STATE_DISCONNECTED = "disconnected"
+STATE_RECONNECTING = "reconnecting"
+
 # --- COLOR ORDER CONFIGURATION ---
 BUTTON_ORDER = "BRG"     # most button channels
 TRACKBALL_ORDER = "GRB"  # pin 17 / index 16
 
+# Per-index exceptions to BUTTON_ORDER. Any index can have its own order.
+COLOR_ORDER_OVERRIDES = {16: TRACKBALL_ORDER}
+
+HEADER_SIZE = 6  # b"Ada" + count hi + count lo + checksum
+
+# --- OUTPUT CORRECTION ---
+# Identity by default (raw 8-bit values, as before).
+GAMMA = 1.0
+BRIGHTNESS = 1.0            # global cap, 0..1
+POWER_BUDGET_MA = None      # scale frames down above this estimated current (None = off)
+MA_PER_CHANNEL = 20.0       # WS2812B: ~20 mA per channel at 255
+IDLE_MA_PER_LED = 1.0       # quiescent draw per LED
+
+# --- LINK CALIBRATION ---
+# calibrate() turns the measured per-frame cost (x CALIBRATION_MARGIN) into
+# frame_interval. At runtime each write timeout stretches the interval by
+# RATE_BACKOFF; every RECOVER_AFTER clean writes shrink it by RATE_RECOVER,
+# back down to the calibrated value.
+MIN_FRAME_INTERVAL = 0.005  # 200 FPS ceiling
+MAX_FRAME_INTERVAL = 0.1    # 10 FPS floor while backing off
+CALIBRATION_MARGIN = 1.5
+CALIBRATION_FRAMES = 2000   # stop measuring early on very fast links
+RATE_BACKOFF = 1.5
+RATE_RECOVER = 0.95
+RECOVER_AFTER = 50
+
+# --- STATISTICS ---
+STATS_WINDOW = 512          # recent samples kept per duration window
+STATS_BUCKETS_US = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 25000, 50000)
+STATS_INTERVAL = 10.0       # default period for start_stats_file() (seconds)
+
 
 def available_ports():
     """Return a list of COM port device names like ['COM3','COM7']."""
@@ -49,6 +149,346 @@ def available_ports():
     return ports
 
 
+def usb_id(port: str):
+    """Return (vid, pid) of a USB serial port, or None."""
+    if not _HAS_LIST_PORTS:
+        return None
+    for p in list_ports.comports():
+        if p.device == port and p.vid is not None:
+            return (p.vid, p.pid)
+    return None
+
+
+def find_port_by_usb_id(vid: int, pid: int):
+    """Return the port currently enumerated for a USB VID/PID (COM numbers can change)."""
+    if not _HAS_LIST_PORTS:
+        return None
+    for p in list_ports.comports():
+        if p.vid == vid and p.pid == pid:
+            return p.device
+    return None
+
+
+def is_known_usb_id(ids, known=KNOWN_USB_IDS) -> bool:
+    """True if (vid, pid) is on the allowlist."""
+    if not ids or ids[0] is None:
+        return False
+    return any(ids[0] == vid and pid in (None, ids[1]) for vid, pid in known)
+
+
+def _wait_handshake(ser, timeout: float):
+    """Read until the firmware greeting arrives. Returns seconds waited, or None."""
+    t0 = time.monotonic()
+    buf = b""
+    while True:
+        elapsed = time.monotonic() - t0
+        if elapsed >= timeout:
+            return None
+        buf = (buf + ser.read(max(1, ser.in_waiting)))[-16:]
+        if HANDSHAKE in buf:
+            return time.monotonic() - t0
+
+
+def probe_port(port: str, baud: int = DEFAULT_BAUD, timeout: float = BOOT_DELAY):
+    """
+    Check whether `port` is an Adalight controller.
+
+    A board that greets with HANDSHAKE (and needs its boot delay on every
+    open) or has a KNOWN_USB_IDS id is a confirmed match. Any other port that
+    opens is returned unconfirmed: nothing is written to it, since accepting
+    bytes proves nothing (modems, Arduinos and UPS links all do). Returns a
+    connection info dict or None.
+    """
+    try:
+        ser = open_transport(port, baud, timeout=0.05, write_timeout=0.1)
+    except Exception:
+        return None
+    try:
+        ids = usb_id(port) or (None, None)
+        known = is_known_usb_id(ids)
+        waited = None if known else _wait_handshake(ser, timeout)  # known ids never greet
+        return {
+            "port": port, "baud": int(baud), "vid": ids[0], "pid": ids[1],
+            "handshake": waited is not None,
+            "confirmed": waited is not None or known,
+            "boot_delay": 0.0 if waited is None else round(waited + 0.25, 2),
+        }
+    except Exception:
+        return None
+    finally:
+        try:
+            ser.close()
+        except Exception:
+            pass
+
+
+def discover_ports(candidates=None, baud: int = DEFAULT_BAUD, timeout: float = BOOT_DELAY):
+    """
+    Probe every candidate port in parallel (default: available_ports()).
+    Returns info dicts for every port that opened: confirmed matches first
+    (handshake before USB id), then the unconfirmed ones for the user to pick.
+    """
+    ports = list(candidates) if candidates is not None else available_ports()
+    if not ports:
+        return []
+    with ThreadPoolExecutor(max_workers=len(ports), thread_name_prefix="ArcadeProbe") as pool:
+        found = [r for r in pool.map(lambda p: probe_port(p, baud, timeout), ports) if r]
+    found.sort(key=lambda r: (not r["confirmed"], not r["handshake"]))
+    return found
+
+
+def adalight_header(num_leds: int) -> bytes:
+    """Adalight frame header for `num_leds` LEDs."""
+    count = num_leds - 1
+    checksum = ((count >> 8) & 0xFF) ^ (count & 0xFF) ^ 0x55
+    return struct.pack(">3sBBB", b"Ada", (count >> 8) & 0xFF, count & 0xFF, checksum)
+
+
+def compile_color_orders(num_leds: int, default: str = BUTTON_ORDER, overrides: dict | None = None):
+    """
+    Compile color order rules into one flat channel permutation.
+
+    Returns an index array `perm` of length 3*num_leds such that
+    payload[k] = rgb[perm[k]]. Unknown orders fall back to RGB, like the
+    old per-pixel if/elif chain did.
+    """
+    if overrides is None:
+        overrides = COLOR_ORDER_OVERRIDES
+    perm = np.empty(num_leds * 3, dtype=np.intp)
+    for i in range(num_leds):
+        mode = str(overrides.get(i, default)).strip().upper()
+        if sorted(mode) != ["B", "G", "R"]:
+            mode = "RGB"
+        for k, ch in enumerate(mode):
+            perm[i * 3 + k] = i * 3 + "RGB".index(ch)
+    return perm
+
+
+def _rgb_bytes(color) -> bytes:
+    r, g, b = color
+    return bytes((min(max(int(r), 0), 255), min(max(int(g), 0), 255), min(max(int(b), 0), 255)))
+
+
+class FrameEncoder:
+    """
+    Adalight encoder with a precompiled channel permutation.
+
+    The output buffer is allocated once and already holds the header; each
+    encode() is a single np.take from the flat RGB buffer into the payload.
+
+    Output correction (gamma, white balance, brightness) is folded into one
+    256-entry table per output channel, so it costs two more np.take calls;
+    with the default identity settings the table stage is skipped entirely.
+    """
+
+    def __init__(self, num_leds: int = NUM_LEDS, default_order: str = BUTTON_ORDER,
+                 overrides: dict | None = None):
+        self.num_leds = int(num_leds)
+        n3 = self.num_leds * 3
+        self.frame = bytearray(HEADER_SIZE + n3)
+        self.frame[:HEADER_SIZE] = adalight_header(self.num_leds)
+        self._payload = np.frombuffer(self.frame, dtype=np.uint8)[HEADER_SIZE:]
+        self.default_order = default_order
+        self.overrides = dict(COLOR_ORDER_OVERRIDES if overrides is None else overrides)
+
+        # correction state (logical LED order: white_balance[i] = (r, g, b) scale)
+        self.gamma = GAMMA
+        self.brightness = BRIGHTNESS
+        self.white_balance = np.ones((self.num_leds, 3))
+        self.power_budget_ma = POWER_BUDGET_MA
+        self.last_current_ma = 0.0
+        self.frames_limited = 0
+        self._tmp = np.zeros(n3, dtype=np.uint8)
+        self._idx = np.zeros(n3, dtype=np.intp)
+        self._ramp256 = np.arange(256, dtype=np.float64)    # power limiter scratch
+        self._scale256 = np.empty(256, dtype=np.float64)
+        self._scale_lut = np.empty(256, dtype=np.uint8)
+        self._rebuild()
+
+    def _rebuild(self):
+        """Recompile the tables and publish them in one assignment (encode() may run meanwhile)."""
+        perm = compile_color_orders(self.num_leds, self.default_order, self.overrides)
+        scale = self.white_balance * self.brightness
+        if self.gamma == 1.0 and np.all(scale == 1.0):
+            self._tables = (perm, None, None)
+            return
+        # row k of the table belongs to output byte k: LED perm[k] // 3, channel perm[k] % 3
+        levels = (np.arange(256) / 255.0) ** self.gamma * 255.0
+        row_scale = np.clip(scale.reshape(-1)[perm], 0.0, 1.0)
+        lut = np.rint(row_scale[:, None] * levels[None, :]).astype(np.uint8).reshape(-1)
+        self._tables = (perm, lut, np.arange(len(perm), dtype=np.intp) * 256)
+
+    def set_order(self, index: int, order: str | None):
+        """Override the color order of one LED (None restores the default)."""
+        if order is None:
+            self.overrides.pop(index, None)
+        else:
+            self.overrides[index] = order
+        self._rebuild()
+
+    def set_correction(self, gamma: float | None = None, brightness: float | None = None,
+                       white_balance=None):
+        """
+        gamma: output = level ** gamma (2.2-2.8 suits WS2812B fades)
+        brightness: global cap 0..1
+        white_balance: (r, g, b) scales for every LED, or {index: (r, g, b)}
+        """
+        if gamma is not None:
+            self.gamma = float(gamma)
+        if brightness is not None:
+            self.brightness = min(max(float(brightness), 0.0), 1.0)
+        if white_balance is not None:
+            if isinstance(white_balance, dict):
+                for i, wb in white_balance.items():
+                    self.white_balance[int(i)] = wb
+            else:
+                self.white_balance[:] = white_balance
+        self._rebuild()
+
+    def encode(self, rgb) -> bytearray:
+        """Encode a flat uint8 RGB array (3*num_leds) into the reused frame buffer."""
+        perm, lut, row_base = self._tables  # one consistent set, even mid-set_correction()
+        if lut is None:
+            np.take(rgb, perm, out=self._payload, mode="clip")
+        else:
+            np.take(rgb, perm, out=self._tmp, mode="clip")
+            np.add(row_base, self._tmp, out=self._idx)
+            np.take(lut, self._idx, out=self._payload, mode="clip")
+        if self.power_budget_ma is not None:
+            self._limit_power()
+        return self.frame
+
+    def estimate_current_ma(self) -> float:
+        """Estimated draw of the last encoded frame."""
+        return float(self._payload.sum(dtype=np.uint32)) * (MA_PER_CHANNEL / 255.0) \
+            + self.num_leds * IDLE_MA_PER_LED
+
+    def _limit_power(self):
+        ma = self.last_current_ma = self.estimate_current_ma()
+        idle = self.num_leds * IDLE_MA_PER_LED
+        if ma <= self.power_budget_ma or ma <= idle:
+            return
+        # scale the whole frame so the LED share of the current fits the budget
+        k = max(self.power_budget_ma - idle, 0.0) / (ma - idle)
+        np.multiply(self._ramp256, k, out=self._scale256)  # preallocated: no per-frame arrays
+        np.copyto(self._scale_lut, self._scale256, casting="unsafe")
+        np.take(self._scale_lut, self._payload, out=self._tmp)
+        self._payload[:] = self._tmp
+        self.frames_limited += 1
+
+
+class PixelView:
+    """List-like (r, g, b) view over a flat RGB bytearray, so `cab.pixels[i] = c` keeps working."""
+
+    __slots__ = ("_buf",)
+
+    def __init__(self, buf: bytearray):
+        self._buf = buf
+
+    def __len__(self):
+        return len(self._buf) // 3
+
+    def _index(self, i: int) -> int:
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("pixel index out of range")
+        return i * 3
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        o = self._index(i)
+        return tuple(self._buf[o:o + 3])
+
+    def __setitem__(self, i, color):
+        o = self._index(i)
+        self._buf[o:o + 3] = _rgb_bytes(color)
+
+    def __iter__(self):
+        buf = self._buf
+        for o in range(0, len(buf), 3):
+            yield tuple(buf[o:o + 3])
+
+
+class FrameMailbox:
+    """
+    Single-slot, latest-frame-wins handoff between show() and the writer thread.
+
+    publish() overwrites whatever is pending; take() hands the newest frame to
+    the consumer. Two preallocated buffers are swapped, so nothing is allocated
+    per frame and the publisher never waits on the serial write.
+    """
+
+    def __init__(self, size: int):
+        self._slot = np.zeros(size, dtype=np.uint8)
+        self._spare = np.zeros(size, dtype=np.uint8)
+        self._pending = False
+        self.closed = False
+        self.dropped = 0  # frames overwritten before the consumer took them
+        self._cond = threading.Condition()
+
+    def publish(self, data):
+        with self._cond:
+            if self._pending:
+                self.dropped += 1
+            self._slot[:] = data
+            self._pending = True
+            self._cond.notify()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """Block until a frame is pending (or the mailbox is closed)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending or self.closed, timeout) and self._pending
+
+    def take(self):
+        """Return the newest pending frame, or None. Valid until the next take()."""
+        with self._cond:
+            if not self._pending:
+                return None
+            self._slot, self._spare = self._spare, self._slot
+            self._pending = False
+            self._cond.notify_all()
+            return self._spare
+
+    def drain(self, timeout: float) -> bool:
+        """Wait until the pending frame has been taken."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending or self.closed, timeout)
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class DurationWindow:
+    """Rolling window of the last `size` durations (seconds in, microseconds out)."""
+
+    def __init__(self, size: int = STATS_WINDOW):
+        self._samples = np.zeros(size, dtype=np.float64)
+        self._i = 0
+        self.count = 0
+
+    def add(self, seconds: float):
+        self._samples[self._i] = seconds
+        self._i = (self._i + 1) % len(self._samples)
+        self.count += 1
+
+    def summary(self) -> dict:
+        n = min(self.count, len(self._samples))
+        if not n:
+            return {"count": 0}
+        us = self._samples[:n] * 1e6
+        p50, p95, p99 = np.percentile(us, (50, 95, 99))
+        hist, _ = np.histogram(us, bins=(0,) + STATS_BUCKETS_US + (np.inf,))
+        return {"count": self.count, "mean": round(float(us.mean()), 1), "p50": round(float(p50), 1),
+                "p95": round(float(p95), 1), "p99": round(float(p99), 1), "max": round(float(us.max()), 1),
+                "histogram": {f"<{b}" if b != np.inf else f">={STATS_BUCKETS_US[-1]}": int(c)
+                              for b, c in zip(STATS_BUCKETS_US + (np.inf,), hist)}}
+
+
 def wheel(pos: int):
     """Color wheel helper (0..255)."""
     pos = int(pos) % 256
@@ -61,7 +501,184 @@ def wheel(pos: int):
     return (0, pos * 3, 255 - pos * 3)
 
 
-class Arcade:
+_WHEEL = np.array([wheel(i) for i in range(256)], dtype=np.uint8)
+
+
+def wheel_array(pos):
+    """Vectorized wheel(): array of positions -> (..., 3) uint8 colors."""
+    return _WHEEL[np.asarray(pos, dtype=np.intp) % 256]
+
+
+class _PixelState:
+    """
+    Named / indexed pixel access over a flat RGB bytearray (shared by Arcade and ArcadeGroup).
+
+    Writers (set / set_all / pixels[i] = c) only touch the back buffer `_rgb`;
+    single-pixel and whole-frame writes are one bytearray slice assignment each,
+    so they never tear. commit() copies the back buffer into the front buffer in
+    one memcpy and output only ever encodes from the front.
+    """
+
+    def _init_pixels(self, num_leds: int):
+        self.num_leds = int(num_leds)
+        self._rgb = bytearray(self.num_leds * 3)      # back buffer (writers)
+        self._rgb_view = np.frombuffer(self._rgb, dtype=np.uint8)
+        self._rgb_rows = self._rgb_view.reshape(-1, 3)
+        self._front = bytearray(self.num_leds * 3)    # last committed frame (output)
+        self._front_view = np.frombuffer(self._front, dtype=np.uint8)
+        self._stage_lock = threading.RLock()          # writer side only; held for a memcpy or a batch
+        self.frame_id = 0
+        self._sinks = []
+        self._outputs = []
+        self._recorder = None
+        self._stats_thread = None
+        self._stats_stop = threading.Event()
+        self._started = time.monotonic()
+
+    def commit(self):
+        """Publish the back buffer as the new front frame (one atomic copy)."""
+        with self._stage_lock:
+            self._front[:] = self._rgb
+            self.frame_id += 1
+
+    @contextmanager
+    def batch(self):
+        """
+        Stage several changes as one frame and show it on exit:
+
+            with cab.batch():
+                cab.set("P1_A", c1); cab.set("P1_B", c2)
+
+        show()/commit() from other threads wait for the batch, so they never
+        publish half of it.
+        """
+        with self._stage_lock:
+            yield self
+            self.show()
+
+    def front_frame(self) -> bytes:
+        """Copy of the last committed frame (flat RGB)."""
+        return bytes(self._front)
+
+    @property
+    def back_buffer(self):
+        """(num_leds, 3) uint8 view of the back buffer for array writers; write inside batch()."""
+        return self._rgb_rows
+
+    @property
+    def pixels(self) -> PixelView:
+        return PixelView(self._rgb)
+
+    @pixels.setter
+    def pixels(self, frame):
+        self._load_frame(frame)
+
+    def _load_frame(self, frame):
+        pixels = list(frame)[:self.num_leds]
+        data = b"".join(_rgb_bytes(c) for c in pixels)
+        self._rgb[:] = data + bytes(len(self._rgb) - len(data))
+
+    def set(self, name: str, color: tuple[int, int, int]):
+        if name in self.LEDS:
+            o = self.LEDS[name] * 3
+            self._rgb[o:o + 3] = _rgb_bytes(color)
+
+    def set_all(self, color: tuple[int, int, int]):
+        self._rgb[:] = _rgb_bytes(color) * self.num_leds
+
+    def load_rgb(self, rgb):
+        """Replace the whole frame from flat RGB bytes (truncated / padded with black)."""
+        n = min(len(rgb), len(self._rgb))
+        with self._stage_lock:
+            self._rgb[:n] = memoryview(rgb)[:n]
+            if n < len(self._rgb):
+                self._rgb[n:] = bytes(len(self._rgb) - n)
+
+    # ---------------- Frame Sinks ----------------
+    def add_sink(self, sink):
+        """sink(rgb) receives the flat RGB of every frame written (called from the writing thread)."""
+        self._sinks.append(sink)
+
+    def remove_sink(self, sink):
+        if sink in self._sinks:
+            self._sinks.remove(sink)
+
+    def add_output(self, output):
+        """
+        output(rgb) receives the flat RGB of every frame show() commits, whether
+        or not the serial device is connected or accepted it (called from the
+        show() caller; the output copies and paces the frame itself).
+        """
+        self._outputs.append(output)
+
+    def remove_output(self, output):
+        if output in self._outputs:
+            self._outputs.remove(output)
+
+    def _feed_outputs(self):
+        for output in self._outputs:
+            try:
+                output(self._front_view)
+            except Exception as e:
+                print(f"Frame Output Error: {e}")
+
+    def _notify_sinks(self, rgb):
+        for sink in self._sinks:
+            try:
+                sink(rgb)
+            except Exception as e:
+                print(f"Frame Sink Error: {e}")
+
+    def start_recording(self, path: str) -> FrameRecorder:
+        """Append every written frame to an ArcadeRecorder log at `path`."""
+        self.stop_recording()
+        self._recorder = FrameRecorder(path, self.num_leds)
+        self.add_sink(self._recorder)
+        return self._recorder
+
+    def stop_recording(self):
+        rec, self._recorder = self._recorder, None
+        if rec is not None:
+            self.remove_sink(rec)
+            rec.close()
+
+    # ---------------- Statistics Snapshots ----------------
+    def start_stats_file(self, path: str, interval: float = STATS_INTERVAL):
+        """Rewrite `path` with stats() as JSON every `interval` seconds (atomic replace)."""
+        self.stop_stats_file()
+        self._stats_stop = threading.Event()
+
+        def loop(stop=self._stats_stop):
+            while not stop.wait(interval):
+                self.write_stats(path)
+        self._stats_thread = threading.Thread(target=loop, name="ArcadeStats", daemon=True)
+        self._stats_thread.start()
+
+    def stop_stats_file(self):
+        self._stats_stop.set()
+        self._stats_thread = None
+
+    def write_stats(self, path: str):
+        try:
+            tmp = f"{path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.stats(), f, indent=2)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Stats Snapshot Error: {e}")
+
+    def send_frame(self, frame):
+        """
+        Immediately write a full frame to hardware.
+        frame: iterable of (r,g,b) tuples, one per LED (short frames are padded with black)
+        """
+        if not frame:
+            return
+        self._load_frame(frame)  # normalizes length, pads with black
+        self.show()
+
+
+class Arcade(_PixelState):
     """
     Adalight-compatible WS2812B controller driver for PicoCTR + WS2812B adapter.
 
@@ -88,120 +705,696 @@ class Arcade:
         "TRACKBALL": 16,
     }
 
-    def __init__(self, port: str | None = None, baud: int | None = None):
+    def __init__(self, port: str | None = None, baud: int | None = None,
+                 color_orders: dict | None = None, async_output: bool = False,
+                 keepalive: float | None = KEEPALIVE, num_leds: int | None = None,
+                 block: bool = True, boot_delay: float | None = None,
+                 usb_id: tuple | None = None, autodetect: bool = False,
+                 on_connect=None, auto_reconnect: bool = False):
         self.port = port or DEFAULT_PORT
         self.baud = int(baud or DEFAULT_BAUD)
         self.ser = None
-        self.pixels = [(0, 0, 0)] * NUM_LEDS
+        self._init_pixels(num_leds or NUM_LEDS)
+        self._encoder = FrameEncoder(self.num_leds, BUTTON_ORDER, color_orders)
         self._last_write = 0.0
+        self.frame_interval = THROTTLE
+
+        # adaptive rate: frame_interval backs off on write timeouts and
+        # recovers toward min_frame_interval (the calibrated cap)
+        self.min_frame_interval = THROTTLE
+        self.calibration = None
+        self.write_timeouts = 0
+        self._clean_writes = 0
 
-        self._open_serial(self.port, self.baud)
+        # sync output: private snapshot of the front buffer per write
+        self._snap = bytearray(self.num_leds * 3)
+        self._snap_view = np.frombuffer(self._snap, dtype=np.uint8)
+        self._out_lock = threading.Lock()
+
+        # dirty-frame suppression
+        self.keepalive = keepalive
+        self._last_sent = bytearray(len(self._encoder.frame))
+        self._sent_valid = False
+        self.frames_sent = 0
+        self.frames_skipped = 0
+        self.frames_keepalive = 0
+
+        # statistics (see stats())
+        self.frames_requested = 0
+        self.frames_throttled = 0
+        self.frames_offline = 0
+        self.serial_errors = 0
+        self.writer_errors = 0
+        self.bytes_sent = 0
+        self.encode_time = DurationWindow()
+        self.write_time = DurationWindow()
+
+        # async output: show() only publishes, the writer thread owns ser.write
+        self._mailbox = None
+        self._writer = None
+        if async_output:
+            self._mailbox = FrameMailbox(len(self._rgb))
+            self._writer = threading.Thread(target=self._writer_loop, name="ArcadeWriter", daemon=True)
+            self._writer.start()
+
+        # connection identity (cache these to make the next connect instant)
+        self.boot_delay = BOOT_DELAY if boot_delay is None else float(boot_delay)
+        self.vid, self.pid = usb_id if usb_id else (None, None)
+        self.on_connect = on_connect
+        self.port_candidates = []  # ports autodetect found but could not identify
+        self._connect_lock = threading.Lock()
+        self._connecting = False
+
+        # hot-plug supervision
+        self.state = STATE_DISCONNECTED
+        self._state_listeners = []
+        self._closed = False
+        self._watch_port = None   # port the supervisor brings back after a loss
+        self._enumerated = False  # port shows up in available_ports() (presence can be polled)
+        self._wake = threading.Event()
+        self._supervisor = None
+        if auto_reconnect:
+            self._supervisor = threading.Thread(target=self._supervise, name="ArcadeSupervisor", daemon=True)
+            self._supervisor.start()
+
+        target = None if (autodetect and not port) else self.port
+        if block:
+            self._connect(target, self.baud)
+        else:
+            self.connect_async(target, self.baud)
 
     # ---------------- Connection ----------------
     def _open_serial(self, port: str, baud: int):
         try:
             # write_timeout prevents infinite hangs if a frame stalls
-            self.ser = serial.Serial(port, baud, timeout=1, write_timeout=0.1)
+            ser = open_transport(port, baud, timeout=0.05, write_timeout=0.1)
+            ids = usb_id(port)
+            if is_known_usb_id(ids):
+                self.boot_delay = 0.0  # PicoCTR-style board: no reset on open, no greeting to wait for
+            # allow MCU boot/reset; returns early once the firmware greets us
+            if self.boot_delay > 0 and getattr(ser, "resets_on_open", True):
+                _wait_handshake(ser, self.boot_delay)
+            ser.timeout = 1
             self.port = port
             self.baud = int(baud)
-            time.sleep(2)  # allow MCU boot/reset
+            if ids:
+                self.vid, self.pid = ids
+            self._sent_valid = False  # fresh device: next frame always goes out
+            self._enumerated = port in available_ports()
+            self._watch_port = port
+            self.ser = ser
             print(f"Arcade Controller Connected on {self.port} @ {self.baud}bps")
+            self._set_state(STATE_CONNECTED)
         except Exception as e:
             print(f"Hardware Connection Failed: {e}")
             self.ser = None
 
-    def reconnect(self, port: str | None = None, baud: int | None = None):
-        """Close and reopen serial on a new COM port / baud."""
+    def _resolve_port(self, port: str | None):
+        """Prefer the requested port; follow the cached USB id if the COM number moved."""
+        if port and (port in available_ports() or not _HAS_LIST_PORTS or self.vid is None):
+            return port
+        if self.vid is not None:
+            moved = find_port_by_usb_id(self.vid, self.pid)
+            if moved:
+                return moved
+        if port:
+            return port
+        found = discover_ports(baud=self.baud)
+        self.port_candidates = [r["port"] for r in found if not r["confirmed"]]
+        if found and found[0]["confirmed"]:
+            self.boot_delay = found[0]["boot_delay"]
+            return found[0]["port"]
+        if self.port_candidates:
+            print(f"Unconfirmed ports (pick one): {', '.join(self.port_candidates)}")
+        return None
+
+    def _connect(self, port: str | None, baud: int):
+        with self._connect_lock:
+            self._connecting = True
+            self._set_state(STATE_CONNECTING)
+            try:
+                target = self._resolve_port(port)
+                if target:
+                    self._open_serial(target, baud)
+                else:
+                    print("Hardware Connection Failed: no Adalight device found")
+            finally:
+                self._connecting = False
+            if self.ser is None:
+                self._set_state(STATE_DISCONNECTED)
+        if self.ser is not None and self.frame_id:
+            self._replay()  # frames committed before the port was open never went out
+        if self.on_connect:
+            try:
+                self.on_connect(self)
+            except Exception as e:
+                print(f"on_connect Error: {e}")
+
+    def connect_async(self, port: str | None = None, baud: int | None = None):
+        """
+        Open the port on a background thread and return immediately.
+        port=None probes every available port for the Adalight device.
+        on_connect(arcade) is called from that thread when done (check is_connected()).
+        """
+        self._connecting = True
+        threading.Thread(target=self._connect, args=(port, int(baud or self.baud)),
+                         name="ArcadeConnect", daemon=True).start()
+
+    def is_connecting(self) -> bool:
+        return self._connecting
+
+    def connection_info(self) -> dict:
+        """Port identity worth caching in settings for an instant reconnect."""
+        return {"port": self.port, "baud": self.baud, "vid": self.vid, "pid": self.pid,
+                "boot_delay": self.boot_delay}
+
+    def reconnect(self, port: str | None = None, baud: int | None = None, block: bool = True):
+        """Close and reopen serial on a new COM port / baud (block=False returns immediately)."""
         new_port = port or self.port or DEFAULT_PORT
         new_baud = int(baud or self.baud or DEFAULT_BAUD)
-        try:
-            if self.ser:
-                try:
-                    self.ser.close()
-                except Exception:
-                    pass
-        finally:
-            self.ser = None
+        if port and port != self.port:
+            # a different device: forget the cached identity
+            self.vid, self.pid = None, None
+            self.boot_delay = BOOT_DELAY
+        self.close_port()
+
+        if block:
+            self._connect(new_port, new_baud)
+        else:
+            self.connect_async(new_port, new_baud)
+
+    def autodetect(self, block: bool = True):
+        """Drop the current port and probe every available port for the controller."""
+        self.close_port()
+        self.vid, self.pid = None, None
+        if block:
+            self._connect(None, self.baud)
+        else:
+            self.connect_async(None, self.baud)
+
+    def close_port(self):
+        """Close the port on purpose (the supervisor won't bring it back)."""
+        self._watch_port = None
+        self._drop_port()
+        self._set_state(STATE_DISCONNECTED)
 
-        self._open_serial(new_port, new_baud)
+    def _drop_port(self):
+        ser, self.ser = self.ser, None
+        if ser:
+            try:
+                ser.close()
+            except Exception:
+                pass
+
+    # ---------------- Hot-plug Supervisor ----------------
+    def add_state_listener(self, callback):
+        """callback(arcade, state) on every connection state change (called from driver threads)."""
+        self._state_listeners.append(callback)
+
+    def remove_state_listener(self, callback):
+        if callback in self._state_listeners:
+            self._state_listeners.remove(callback)
+
+    def _set_state(self, state: str):
+        if state == self.state:
+            return
+        self.state = state
+        for cb in list(self._state_listeners):
+            try:
+                cb(self, state)
+            except Exception as e:
+                print(f"State Listener Error: {e}")
+
+    def _lost(self, reason):
+        """The device went away under us: drop the handle and let the supervisor retry."""
+        if self.ser is None:
+            return
+        print(f"Arcade Controller Lost: {reason}")
+        self._drop_port()
+        self._set_state(STATE_DISCONNECTED)
+        self._wake.set()
+
+    def _supervise(self):
+        delay = RECONNECT_MIN
+        while not self._closed:
+            if self.ser is not None or self._connecting or self._watch_port is None:
+                delay = RECONNECT_MIN
+                self._wake.wait(PRESENCE_POLL)
+                self._wake.clear()
+                # unplugged while idle: no write has failed yet, but the port is gone
+                if self.ser is not None and self._enumerated and self.port not in available_ports():
+                    self._lost("device removed")
+                continue
+
+            with self._connect_lock:
+                if self.ser is None and self._watch_port is not None and not self._closed:
+                    self._set_state(STATE_RECONNECTING)
+                    target = self._resolve_port(self._watch_port)
+                    if target in available_ports() or not self._enumerated:
+                        self._open_serial(target, self.baud)
+            if self.ser is not None:
+                self._replay()
+                if self.on_connect:
+                    try:
+                        self.on_connect(self)
+                    except Exception as e:
+                        print(f"on_connect Error: {e}")
+                continue
+
+            self._set_state(STATE_DISCONNECTED)
+            self._wake.wait(delay)
+            self._wake.clear()
+            delay = min(delay * 2, RECONNECT_MAX)
+
+    def _replay(self):
+        """Resend the current frame right away (after a reconnect)."""
+        self._sent_valid = False
+        if self._mailbox is not None:
+            self._mailbox.publish(self._front_view)
+        else:
+            self._emit_front()
 
     def is_connected(self) -> bool:
         return self.ser is not None
 
-    # ---------------- Pixel State ----------------
-    def set(self, name: str, color: tuple[int, int, int]):
-        if name in self.LEDS:
-            self.pixels[self.LEDS[name]] = tuple(map(int, color))
+    def set_color_order(self, index: int, order: str | None):
+        """Give one LED index its own color order (e.g. 'GRB'); None restores BUTTON_ORDER."""
+        self._encoder.set_order(index, order)
 
-    def set_all(self, color: tuple[int, int, int]):
-        c = tuple(map(int, color))
-        self.pixels = [c] * NUM_LEDS
+    def set_correction(self, gamma: float | None = None, brightness: float | None = None,
+                       white_balance=None):
+        """Output gamma / brightness cap / white balance (see FrameEncoder.set_correction)."""
+        self._encoder.set_correction(gamma, brightness, white_balance)
+        self._sent_valid = False
 
-    def send_frame(self, frame):
+    def set_power_budget(self, milliamps: float | None):
+        """Scale frames down when their estimated current exceeds `milliamps` (None = off)."""
+        self._encoder.power_budget_ma = milliamps
+        self._sent_valid = False
+
+    # ---------------- Link Calibration ----------------
+    def calibrate(self, duration: float = 1.0, try_bauds=None,
+                  margin: float = CALIBRATION_MARGIN) -> dict | None:
         """
-        Immediately write a full 30-LED frame to hardware.
-        frame: iterable of 30 tuples (r,g,b)
+        Measure the connected link and set the frame-rate cap from it.
+
+        Writes the current frame back to back for `duration` seconds, timing
+        each write until the port reports it drained (flush). Normal output
+        waits meanwhile. try_bauds: optional faster bauds the firmware
+        supports; each is tried and kept only if it ran without timeouts and
+        moved clearly more bytes (USB CDC boards ignore baud, so they stay put).
+        Returns the result (see apply_calibration), or None without a port.
         """
-        if not frame:
-            return
-        # normalize length
-        pixels = list(frame)[:NUM_LEDS]
-        if len(pixels) < NUM_LEDS:
-            pixels += [(0, 0, 0)] * (NUM_LEDS - len(pixels))
-        self.pixels = [tuple(map(int, c)) for c in pixels]
-        self.show()
+        with self._out_lock:
+            ser = self.ser
+            if ser is None:
+                return None
+            frame = bytes(self._encoder.encode(self._front_view))
+            try:
+                best = self._measure(ser, frame, duration, margin)
+                for baud in sorted(int(b) for b in (try_bauds or ())):
+                    if baud <= best["baud"]:
+                        continue
+                    try:
+                        ser.baudrate = baud
+                    except (ValueError, OSError) as e:
+                        print(f"Baud {baud} rejected: {e}")
+                        break
+                    trial = self._measure(ser, frame, duration / 2, margin)
+                    if not trial["timeouts"] and trial["bytes_per_s"] > best["bytes_per_s"] * 1.1:
+                        best = trial
+                if ser.baudrate != best["baud"]:
+                    ser.baudrate = best["baud"]
+            except Exception as e:
+                print(f"Calibration Failed: {e}")
+                best = None
+            self._sent_valid = False  # the test frames replaced whatever was on the LEDs
+        if best is None:
+            self._lost("calibration write failed")
+            return None
+        best["port"] = str(self.port)
+        self.apply_calibration(best)
+        return best
+
+    def _measure(self, ser, frame: bytes, duration: float, margin: float) -> dict:
+        latencies = []
+        timeouts = 0
+        t0 = time.perf_counter()
+        end = t0 + duration
+        while len(latencies) < CALIBRATION_FRAMES:
+            t = time.perf_counter()
+            if t >= end:
+                break
+            try:
+                ser.write(frame)
+                ser.flush()
+            except SerialTimeoutException:
+                timeouts += 1
+                try:
+                    ser.reset_output_buffer()
+                except Exception:
+                    pass
+                continue
+            latencies.append(time.perf_counter() - t)
+        elapsed = max(time.perf_counter() - t0, 1e-9)
+
+        done = len(latencies)
+        latencies.sort()
+        p50 = latencies[done // 2] if done else MAX_FRAME_INTERVAL
+        p95 = latencies[min(done - 1, int(done * 0.95))] if done else MAX_FRAME_INTERVAL
+        per_frame = max(p95, elapsed / done if done else MAX_FRAME_INTERVAL)
+        interval = per_frame * margin * (RATE_BACKOFF if timeouts else 1.0)
+        interval = min(max(interval, MIN_FRAME_INTERVAL), MAX_FRAME_INTERVAL)
+        return {"baud": int(getattr(ser, "baudrate", self.baud) or self.baud),
+                "frame_bytes": len(frame), "frames": done, "timeouts": timeouts,
+                "bytes_per_s": round(done * len(frame) / elapsed),
+                "latency_ms": round(p50 * 1000, 3), "latency_p95_ms": round(p95 * 1000, 3),
+                "frame_interval": round(interval, 5), "max_fps": round(1 / interval, 1),
+                "measured_at": int(time.time())}
+
+    def apply_calibration(self, result: dict):
+        """Use a calibrate() result (fresh or cached per port): baud and frame-rate cap."""
+        baud = int(result.get("baud") or self.baud)
+        if baud != self.baud:
+            if self.ser is not None:
+                try:
+                    self.ser.baudrate = baud
+                except Exception as e:
+                    print(f"Baud Change Failed: {e}")
+                    baud = self.baud
+            self.baud = baud
+        interval = float(result.get("frame_interval") or THROTTLE)
+        interval = min(max(interval, MIN_FRAME_INTERVAL), MAX_FRAME_INTERVAL)
+        self.min_frame_interval = self.frame_interval = interval
+        self._clean_writes = 0
+        self.calibration = dict(result)
 
     # ---------------- Adalight Write ----------------
     def show(self):
-        if not self.ser:
-            return
+        self.frames_requested += 1
+        with self._stage_lock:
+            # commit even while offline: a reconnect replays the front frame
+            self.commit()
+            if self._outputs:
+                self._feed_outputs()
+            if not self.ser:
+                self.frames_offline += 1
+                return
+            if self._mailbox is not None:
+                # async: hand the frame to the writer thread and return immediately
+                self._mailbox.publish(self._front_view)
+                return
 
         # throttle writes to avoid overruns
-        now = time.time()
-        if (now - self._last_write) < THROTTLE:
+        if (time.monotonic() - self._last_write) < self.frame_interval:
+            self.frames_throttled += 1
             return
-        self._last_write = now
+        self._emit_front()
 
-        count = NUM_LEDS - 1
-        checksum = ((count >> 8) & 0xFF) ^ (count & 0xFF) ^ 0x55
-        header = struct.pack(">3sBBB", b"Ada", (count >> 8) & 0xFF, count & 0xFF, checksum)
+    def _emit_front(self):
+        """Sync write of the committed frame (callers on several threads take turns)."""
+        with self._out_lock:
+            self._snap[:] = self._front  # private copy: a later commit can't tear this frame
+            self._emit(self._snap_view)
 
-        payload = bytearray()
-        for i, (r, g, b) in enumerate(self.pixels):
-            if i == 16:
-                mode = TRACKBALL_ORDER.strip().upper()
-            else:
-                mode = BUTTON_ORDER.strip().upper()
-
-            if mode == "GRB":
-                payload.extend((g, r, b))
-            elif mode == "BGR":
-                payload.extend((b, g, r))
-            elif mode == "RBG":
-                payload.extend((r, b, g))
-            elif mode == "GBR":
-                payload.extend((g, b, r))
-            elif mode == "BRG":
-                payload.extend((b, r, g))
-            else:
-                payload.extend((r, g, b))
+    def _emit(self, rgb):
+        """Encode and write one frame. Runs on the caller (sync) or writer thread (async)."""
+        t = time.perf_counter()
+        frame = self._encoder.encode(rgb)
+        self.encode_time.add(time.perf_counter() - t)
+        if self._sent_valid and frame == self._last_sent:
+            if not self._keepalive_due():
+                self.frames_skipped += 1
+                return
+            if self._write(frame):
+                self.frames_keepalive += 1
+            return
+        if self._write(frame):
+            self._last_sent[:] = frame
+            self._sent_valid = True
+            self.frames_sent += 1
+            if self._sinks:
+                self._notify_sinks(rgb)
 
+    def _keepalive_due(self) -> bool:
+        return self.keepalive is not None and (time.monotonic() - self._last_write) >= self.keepalive
+
+    def _write(self, frame) -> bool:
+        ser = self.ser
+        if ser is None:
+            return False
         try:
-            self.ser.write(header + payload)
+            t = time.perf_counter()
+            ser.write(frame)
+            self.write_time.add(time.perf_counter() - t)
+            self.bytes_sent += len(frame)
+            self._last_write = time.monotonic()
+            if self.frame_interval > self.min_frame_interval:
+                self._clean_writes += 1
+                if self._clean_writes >= RECOVER_AFTER:
+                    self._clean_writes = 0
+                    self.frame_interval = max(self.min_frame_interval, self.frame_interval * RATE_RECOVER)
+            return True
         except SerialTimeoutException:
-            # Skip this frame. Do not crash the app.
-            print("Serial Write Timeout - Skipping Frame")
+            # Skip this frame and slow down. Do not crash the app.
+            self.write_timeouts += 1
+            self._clean_writes = 0
+            self.frame_interval = min(MAX_FRAME_INTERVAL, self.frame_interval * RATE_BACKOFF)
+            print(f"Serial Write Timeout - Skipping Frame (now {1 / self.frame_interval:.0f} FPS max)")
             try:
-                self.ser.reset_output_buffer()
+                ser.reset_output_buffer()
             except Exception:
                 pass
         except Exception as e:
             print(f"Serial Error: {e}")
+            self.serial_errors += 1
+            self._lost(e)
+        return False
 
-    def close(self):
-        if self.ser:
+    def _writer_loop(self):
+        mb = self._mailbox
+        while not mb.closed:
             try:
-                self.ser.close()
-            except Exception:
-                pass
-        self.ser = None
+                self._writer_step(mb)
+            except Exception as e:
+                # never let one bad frame kill the writer: show() would publish into a dead mailbox
+                self.writer_errors += 1
+                print(f"Writer Error: {type(e).__name__}: {e}")
+                time.sleep(self.frame_interval)
+
+    def _writer_step(self, mb):
+        idle = 0.5 if self.keepalive is None else min(0.5, self.keepalive)
+        if not mb.wait(idle):
+            # nothing new: keep the controller alive with the last frame
+            with self._out_lock:
+                if self._sent_valid and self._keepalive_due() and self._write(self._last_sent):
+                    self.frames_keepalive += 1
+            return
+        # pace to frame_interval; frames published meanwhile replace the pending one
+        delay = self._last_write + self.frame_interval - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        rgb = mb.take()
+        if rgb is None:
+            return
+        with self._out_lock:  # uncontended except while calibrate() runs
+            self._emit(rgb)
+
+    # ---------------- Statistics ----------------
+    def stats(self) -> dict:
+        """
+        Counters since start, recent encode / write durations (microseconds) and
+        a bottleneck hint: "link" when writes eat most of the frame interval or
+        timeouts have pushed the rate below its calibrated cap, "cpu" when
+        encoding takes over a quarter of it, None when healthy.
+        """
+        uptime = max(time.monotonic() - self._started, 1e-9)
+        encode = self.encode_time.summary()
+        write = self.write_time.summary()
+        return {
+            "port": str(self.port), "state": self.state, "baud": self.baud,
+            "uptime_s": round(uptime, 1),
+            "frame_interval_ms": round(self.frame_interval * 1000, 2),
+            "min_frame_interval_ms": round(self.min_frame_interval * 1000, 2),
+            "frames_requested": self.frames_requested,
+            "frames_written": self.frames_sent,
+            "frames_throttled": self.frames_throttled,
+            "frames_dropped": self._mailbox.dropped if self._mailbox is not None else 0,
+            "frames_unchanged": self.frames_skipped,
+            "frames_keepalive": self.frames_keepalive,
+            "frames_offline": self.frames_offline,
+            "write_timeouts": self.write_timeouts,
+            "serial_errors": self.serial_errors,
+            "writer_errors": self.writer_errors,
+            "bytes_sent": self.bytes_sent,
+            "written_fps": round(self.frames_sent / uptime, 1),
+            "encode_us": encode,
+            "write_us": write,
+            "bottleneck": self._bottleneck(encode, write),
+        }
+
+    def _bottleneck(self, encode: dict, write: dict):
+        budget_us = self.frame_interval * 1e6
+        if self.frame_interval > self.min_frame_interval or write.get("p95", 0) > 0.8 * budget_us:
+            return "link"
+        if encode.get("p95", 0) > 0.25 * budget_us:
+            return "cpu"
+        return None
+
+    def flush(self, timeout: float = 0.5) -> bool:
+        """Async mode: wait until the newest published frame has been handed to the writer."""
+        if self._mailbox is None:
+            return True
+        return self._mailbox.drain(timeout)
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        self.stop_stats_file()
+        self.stop_recording()
+        if self._mailbox is not None:
+            self.flush()  # let a final frame (e.g. all off) go out
+            self._mailbox.close()
+            if self._writer is not threading.current_thread():
+                self._writer.join(timeout=1.0)
+        self.close_port()
+
+
+class ArcadeGroup(_PixelState):
+    """
+    Several controllers driven as one logical LED strip.
+
+    devices: list of dicts with Arcade keyword args, e.g.
+        [{"port": "COM3", "num_leds": 30},
+         {"port": "COM5", "num_leds": 30, "color_orders": {}},
+         {"port": "COM7", "baud": 115200, "num_leds": 60}]
+
+    Logical indices run through the devices in order (device 2 above starts
+    at index 30). set()/set_all()/show() work exactly like on Arcade; show()
+    writes every device in the same tick, in parallel, so slow ports don't
+    add their latencies together.
+    """
+
+    LEDS = Arcade.LEDS
+
+    def __init__(self, devices: list[dict], async_output: bool = False,
+                 keepalive: float | None = KEEPALIVE, block: bool = True, on_connect=None,
+                 auto_reconnect: bool = False):
+        if not devices:
+            raise ValueError("ArcadeGroup needs at least one device")
+        self._pool = ThreadPoolExecutor(max_workers=len(devices), thread_name_prefix="ArcadeGroup")
+
+        # open all ports in parallel (each open waits for its MCU)
+        def _open(spec):
+            kw = {"async_output": async_output, "keepalive": keepalive,
+                  "block": block, "on_connect": on_connect, "auto_reconnect": auto_reconnect}
+            kw.update(spec)
+            return Arcade(**kw)
+        self.devices = list(self._pool.map(_open, devices))
+
+        self._slices = []
+        offset = 0
+        for dev in self.devices:
+            self._slices.append((dev, offset * 3, (offset + dev.num_leds) * 3))
+            offset += dev.num_leds
+        self._init_pixels(offset)
+        self._mv = memoryview(self._rgb)
+        self._async = async_output
+        self.keepalive = keepalive
+        self._last_write = 0.0
+        self.frames_requested = 0
+        self.frames_throttled = 0
+
+    @property
+    def frame_interval(self) -> float:
+        """Sync output paces the whole group to its slowest link."""
+        return max(d.frame_interval for d in self.devices)
+
+    @property
+    def port(self) -> str:
+        return "+".join(str(d.port) for d in self.devices)
+
+    @property
+    def ser(self):
+        """Primary device handle (kept for callers that test `cab.ser`)."""
+        return self.devices[0].ser
+
+    def is_connected(self) -> bool:
+        return any(d.is_connected() for d in self.devices)
+
+    def is_connecting(self) -> bool:
+        return any(d.is_connecting() for d in self.devices)
+
+    def add_state_listener(self, callback):
+        """callback(device, state) for every member device."""
+        for d in self.devices:
+            d.add_state_listener(callback)
+
+    def set_correction(self, gamma: float | None = None, brightness: float | None = None,
+                       white_balance=None):
+        """Same correction on every device (a white_balance dict uses logical indices)."""
+        for dev, a, b in self._slices:
+            wb = white_balance
+            if isinstance(wb, dict):
+                lo, hi = a // 3, b // 3
+                wb = {int(i) - lo: v for i, v in wb.items() if lo <= int(i) < hi}
+            dev.set_correction(gamma, brightness, wb)
+
+    def set_power_budget(self, milliamps: float | None):
+        """Budget per device (each controller has its own supply)."""
+        for dev in self.devices:
+            dev.set_power_budget(milliamps)
+
+    def calibrate(self, duration: float = 1.0, try_bauds=None) -> list:
+        """Calibrate every connected device in parallel; one result (or None) per device."""
+        return list(self._pool.map(lambda d: d.calibrate(duration, try_bauds), self.devices))
+
+    def reconnect(self, port: str | None = None, baud: int | None = None, block: bool = True):
+        """Reopen every device in parallel. A port/baud argument retargets the first device."""
+        args = [(port, baud)] + [(None, None)] * (len(self.devices) - 1)
+        list(self._pool.map(lambda d, a: d.reconnect(*a, block=block), self.devices, args))
+
+    def show(self):
+        self.frames_requested += 1
+        with self._stage_lock:
+            self.commit()
+            if self._outputs:
+                self._feed_outputs()
+            # scatter the logical frame into each device and commit them together
+            for dev, a, b in self._slices:
+                dev._rgb[:] = self._mv[a:b]
+                if self._async:
+                    dev.show()
+                else:
+                    dev.commit()
+
+        if self._async:
+            if self._sinks:
+                self._notify_sinks(self._front_view)  # requested frame; writers pace themselves
+            return
+
+        now = time.monotonic()
+        if (now - self._last_write) < self.frame_interval:
+            self.frames_throttled += 1
+            return
+        self._last_write = now
+        futures = [self._pool.submit(dev._emit_front) for dev in self.devices if dev.ser]
+        for f in futures:
+            f.result()
+        if self._sinks:
+            self._notify_sinks(self._front_view)
+
+    def stats(self) -> dict:
+        """Group counters plus every device's stats(); the worst device sets the bottleneck."""
+        devices = [d.stats() for d in self.devices]
+        hints = [d["bottleneck"] for d in devices if d["bottleneck"]]
+        return {"port": self.port, "uptime_s": round(time.monotonic() - self._started, 1),
+                "frames_requested": self.frames_requested, "frames_throttled": self.frames_throttled,
+                "bottleneck": "link" if "link" in hints else (hints[0] if hints else None),
+                "devices": devices}
+
+    def close(self):
+        self.stop_stats_file()
+        self.stop_recording()
+        list(self._pool.map(lambda d: d.close(), self.devices))
+        self._pool.shutdown(wait=False)
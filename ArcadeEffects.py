@@ -0,0 +1,208 @@
+"""
+Arcade Commander - ArcadeEffects
+
+Input-reactive effects for the render engine's input layer. A button press
+posts a small effect object instead of starting a thread that sleeps and
+writes to the driver; the render thread picks it up on its next tick (at
+most one frame later) and evaluates every live effect from the time since
+its press.
+
+    renderer.post(Flash(cab.LEDS["P1_A"]))                   # R -> B -> G, then hold green
+    renderer.post(Fade(cab.LEDS["P1_B"], (255, 255, 255)))   # white, fading out
+    renderer.post(Ripple(cab.LEDS["P1_C"], (0, 128, 255)))   # ring spreading along the strip
+    renderer.post(Release())                                 # drop held effects (all, or one index)
+
+Memory is bounded: posts go through a fixed-size inbox, a new effect of the
+same kind on the same LED replaces the old one, and at most MAX_EFFECTS run
+at once (the oldest is dropped first).
+"""
+
+import time
+from collections import deque
+
+import numpy as np
+
+from ArcadeCompositor import Layer
+from ArcadeDriver import DurationWindow
+
+MAX_EFFECTS = 64
+FLASH_COLORS = ((255, 0, 0), (0, 0, 255), (0, 255, 0))
+FLASH_STEP = 0.100
+FADE_TIME = 0.500
+RIPPLE_SPEED = 40.0         # LEDs per second
+RIPPLE_WIDTH = 1.5          # LEDs
+RIPPLE_TIME = 0.600
+
+
+class Effect:
+    """One press. draw(t, layer) paints at t seconds after start; returns False once finished."""
+
+    __slots__ = ("index", "start", "shown")
+
+    def __init__(self, index: int):
+        self.index = int(index)
+        self.start = 0.0
+        self.shown = False
+
+    @property
+    def key(self):
+        """Effects with the same key replace each other (a re-press restarts it)."""
+        return type(self), self.index
+
+    def draw(self, t: float, layer: "InputLayer") -> bool:
+        return False
+
+    def static(self, t: float) -> bool:
+        """True when draw() would paint exactly what it painted last frame."""
+        return False
+
+
+class Flash(Effect):
+    """Steps through `colors`; hold=True keeps the last one lit until Release."""
+
+    __slots__ = ("colors", "step", "hold")
+
+    def __init__(self, index: int, colors=FLASH_COLORS, step: float = FLASH_STEP, hold: bool = True):
+        super().__init__(index)
+        self.colors = tuple(tuple(c) for c in colors)
+        self.step = float(step)
+        self.hold = hold
+
+    def draw(self, t, layer):
+        i = int(t / self.step) if self.step > 0 else len(self.colors)
+        if i >= len(self.colors) and not self.hold:
+            return False
+        layer.paint(self.index, self.colors[min(i, len(self.colors) - 1)], 1.0)
+        return True
+
+    def static(self, t):
+        return self.hold and t >= self.step * (len(self.colors) - 1)
+
+
+class Fade(Effect):
+    """Full `color` at the press, linearly back to whatever is below over `duration`."""
+
+    __slots__ = ("color", "duration")
+
+    def __init__(self, index: int, color=(255, 255, 255), duration: float = FADE_TIME):
+        super().__init__(index)
+        self.color = tuple(color)
+        self.duration = float(duration)
+
+    def draw(self, t, layer):
+        if t >= self.duration:
+            return False
+        layer.paint(self.index, self.color, 1.0 - t / self.duration)
+        return True
+
+
+class Ripple(Effect):
+    """A ring of `color` moving out from the pressed LED, `speed` LEDs per second, fading out."""
+
+    __slots__ = ("color", "speed", "width", "duration")
+
+    def __init__(self, index: int, color=(255, 255, 255), speed: float = RIPPLE_SPEED,
+                 width: float = RIPPLE_WIDTH, duration: float = RIPPLE_TIME):
+        super().__init__(index)
+        self.color = tuple(color)
+        self.speed = float(speed)
+        self.width = float(width)
+        self.duration = float(duration)
+
+    def draw(self, t, layer):
+        if t >= self.duration or not 0 <= self.index < layer.num_leds:
+            return False
+        d = np.abs(layer.positions - layer.positions[self.index])
+        w = 1.0 - np.abs(d - t * self.speed) / self.width
+        np.clip(w, 0.0, 1.0, out=w)
+        w *= 1.0 - t / self.duration
+        hit = np.flatnonzero(w)
+        if len(hit):
+            layer.paint(hit, self.color, w[hit])
+        return True
+
+
+class Release(Effect):
+    """Not drawn: removes the live effects on `index` (None = all of them) when it arrives."""
+
+    __slots__ = ()
+
+    def __init__(self, index: int | None = None):
+        self.index = index
+        self.start = 0.0
+        self.shown = False
+
+
+class InputLayer(Layer):
+    """
+    Evaluates posted effects every frame. post() may be called from any
+    thread; everything else runs on the render thread.
+    """
+
+    animated = True
+
+    def __init__(self, name: str, max_effects: int = MAX_EFFECTS, **kwargs):
+        super().__init__(name, **kwargs)
+        self.max_effects = int(max_effects)
+        self.positions = None
+        self.dropped = 0
+        self.latency = DurationWindow()               # post() -> first frame that shows it
+        self._inbox = deque(maxlen=self.max_effects)  # deque append / popleft are thread-safe
+        self._live = {}                               # key -> effect, in press order
+        self._settled = False
+
+    def attach(self, num_leds: int):
+        super().attach(num_leds)
+        # ripple distance: LED index along the strip
+        self.positions = np.arange(self.num_leds, dtype=np.float32)
+
+    @property
+    def busy(self) -> bool:
+        """Something still to draw: queued posts or effects that change with time."""
+        return bool(self._inbox) or (bool(self._live) and not self._settled)
+
+    def post(self, effect: Effect, now: float | None = None):
+        effect.start = time.monotonic() if now is None else now
+        self._inbox.append(effect)
+
+    def paint(self, index, color, weight):
+        """Composite `color` over what earlier effects painted this frame ("over" operator)."""
+        a0 = self.alpha[index]
+        a = weight + a0 * (1.0 - weight)
+        w = np.where(a > 0, weight / np.maximum(a, 1e-6), 0.0).astype(np.float32)
+        self.rgb[index] += (np.asarray(color, dtype=np.float32) - self.rgb[index]) * w[..., None]
+        self.alpha[index] = a
+
+    def _drain(self) -> bool:
+        changed = False
+        while self._inbox:
+            e = self._inbox.popleft()
+            changed = True
+            if isinstance(e, Release):
+                self._live = {k: v for k, v in self._live.items() if e.index is not None and v.index != e.index}
+                continue
+            self._live.pop(e.key, None)
+            self._live[e.key] = e
+            if len(self._live) > self.max_effects:
+                del self._live[next(iter(self._live))]
+                self.dropped += 1
+        return changed
+
+    def draw(self, now):
+        changed = self._drain()
+        live = self._live
+        if not changed and (self._settled or not live):
+            return False
+        self.alpha[:] = 0.0
+        done = []
+        wall = time.monotonic()
+        for k, e in live.items():
+            if not e.shown:
+                e.shown = True
+                self.latency.add(wall - e.start)
+            # ticks carry their scheduled time, which can be a hair before the press
+            if not e.draw(max(now - e.start, 0.0), self):
+                done.append(k)
+        for k in done:
+            del live[k]
+        self._settled = all(e.static(now - e.start) for e in live.values())
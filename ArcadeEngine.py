@@ -0,0 +1,460 @@
+"""
+Arcade Commander - ArcadeEngine
+
+Render thread for the lighting effects, independent of the Tk mainloop.
+
+The GUI never touches the engine's working state: it publishes an immutable
+UiSnapshot (LED settings + which effects are on) whenever something changes,
+and the render thread picks up the newest one at its next tick. Ticks run on
+a fixed timestep of the monotonic clock and every effect is a function of
+time, so a blocked GUI (color chooser, messagebox, file dialog) neither
+freezes nor slows the lights, and pulse speed no longer depends on Tk.
+
+Frames are composed from a layer stack (ArcadeCompositor), bottom to top:
+
+    base      profile colors + pulsing buttons
+    ambient   cycle / demo / attract, an ArcadeTimeline show, ArcadeAudio or ArcadeAmbient
+    input     button-press effects (ArcadeEffects: flash / fade / ripple)
+    system    ALL OFF and other overrides
+
+New effects are new layers (renderer.compositor.add(...)), not new flags.
+
+    state = LedState(cab.LEDS)                  # GUI side: state["P1_A"]["pulse"] = True
+    engine = RenderEngine(Renderer(cab))
+    engine.update(UiSnapshot(state.snapshot(cab.LEDS), ambient=EFFECT_ATTRACT, since=time.monotonic()))
+    engine.post(Flash(cab.LEDS["P1_A"]))        # a button press, lit on the next frame
+    ...
+    engine.close()
+"""
+
+import threading
+import time
+from typing import NamedTuple
+
+import numpy as np
+
+from ArcadeCompositor import Compositor, Layer, PixelLayer
+from ArcadeDriver import STATE_CONNECTED, wheel_array
+from ArcadeEffects import InputLayer
+from ArcadeTimeline import Timeline
+
+RENDER_FPS = 1 / 0.030      # the old root.after(30) pulse tick, now on a fixed clock
+MAX_LAG = 0.25              # further behind than this: skip ticks instead of bursting
+
+# pulse phase rate at speed 1.0: the old 0.1 rad per 30 ms tick
+PHASE_RATE = 0.1 / 0.030
+
+# ambient effects
+EFFECT_CYCLE = "cycle"      # R / G / B / W, one second each
+EFFECT_DEMO = "demo"        # random colors every DEMO_STEP
+EFFECT_ATTRACT = "attract"  # rainbow chase + breathing start buttons
+
+LAYER_BASE = "base"
+LAYER_AMBIENT = "ambient"
+LAYER_INPUT = "input"
+LAYER_SYSTEM = "system"
+
+CYCLE_COLORS = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 255)]
+CYCLE_STEP = 1.0
+DEMO_STEP = 0.150
+ATTRACT_STEP = 0.030        # rainbow offset advances 2 per step
+FIGHT_BUTTONS = ("P1_A", "P1_B", "P1_C", "P1_X", "P1_Y", "P1_Z",
+                 "P2_A", "P2_B", "P2_C", "P2_X", "P2_Y", "P2_Z")
+
+
+class LedArrays(NamedTuple):
+    """Frozen struct-of-arrays copy of LedState (one row per named LED)."""
+    names: tuple
+    index: np.ndarray       # (n,) driver LED index of each row
+    primary: np.ndarray     # (n, 3) uint8
+    secondary: np.ndarray   # (n, 3) uint8
+    speed: np.ndarray       # (n,) float32, pulse speed multiplier
+    phase: np.ndarray       # (n,) float32, pulse phase offset (radians)
+    pulse: np.ndarray       # (n,) bool
+
+
+class UiSnapshot(NamedTuple):
+    """Everything the renderer may read. Build a new one per change; never mutate."""
+    leds: LedArrays
+    ambient: object = None      # EFFECT_*, a Timeline or a live effect (see AmbientLayer); None = off
+    since: float = 0.0          # time.monotonic() when the ambient effect started
+    off: bool = False           # system overlay: everything dark
+    paused: bool = False        # a test / diagnostic owns the LEDs; render nothing
+
+
+class LedView:
+    """Dict-style access to one row of a LedState: state["P1_A"]["primary"] = (255, 0, 0)."""
+
+    __slots__ = ("_state", "_i")
+
+    def __init__(self, state, i: int):
+        self._state = state
+        self._i = i
+
+    def __getitem__(self, key):
+        if key not in LedState.FIELDS:
+            raise KeyError(key)
+        v = getattr(self._state, key)[self._i]
+        if key in ("primary", "secondary"):
+            return tuple(int(c) for c in v)
+        return bool(v) if key == "pulse" else float(v)
+
+    def __setitem__(self, key, value):
+        if key not in LedState.FIELDS:
+            raise KeyError(key)
+        getattr(self._state, key)[self._i] = value
+
+    def get(self, key, default=None):
+        return self[key] if key in LedState.FIELDS else default
+
+    def update(self, values: dict):
+        for k, v in values.items():
+            self[k] = v
+
+    def to_dict(self) -> dict:
+        return {k: self[k] for k in LedState.FIELDS}
+
+
+class LedState:
+    """
+    Lighting state as NumPy arrays, one row per named LED. The GUI edits it
+    through dict-style LedViews; snapshot() freezes a copy for the renderer.
+    """
+
+    FIELDS = ("primary", "secondary", "pulse", "speed", "phase")
+
+    def __init__(self, names):
+        self.names = tuple(names)
+        self._slot = {n: i for i, n in enumerate(self.names)}
+        n = len(self.names)
+        self.primary = np.zeros((n, 3), dtype=np.uint8)
+        self.secondary = np.zeros((n, 3), dtype=np.uint8)
+        self.speed = np.ones(n, dtype=np.float32)
+        self.phase = np.zeros(n, dtype=np.float32)
+        self.pulse = np.zeros(n, dtype=bool)
+
+    def __getitem__(self, name) -> LedView:
+        return LedView(self, self._slot[name])
+
+    def __contains__(self, name) -> bool:
+        return name in self._slot
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def keys(self):
+        return self.names
+
+    def items(self):
+        return ((n, LedView(self, i)) for i, n in enumerate(self.names))
+
+    def to_dict(self) -> dict:
+        """Plain dict for profile JSON."""
+        return {n: v.to_dict() for n, v in self.items()}
+
+    def snapshot(self, leds_map: dict) -> LedArrays:
+        """Read-only copy; leds_map (cab.LEDS) resolves names to LED indices at this moment."""
+        arrays = [np.array([leds_map[n] for n in self.names], dtype=np.intp),
+                  self.primary.copy(), self.secondary.copy(), self.speed.copy(),
+                  self.phase.copy(), self.pulse.copy()]
+        for a in arrays:
+            a.flags.writeable = False
+        return LedArrays(self.names, *arrays)
+
+
+class BaseLayer(Layer):
+    """Profile colors; pulsing rows blend primary <-> secondary on a sine of their phase."""
+
+    def __init__(self):
+        super().__init__(LAYER_BASE)
+        self.leds = None
+        # pulse phase references per row: phase stays continuous across speed changes
+        self._t_ref = None
+        self._phase_ref = None
+        self._speed_ref = None
+        self._p_idx = self._p_c1 = self._p_dc = None
+
+    @property
+    def animated(self) -> bool:
+        return self._p_idx is not None and len(self._p_idx) > 0
+
+    def set_leds(self, leds: LedArrays, now: float):
+        n = len(leds.names)
+        if self._t_ref is None or len(self._t_ref) != n:
+            self._t_ref = np.full(n, now)
+            self._phase_ref = np.zeros(n)
+            self._speed_ref = leds.speed.astype(np.float64)
+        else:
+            changed = self._speed_ref != leds.speed
+            if changed.any():
+                self._phase_ref[changed] += (now - self._t_ref[changed]) * PHASE_RATE * self._speed_ref[changed]
+                self._t_ref[changed] = now
+                self._speed_ref[changed] = leds.speed[changed]
+        p = leds.pulse
+        self._p_idx = leds.index[p]
+        self._p_c1 = leds.primary[p].astype(np.float32)
+        self._p_dc = leds.secondary[p].astype(np.float32) - self._p_c1
+        self.leds = leds
+        self.invalidate()
+
+    def pulse_phase(self, now: float):
+        """Phase of every row at `now` (radians)."""
+        return self.leds.phase + self._phase_ref + (now - self._t_ref) * PHASE_RATE * self._speed_ref
+
+    def draw(self, now):
+        leds = self.leds
+        if leds is None:
+            return
+        if self._dirty:
+            self.rgb[:] = 0.0
+            self.alpha[:] = 1.0
+            self.rgb[leds.index] = leds.primary
+        if len(self._p_idx):
+            f = (np.sin(self.pulse_phase(now)[leds.pulse]) + 1) / 2
+            self.rgb[self._p_idx] = self._p_c1 + self._p_dc * f[:, None].astype(np.float32)
+
+
+class AmbientLayer(Layer):
+    """
+    Full-strip effects driven by time since they started (cycle / demo /
+    attract / a Timeline), or a live effect object with
+    draw(layer, leds, now) -> False when unchanged (ArcadeAudio, ArcadeAmbient).
+    """
+
+    animated = True
+
+    def __init__(self):
+        super().__init__(LAYER_AMBIENT)
+        self.effect = None
+        self.since = 0.0
+        self._leds = None
+        self._index = np.zeros(0, dtype=np.intp)  # named LEDs
+        self._starts = []
+        self._fight = np.zeros(0, dtype=np.intp)    # fight-button LEDs, attract rainbow
+        self._ramp = np.zeros(0, dtype=np.intp)
+        self._step = None
+        self._rng = np.random.default_rng()
+        self.enabled = False
+
+    def set_leds(self, leds: LedArrays):
+        self._leds = leds
+        self._index = leds.index
+        slot = {n: int(i) for n, i in zip(leds.names, leds.index) if 0 <= i < self.num_leds}
+        self._starts = [slot[n] for n in ("P1_START", "P2_START") if n in slot]
+        self._fight = np.array([slot[n] for n in FIGHT_BUTTONS if n in slot], dtype=np.intp)
+        self._ramp = np.arange(len(self._fight)) * 20
+        self.invalidate()
+
+    def set_effect(self, effect, since: float):
+        self.effect = effect
+        self.since = since
+        self._step = None
+        self.enabled = effect is not None
+        self.invalidate()
+
+    def draw(self, now):
+        elapsed = now - self.since
+        if isinstance(self.effect, Timeline):
+            tl = self.effect
+            if not len(tl):
+                return False
+            step = tl.index_at(elapsed)
+            if step == self._step:
+                return False
+            self._step = step
+            frame = tl.frames[step]
+            self.rgb[:] = frame[:, :3]
+            np.multiply(frame[:, 3], 1.0 / 255.0, out=self.alpha)
+        elif hasattr(self.effect, "draw"):
+            return self.effect.draw(self, self._leds, now)
+        elif self.effect == EFFECT_CYCLE:
+            step = int(elapsed / CYCLE_STEP)
+            if step == self._step:
+                return False
+            self._step = step
+            self.rgb[:] = CYCLE_COLORS[step % len(CYCLE_COLORS)]
+            self.alpha[:] = 1.0
+        elif self.effect == EFFECT_DEMO:
+            step = int(elapsed / DEMO_STEP)
+            if step == self._step:
+                return False
+            self._step = step
+            idx = self._index
+            self.rgb[idx] = self._rng.integers(0, 256, (len(idx), 3))
+            self.alpha[:] = 0.0
+            self.alpha[idx] = 1.0
+        elif self.effect == EFFECT_ATTRACT:
+            # rainbow over the fight buttons, breathing start buttons, the rest shows through
+            off = (int(elapsed / ATTRACT_STEP) * 2) % 255
+            pulse = (np.sin(elapsed * 3) + 1) * 127.5
+            self.alpha[:] = 0.0
+            self.rgb[self._fight] = wheel_array((self._ramp + off) % 255)
+            self.alpha[self._fight] = 1.0
+            for i, s in zip(self._starts, ((pulse, 0, 0), (0, 0, pulse))):
+                self.rgb[i] = s
+                self.alpha[i] = 1.0
+        else:
+            return False
+
+
+class Renderer:
+    """
+    Applies UiSnapshots to the layer stack and writes the composite straight
+    into the driver's back buffer, one committed frame per change. Every
+    layer is a handful of array operations over all LEDs, so the per-frame
+    cost barely grows with the LED count.
+    """
+
+    def __init__(self, cab):
+        self.cab = cab
+        self.compositor = Compositor(cab.num_leds)
+        self.base = self.compositor.add(BaseLayer())
+        self.ambient = self.compositor.add(AmbientLayer())
+        self.input = self.compositor.add(InputLayer(LAYER_INPUT))
+        self.system = self.compositor.add(PixelLayer(LAYER_SYSTEM))
+        self._snap = None
+        self._paused = False
+        self._resend = False
+        self._frame = np.zeros((cab.num_leds, 3), dtype=np.uint8)
+        self._last = np.zeros_like(self._frame)
+
+    def __call__(self, now: float, snap: UiSnapshot | None) -> bool:
+        """Render one tick. Returns False when nothing will change until the next update / post."""
+        if snap is None:
+            return False
+        if snap is not self._snap:
+            self._apply(snap, now)
+        if snap.paused:
+            self._paused = True
+            return False
+        if self.compositor.evaluate(now) or self._paused or self._resend:
+            self._commit()
+        return self.animating
+
+    @property
+    def animating(self) -> bool:
+        """True while some layer changes with time alone (pulses, an ambient effect, running presses)."""
+        return self.base.animated or self.ambient.enabled or self.input.busy
+
+    def _commit(self):
+        frame = self._frame
+        frame[:] = self.compositor.out
+        # a changed layer can be hidden by the ones above it; after a pause the
+        # LEDs hold whatever the test wrote, so always resend then (and after a reconnect)
+        if self._paused or self._resend or not np.array_equal(frame, self._last):
+            self._paused = self._resend = False
+            self._last[:] = frame
+            with self.cab.batch():
+                self.cab.back_buffer[:] = frame
+
+    def post(self, effect):
+        """Queue an input effect (any thread); it lights on the next frame."""
+        self.input.post(effect)
+
+    def keepalive(self):
+        """Idle engine: let a sync-mode driver resend its frame before the controller times out."""
+        if not self._paused:  # paused: an external test owns (and shows) the frame
+            self.cab.show()
+
+    def invalidate(self):
+        """Commit the next frame even if it matches the last one (any thread)."""
+        self._resend = True
+
+    def _apply(self, snap: UiSnapshot, now: float):
+        prev, self._snap = self._snap, snap
+        if prev is None or snap.leds is not prev.leds:
+            self.base.set_leds(snap.leds, now)
+            self.ambient.set_leds(snap.leds)
+        if prev is None or (snap.ambient, snap.since) != (prev.ambient, prev.since):
+            self.ambient.set_effect(snap.ambient, snap.since)
+        if prev is None or snap.off != prev.off:
+            if snap.off:
+                self.system.fill((0, 0, 0))
+            else:
+                self.system.clear()
+
+
+class RenderEngine:
+    """
+    Fixed-timestep render thread. render(now, snapshot) is called at
+    t0 + k / fps (monotonic); ticks missed by more than MAX_LAG are skipped,
+    not replayed, since only the newest state matters. When render returns
+    False (nothing animating) the thread sleeps until the next update() or
+    post(), waking only every keepalive / 2 seconds so a sync-mode driver
+    can resend its frame before the controller times out.
+    """
+
+    def __init__(self, render, fps: float = RENDER_FPS):
+        self.render = render
+        self.dt = 1.0 / fps
+        self.ticks = 0
+        self.skipped = 0
+        self.idle_waits = 0
+        self._snapshot = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        # (re)connected: frames rendered while the port was closed never reached the LEDs
+        self._cab = getattr(render, "cab", None)
+        if hasattr(self._cab, "add_state_listener"):
+            self._cab.add_state_listener(self._on_cab_state)
+        self._thread = threading.Thread(target=self._loop, name="ArcadeRender", daemon=True)
+        self._thread.start()
+
+    def update(self, snapshot: UiSnapshot):
+        """Publish new UI state (one reference swap; safe from any thread)."""
+        self._snapshot = snapshot
+        self._wake.set()
+
+    def post(self, effect):
+        """Queue an ArcadeEffects effect on the renderer's input layer (safe from any thread)."""
+        self.render.post(effect)
+        self._wake.set()
+
+    def _on_cab_state(self, cab, state):
+        if state == STATE_CONNECTED and hasattr(self.render, "invalidate"):
+            self.render.invalidate()
+            self._wake.set()
+
+    def _loop(self):
+        next_t = time.monotonic()
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now < next_t:
+                self._stop.wait(next_t - now)
+                continue
+            lag = now - next_t
+            if lag > MAX_LAG:
+                missed = int(lag / self.dt)
+                self.skipped += missed
+                next_t += missed * self.dt
+            self._wake.clear()
+            busy = True
+            try:
+                busy = self.render(next_t, self._snapshot) is not False
+            except Exception as e:
+                print(f"Render Error: {e}")
+            self.ticks += 1
+            next_t += self.dt
+            if not busy:
+                # nothing animates: sleep until update() / post() instead of ticking, waking
+                # only for the driver keepalive (sync-mode drivers resend from show() alone)
+                self.idle_waits += 1
+                period = getattr(self._cab, "keepalive", None)
+                keepalive = getattr(self.render, "keepalive", None)
+                while not self._wake.wait(period / 2 if period and keepalive else None):
+                    try:
+                        keepalive()
+                    except Exception as e:
+                        print(f"Keepalive Error: {e}")
+                next_t = max(next_t, time.monotonic())
+
+    def close(self):
+        if hasattr(self._cab, "remove_state_listener"):
+            self._cab.remove_state_listener(self._on_cab_state)
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
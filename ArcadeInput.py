@@ -0,0 +1,237 @@
+"""
+Arcade Commander - ArcadeInput
+
+Joystick input on its own thread. The thread blocks in pygame.event.wait()
+(SDL wakes it when an event arrives) instead of polling from Tk, stamps each
+event with time.perf_counter_ns(), resolves INPUT_MAP through a table
+compiled once ((joy, button) -> name, LED index) and hands the result on:
+
+- on_event(ev) runs right on the input thread: keep it short, e.g.
+  engine.post(Flash(ev.led)) so a press lights on the next render frame;
+- the GUI drains `events` (a bounded deque, no locks) with poll().
+
+    inp = InputThread(INPUT_MAP, cab.LEDS, on_event=lambda ev: ev.kind == KIND_DOWN and ev.led >= 0
+                      and engine.post(Flash(ev.led)))
+    for ev in inp.poll(): ...          # Tk side
+    inp.stats()                        # event counts + dispatch latency
+    inp.close()
+
+    python ArcadeInput.py [--port COM3]  # print events (and flash LEDs) with latencies
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+try:
+    import pygame
+    PYGAME_AVAILABLE = True
+except ImportError:
+    PYGAME_AVAILABLE = False
+
+from ArcadeDriver import DurationWindow
+
+WAIT_MS = 250               # longest block in event.wait(): how quickly close() is noticed
+QUEUE_SIZE = 256            # GUI queue; the oldest events are dropped when Tk falls behind
+AXIS_THRESHOLD = 0.5        # analog sticks are reported as -1 / 0 / 1 when crossing this
+
+KIND_DOWN = "down"
+KIND_UP = "up"
+KIND_HAT = "hat"
+KIND_AXIS = "axis"
+KIND_ADDED = "added"
+KIND_REMOVED = "removed"
+
+
+class InputEvent(NamedTuple):
+    t_ns: int               # perf_counter_ns() when the event left SDL
+    kind: str               # KIND_*
+    joy: int                # joystick (after the P1/P2 swap)
+    code: int = -1          # button / hat / axis number
+    value: object = None    # 1 / 0 for buttons, (x, y) for hats, -1 / 0 / 1 for axes
+    name: str | None = None # INPUT_MAP name ("P1_A"), None when unmapped
+    led: int = -1           # driver LED index, -1 when the name has no LED
+
+
+def compile_input_map(input_map: dict, leds_map: dict) -> dict:
+    """{"0_1": "P1_A"} -> {(0, 1): ("P1_A", cab.LEDS["P1_A"] or -1)}."""
+    table = {}
+    for key, name in input_map.items():
+        joy, button = (int(p) for p in key.split("_"))
+        table[(joy, button)] = (name, int(leds_map.get(name, -1)))
+    return table
+
+
+class InputThread:
+    """Owns the joysticks and the pygame event queue while it runs (initializes SDL display + joystick itself)."""
+
+    def __init__(self, input_map: dict, leds_map: dict, on_event=None, queue_size: int = QUEUE_SIZE):
+        self.on_event = on_event
+        self.events = deque(maxlen=queue_size)
+        self.latency = DurationWindow()     # SDL -> on_event done
+        self.received = 0
+        self.polled = 0
+        self._table = compile_input_map(input_map, leds_map)
+        self._swap = False
+        self._axes = {}
+        self._joysticks = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="ArcadeInput", daemon=True)
+        self._thread.start()
+
+    def set_map(self, input_map: dict, leds_map: dict):
+        """Recompile after the button or LED mapping changed (one reference swap)."""
+        self._table = compile_input_map(input_map, leds_map)
+
+    def set_swap(self, swap: bool):
+        """Exchange joysticks 0 and 1 (P1 / P2 wired the other way round)."""
+        self._swap = bool(swap)
+
+    def poll(self) -> list:
+        """Everything queued since the last call, oldest first."""
+        out = []
+        while self.events:
+            out.append(self.events.popleft())
+        self.polled += len(out)
+        return out
+
+    def stats(self) -> dict:
+        return {"received": self.received, "queued": len(self.events),
+                "dropped": max(0, self.received - self.polled - len(self.events)),
+                "joysticks": len(self._joysticks), "dispatch_us": self.latency.summary()}
+
+    def close(self):
+        self._stop.set()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+    # ---------------- Thread ----------------
+    def _loop(self):
+        # SDL's event queue belongs to the thread that initialized the video
+        # subsystem, so display + joystick are brought up (and down) here.
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        try:
+            pygame.display.init()
+            pygame.joystick.init()
+        except pygame.error as e:
+            print(f"Input thread: {e}")
+            return
+        try:
+            self._run()
+        finally:
+            self._joysticks.clear()
+            pygame.joystick.quit()
+            pygame.display.quit()
+
+    def _run(self):
+        pygame.event.set_blocked(None)  # wake up for joystick events only
+        pygame.event.set_allowed([pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYHATMOTION,
+                                  pygame.JOYAXISMOTION, pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED])
+        for i in range(pygame.joystick.get_count()):
+            self._open(i)
+        while not self._stop.is_set():
+            try:
+                raw = pygame.event.wait(WAIT_MS)
+            except pygame.error:
+                break  # pygame.quit() underneath us
+            t_ns = time.perf_counter_ns()
+            if raw.type == pygame.NOEVENT:
+                continue
+            ev = self._convert(raw, t_ns)
+            if ev is None:
+                continue
+            self.received += 1
+            self.events.append(ev)
+            if self.on_event:
+                try:
+                    self.on_event(ev)
+                except Exception as e:
+                    print(f"Input handler error: {e}")
+            self.latency.add((time.perf_counter_ns() - t_ns) / 1e9)
+
+    def _open(self, device_index: int):
+        try:
+            j = pygame.joystick.Joystick(device_index)
+            j.init()
+            self._joysticks[j.get_instance_id()] = j
+        except pygame.error as e:
+            print(f"Joystick {device_index}: {e}")
+
+    def _convert(self, raw, t_ns: int) -> InputEvent | None:
+        t = raw.type
+        if t == pygame.JOYDEVICEADDED:
+            self._open(raw.device_index)
+            return InputEvent(t_ns, KIND_ADDED, raw.device_index)
+        if t == pygame.JOYDEVICEREMOVED:
+            self._joysticks.pop(raw.instance_id, None)
+            return InputEvent(t_ns, KIND_REMOVED, raw.instance_id)
+        joy = raw.joy
+        if self._swap and joy in (0, 1):
+            joy = 1 - joy
+        if t in (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP):
+            name, led = self._table.get((joy, raw.button), (None, -1))
+            kind = KIND_DOWN if t == pygame.JOYBUTTONDOWN else KIND_UP
+            return InputEvent(t_ns, kind, joy, raw.button, int(kind == KIND_DOWN), name, led)
+        if t == pygame.JOYHATMOTION:
+            return InputEvent(t_ns, KIND_HAT, joy, raw.hat, tuple(raw.value))
+        if t == pygame.JOYAXISMOTION:
+            d = -1 if raw.value < -AXIS_THRESHOLD else 1 if raw.value > AXIS_THRESHOLD else 0
+            if self._axes.get((joy, raw.axis), 0) == d:
+                return None  # no threshold crossed: drop the analog noise here
+            self._axes[(joy, raw.axis)] = d
+            return InputEvent(t_ns, KIND_AXIS, joy, raw.axis, d)
+        return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Arcade Commander input monitor")
+    ap.add_argument("--map", default="input_map.json", help="INPUT_MAP json ({\"0_1\": \"P1_A\", ...})")
+    ap.add_argument("--port", default=None, help="also flash the pressed button's LED on this port")
+    args = ap.parse_args()
+    if not PYGAME_AVAILABLE:
+        raise SystemExit("pygame not installed (pip install pygame)")
+
+    with open(args.map) as f:
+        input_map = json.load(f)
+
+    cab = engine = None
+    leds = {}
+    if args.port:
+        from ArcadeDriver import Arcade
+        from ArcadeEffects import Flash
+        from ArcadeEngine import LedState, RenderEngine, Renderer, UiSnapshot
+        cab = Arcade(port=args.port)
+        leds = cab.LEDS
+        engine = RenderEngine(Renderer(cab))
+        engine.update(UiSnapshot(LedState(leds).snapshot(leds)))
+
+    def on_event(ev):
+        if engine and ev.kind == KIND_DOWN and ev.led >= 0:
+            engine.post(Flash(ev.led, hold=False))
+
+    inp = InputThread(input_map, leds, on_event=on_event)
+    print("Waiting for joystick events (Ctrl+C to stop)")
+    try:
+        while True:
+            for ev in inp.poll():
+                age = (time.perf_counter_ns() - ev.t_ns) / 1e6
+                print(f"{ev.kind:7} joy {ev.joy} #{ev.code} {ev.value} {ev.name or ''} (queued {age:.2f} ms)")
+            time.sleep(0.05)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(inp.stats(), indent=2))
+        if engine:
+            print("press -> frame:", json.dumps(engine.render.input.latency.summary(), indent=2))
+            engine.close()
+            cab.close()
+        inp.close()
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
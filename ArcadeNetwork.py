@@ -0,0 +1,366 @@
+"""
+Arcade Commander - ArcadeNetwork
+
+UDP LED outputs for WLED / ESP32 style controllers (marquees, cabinet strips).
+Each output is a driver frame output (cab.add_output): it gets every frame
+show() commits, whether or not the PicoCTR is connected or keeping up, and
+sends it on its own thread at its own frame rate.
+
+    DDP    ddp://host[:port]                       port 4048, 480 LEDs per packet
+    E1.31  e131://host[:port][/universe]           port 5568, 170 LEDs per universe
+           e131://[/universe]                      multicast 239.255.<uni hi>.<uni lo>
+
+Packets are built once when the output is created; per frame only the
+sequence byte and the RGB payload are copied in, then every packet of the
+frame goes out back to back. Strips longer than one packet (DDP) or one
+universe (E1.31) are split automatically. The last frame is resent every
+`keepalive` seconds so WLED does not fall back out of realtime mode.
+
+Usage:
+    from ArcadeNetwork import open_output
+    cab.add_output(open_output("ddp://192.168.1.60", num_leds=30, fps=40, total_leds=cab.num_leds))
+
+    # marquee-only cabinet (no PicoCTR): Arcade(port="null://") + the output above
+
+    python ArcadeNetwork.py receive --proto ddp            # loss / throughput counter
+    python ArcadeNetwork.py send ddp://127.0.0.1 --leds 600 --fps 60
+"""
+
+import argparse
+import socket
+import struct
+import threading
+import time
+import uuid
+
+import numpy as np
+
+from ArcadeDriver import FrameMailbox, wheel
+
+DDP_PORT = 4048
+DDP_HEADER = struct.Struct(">BBBBIH")   # flags, sequence, data type, destination, offset, length
+DDP_VERSION = 0x40
+DDP_PUSH = 0x01
+DDP_TYPE_RGB24 = 0x0B
+DDP_DEST_DISPLAY = 0x01
+DDP_MAX_DATA = 1440                     # 480 RGB LEDs, fits a 1500 byte MTU
+
+E131_PORT = 5568
+E131_HEADER_SIZE = 126
+E131_MAX_DATA = 510                     # 170 RGB LEDs (pixel-aligned, of 512 DMX slots)
+E131_PRIORITY = 100
+ACN_ID = b"ASC-E1.17\x00\x00\x00"
+
+DEFAULT_FPS = 40.0
+KEEPALIVE = 1.0                         # WLED leaves realtime mode after ~2.5 s of silence
+
+
+def e131_multicast(universe: int) -> str:
+    return f"239.255.{(universe >> 8) & 0xFF}.{universe & 0xFF}"
+
+
+class NetworkOutput:
+    """
+    Base for UDP outputs. Call it like a driver output: output(rgb).
+
+    num_leds / first: send LEDs [first, first + num_leds) of the driver frame,
+    so a marquee can take a slice of an ArcadeGroup's logical strip.
+    total_leds: the driver frame size; a slice past its end is rejected here.
+    """
+
+    default_port = 0
+
+    def __init__(self, host: str, port: int | None = None, num_leds: int = 30, first: int = 0,
+                 fps: float = DEFAULT_FPS, keepalive: float | None = KEEPALIVE,
+                 total_leds: int | None = None):
+        self.host = host
+        self.port = int(port or self.default_port)
+        self.num_leds = int(num_leds)
+        self.first = int(first)
+        if self.num_leds < 1 or self.first < 0:
+            raise ValueError(f"bad LED slice: first={self.first}, num_leds={self.num_leds}")
+        if total_leds is not None and self.first + self.num_leds > total_leds:
+            raise ValueError(f"LEDs {self.first}..{self.first + self.num_leds - 1} are past the end "
+                             f"of the {total_leds}-LED frame")
+        self.frame_interval = 1.0 / fps
+        self.keepalive = keepalive
+        self.frames_sent = 0
+        self.packets_sent = 0
+        self.bytes_sent = 0
+        self.send_errors = 0
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20)
+        self._seq = 0
+        self._frame = np.zeros(self.num_leds * 3, dtype=np.uint8)
+        self._have_frame = False
+        self._last_send = 0.0
+        self._packets = self._build_packets()   # [(packet bytearray, payload view, src a, src b, address)]
+
+        self._mailbox = FrameMailbox(len(self._frame))
+        self._thread = threading.Thread(target=self._loop, name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def _build_packets(self) -> list:
+        raise NotImplementedError
+
+    def _stamp(self):
+        """Write the per-frame sequence number into every packet."""
+        raise NotImplementedError
+
+    def set_fps(self, fps: float):
+        self.frame_interval = 1.0 / fps
+
+    def __call__(self, rgb):
+        a = self.first * 3
+        self._mailbox.publish(memoryview(rgb)[a:a + len(self._frame)])
+
+    def _loop(self):
+        mb = self._mailbox
+        while not mb.closed:
+            idle = 0.5 if self.keepalive is None else min(0.5, self.keepalive)
+            if not mb.wait(idle):
+                if (self._have_frame and self.keepalive is not None
+                        and time.monotonic() - self._last_send >= self.keepalive):
+                    self._send()
+                continue
+            delay = self._last_send + self.frame_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            rgb = mb.take()
+            if rgb is None:
+                continue
+            self._frame[:] = rgb
+            self._have_frame = True
+            self._send()
+
+    def _send(self):
+        self._seq += 1
+        self._stamp()
+        frame = self._frame
+        for pkt, payload, a, b, address in self._packets:
+            payload[:] = frame[a:b]
+            try:
+                self._sock.sendto(pkt, address)
+                self.packets_sent += 1
+                self.bytes_sent += len(pkt)
+            except OSError as e:
+                self.send_errors += 1
+                if self.send_errors in (1, 100, 10000):
+                    print(f"{type(self).__name__} {self.host}: {e}")
+        self._last_send = time.monotonic()
+        self.frames_sent += 1
+
+    def close(self):
+        self._mailbox.close()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._sock.close()
+
+
+class DdpOutput(NetworkOutput):
+    """Distributed Display Protocol (WLED, xLights, ESPixelStick)."""
+
+    default_port = DDP_PORT
+
+    def _build_packets(self) -> list:
+        packets = []
+        size = len(self._frame)
+        for a in range(0, size, DDP_MAX_DATA):
+            b = min(a + DDP_MAX_DATA, size)
+            pkt = bytearray(DDP_HEADER.size + b - a)
+            flags = DDP_VERSION | (DDP_PUSH if b == size else 0)  # push: display after the last packet
+            DDP_HEADER.pack_into(pkt, 0, flags, 0, DDP_TYPE_RGB24, DDP_DEST_DISPLAY, a, b - a)
+            packets.append((pkt, memoryview(pkt)[DDP_HEADER.size:], a, b, (self.host, self.port)))
+        return packets
+
+    def _stamp(self):
+        seq = self._seq % 15 + 1  # 1..15; 0 means "no sequence"
+        for pkt, *_ in self._packets:
+            pkt[1] = seq
+
+
+class E131Output(NetworkOutput):
+    """E1.31 / streaming ACN. universe=N is the first universe; long strips continue in N+1, N+2..."""
+
+    default_port = E131_PORT
+
+    def __init__(self, host: str | None, port: int | None = None, num_leds: int = 30, first: int = 0,
+                 fps: float = DEFAULT_FPS, keepalive: float | None = KEEPALIVE, universe: int = 1,
+                 source_name: str = "Arcade Commander", priority: int = E131_PRIORITY,
+                 total_leds: int | None = None):
+        self.universe = int(universe)
+        self.source_name = source_name
+        self.priority = int(priority)
+        self._cid = uuid.uuid4().bytes
+        super().__init__(host or "", port, num_leds, first, fps, keepalive, total_leds)
+        if not host:
+            self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 1)
+
+    def _build_packets(self) -> list:
+        packets = []
+        size = len(self._frame)
+        name = self.source_name.encode("utf-8")[:63].ljust(64, b"\x00")
+        for n, a in enumerate(range(0, size, E131_MAX_DATA)):
+            b = min(a + E131_MAX_DATA, size)
+            universe = self.universe + n
+            slots = b - a
+            pkt = bytearray(E131_HEADER_SIZE + slots)
+            length = len(pkt)
+            # root layer
+            struct.pack_into(">HH12sHI16s", pkt, 0, 0x0010, 0, ACN_ID,
+                             0x7000 | (length - 16), 0x00000004, self._cid)
+            # framing layer (sequence at 111 is stamped per frame)
+            struct.pack_into(">HI64sBHBBH", pkt, 38, 0x7000 | (length - 38), 0x00000002, name,
+                             self.priority, 0, 0, 0, universe)
+            # DMP layer: start code 0 + RGB slots
+            struct.pack_into(">HBBHHHB", pkt, 115, 0x7000 | (length - 115), 0x02, 0xA1,
+                             0, 1, slots + 1, 0)
+            address = (self.host or e131_multicast(universe), self.port)
+            packets.append((pkt, memoryview(pkt)[E131_HEADER_SIZE:], a, b, address))
+        return packets
+
+    def _stamp(self):
+        seq = self._seq & 0xFF
+        for pkt, *_ in self._packets:
+            pkt[111] = seq
+
+
+def open_output(url: str, num_leds: int = 30, first: int = 0, fps: float = DEFAULT_FPS,
+                keepalive: float | None = KEEPALIVE, total_leds: int | None = None) -> NetworkOutput:
+    """ddp://host[:port] or e131://[host][:port][/universe] (see module docstring)."""
+    scheme, sep, rest = str(url).partition("://")
+    if not sep:
+        raise ValueError(f"expected ddp:// or e131:// URL, got {url!r}")
+    hostport, _, path = rest.partition("/")
+    host, _, port = hostport.partition(":")
+    port = int(port) if port else None
+    scheme = scheme.lower()
+    if scheme == "ddp":
+        if not host:
+            raise ValueError("ddp:// needs a host")
+        return DdpOutput(host, port, num_leds, first, fps, keepalive, total_leds)
+    if scheme in ("e131", "sacn"):
+        universe = int(path) if path.strip("/") else 1
+        return E131Output(host or None, port, num_leds, first, fps, keepalive, universe=universe,
+                          total_leds=total_leds)
+    raise ValueError(f"unknown network output {scheme!r}")
+
+
+# ---------------- Test Receiver ----------------
+class UdpReceiver:
+    """
+    Stand-in LED controller: counts packets, bytes, frames and sequence gaps.
+
+    protocol "ddp" counts a frame per push packet; "e131" counts frames on
+    the first universe seen and tracks loss per universe.
+    """
+
+    def __init__(self, protocol: str = "ddp", host: str = "0.0.0.0", port: int | None = None,
+                 universes=()):
+        self.protocol = protocol
+        self.port = int(port or (DDP_PORT if protocol == "ddp" else E131_PORT))
+        self.packets = 0
+        self.bytes = 0
+        self.frames = 0
+        self.lost = 0
+        self._expect = {}   # stream -> next sequence number
+        self._first_universe = None
+        self._buf = bytearray(65536)
+        self._running = True
+
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+        self._sock.bind((host, self.port))
+        self._sock.settimeout(0.2)
+        for u in universes:
+            mreq = socket.inet_aton(e131_multicast(int(u))) + socket.inet_aton("0.0.0.0")
+            self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, mreq)
+        self.t0 = time.perf_counter()
+        self._thread = threading.Thread(target=self._loop, name="UdpReceiver", daemon=True)
+        self._thread.start()
+
+    def _gap(self, stream, seq: int, modulo: int, first: int = 0):
+        expect = self._expect.get(stream)
+        if expect is not None and seq != expect:
+            self.lost += (seq - expect) % modulo
+        self._expect[stream] = (seq - first + 1) % modulo + first
+
+    def _loop(self):
+        buf = self._buf
+        while self._running:
+            try:
+                n = self._sock.recv_into(buf)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.packets += 1
+            self.bytes += n
+            if self.protocol == "ddp":
+                if n < DDP_HEADER.size:
+                    continue
+                flags, seq = buf[0], buf[1] & 0x0F
+                if flags & DDP_PUSH:
+                    self.frames += 1
+                    if seq:
+                        self._gap("ddp", seq, 15, first=1)  # one sequence number per frame
+            elif n >= E131_HEADER_SIZE:
+                universe = (buf[113] << 8) | buf[114]
+                self._gap(universe, buf[111], 256)
+                if self._first_universe is None:
+                    self._first_universe = universe
+                if universe == self._first_universe:
+                    self.frames += 1
+
+    def stats(self) -> dict:
+        elapsed = max(time.perf_counter() - self.t0, 1e-9)
+        return {"packets": self.packets, "bytes": self.bytes, "frames": self.frames, "lost": self.lost,
+                "fps": round(self.frames / elapsed, 1), "mbit_s": round(self.bytes * 8 / elapsed / 1e6, 3)}
+
+    def close(self):
+        self._running = False
+        self._thread.join(timeout=1.0)
+        self._sock.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Arcade Commander network output tools")
+    sub = ap.add_subparsers(dest="command", required=True)
+    rx = sub.add_parser("receive", help="count packets / frames / loss")
+    rx.add_argument("--proto", choices=["ddp", "e131"], default="ddp")
+    rx.add_argument("--port", type=int, default=None)
+    rx.add_argument("--universe", type=int, action="append", default=[], help="join E1.31 multicast")
+    tx = sub.add_parser("send", help="stream a rainbow test pattern")
+    tx.add_argument("url")
+    tx.add_argument("--leds", type=int, default=30)
+    tx.add_argument("--fps", type=float, default=DEFAULT_FPS)
+    tx.add_argument("--seconds", type=float, default=10.0)
+    args = ap.parse_args()
+
+    try:
+        if args.command == "receive":
+            rec = UdpReceiver(args.proto, port=args.port, universes=args.universe)
+            print(f"Listening for {args.proto} on UDP {rec.port} (Ctrl+C to stop)")
+            while True:
+                time.sleep(1.0)
+                print(rec.stats())
+        else:
+            out = open_output(args.url, num_leds=args.leds, fps=args.fps)
+            base = np.array([wheel(i * 256 // args.leds) for i in range(args.leds)], dtype=np.uint8)
+            end = time.monotonic() + args.seconds
+            step = 0
+            while time.monotonic() < end:
+                out(np.roll(base, step, axis=0).ravel())
+                step += 1
+                time.sleep(out.frame_interval)
+            out.close()
+            print(f"sent {out.frames_sent} frames, {out.packets_sent} packets, "
+                  f"{out.bytes_sent} bytes, {out.send_errors} errors")
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+Arcade Commander - ArcadePlugins
+
+Lighting effects as drop-in Python files. Every *.py in the plugin
+directory (default ./effects) that defines
+
+    def render(t, frame, state):
+        frame[:] = (255, 0, 0)          # (num_leds, 3) float RGB, 0..255
+
+is an effect. `t` is seconds since the effect started, `frame` is written
+in place (return False to keep the previous frame), and `state` carries
+the profile (state.leds: LedArrays), the strip size and a per-plugin dict
+(state.data) that survives reloads. An optional NAME sets the menu label.
+
+Plugins are picked up on scan(), reloaded when their file changes (a file
+that fails to import keeps the last good version running) and timed on
+every call. A plugin that keeps overrunning its budget is throttled
+(rendered every 2nd, 4th, 8th frame) and finally disabled, as is one that
+keeps raising; saving the file again gives it a fresh start.
+
+    plugins = PluginManager("effects")
+    engine.update(UiSnapshot(leds, ambient=PluginEffect(plugins.get("plasma")), since=time.monotonic()))
+"""
+
+import importlib.util
+import os
+import time
+from collections import deque
+
+import numpy as np
+
+from ArcadeDriver import DurationWindow
+
+PLUGIN_DIR = "effects"
+BUDGET = 0.004              # seconds per render() call (the frame is 30 ms; input and output need the rest)
+OVERRUN_WINDOW = 30         # calls looked at ...
+OVERRUN_LIMIT = 5           # ... and how many of them may overrun before the next throttle step
+MAX_SKIP = 8                # render every 8th frame at most; overrunning beyond that disables the plugin
+ERROR_LIMIT = 3             # exceptions in a row before the plugin is disabled
+RELOAD_CHECK = 1.0          # seconds between file mtime checks
+
+
+class PluginState:
+    """The `state` argument of render()."""
+
+    __slots__ = ("leds", "num_leds", "data")
+
+    def __init__(self, num_leds: int = 0):
+        self.leds = None
+        self.num_leds = num_leds
+        self.data = {}
+
+
+class Plugin:
+    """One effect file: its module, timing and throttle state."""
+
+    def __init__(self, path: str, budget: float = BUDGET):
+        self.path = path
+        self.name = os.path.splitext(os.path.basename(path))[0]
+        self.label = self.name
+        self.budget = budget
+        self.module = None
+        self.render = None
+        self.mtime = None
+        self.error = None
+        self.disabled = None        # reason, once disabled
+        self.timing = DurationWindow()
+        self.state = PluginState()
+        self._checked = 0.0
+        self.load()
+
+    def load(self) -> bool:
+        """(Re)import the file. On failure the previous version keeps running."""
+        try:
+            self.mtime = os.stat(self.path).st_mtime
+            spec = importlib.util.spec_from_file_location(f"arcade_effect_{self.name}", self.path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            if not callable(getattr(module, "render", None)):
+                raise AttributeError("no render(t, frame, state)")
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            print(f"Plugin {self.name}: {self.error}")
+            return False
+        self.module = module
+        self.render = module.render
+        self.label = str(getattr(module, "NAME", self.name))
+        self.error = None
+        self.disabled = None
+        self.skip = 1
+        self._frame = 0
+        self._errors = 0
+        self._recent = deque(maxlen=OVERRUN_WINDOW)
+        return True
+
+    def maybe_reload(self, now: float):
+        if now - self._checked < RELOAD_CHECK:
+            return
+        self._checked = now
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return
+        if mtime != self.mtime and self.load():
+            print(f"Plugin {self.name} reloaded")
+
+    def disable(self, reason: str):
+        self.disabled = reason
+        print(f"Plugin {self.name} disabled: {reason}")
+
+    def call(self, t: float, frame, state) -> bool:
+        """Run render() under the budget rules. True if `frame` was (re)drawn."""
+        if self.render is None or self.disabled:
+            return False
+        self._frame += 1
+        if self._frame % self.skip:
+            return False
+        t0 = time.perf_counter()
+        try:
+            result = self.render(t, frame, state)
+        except Exception as e:
+            self._errors += 1
+            print(f"Plugin {self.name}: {type(e).__name__}: {e}")
+            if self._errors >= ERROR_LIMIT:
+                self.disable(f"raised {self._errors} times in a row")
+            return False
+        dt = time.perf_counter() - t0
+        self._errors = 0
+        self.timing.add(dt)
+        self._recent.append(dt > self.budget)
+        if sum(self._recent) >= OVERRUN_LIMIT:
+            self._recent.clear()
+            if self.skip >= MAX_SKIP:
+                self.disable(f"over budget ({dt * 1000:.1f} ms > {self.budget * 1000:.1f} ms) at 1/{self.skip} rate")
+            else:
+                self.skip *= 2
+                print(f"Plugin {self.name} throttled to every {self.skip} frames ({dt * 1000:.1f} ms per call)")
+        return result is not False
+
+    def stats(self) -> dict:
+        return {"label": self.label, "error": self.error, "disabled": self.disabled,
+                "skip": self.skip if self.render else None, "render_us": self.timing.summary()}
+
+
+class PluginManager:
+    """Discovers the effect files in `directory` (none if it does not exist)."""
+
+    def __init__(self, directory: str = PLUGIN_DIR, budget: float = BUDGET):
+        self.directory = directory
+        self.budget = budget
+        self.plugins = {}
+        self.scan()
+
+    def scan(self) -> dict:
+        """Pick up new files and forget deleted ones; returns {name: Plugin}."""
+        try:
+            files = sorted(f for f in os.listdir(self.directory) if f.endswith(".py") and not f.startswith("_"))
+        except OSError:
+            files = []
+        found = {}
+        for f in files:
+            name = os.path.splitext(f)[0]
+            found[name] = self.plugins.get(name) or Plugin(os.path.join(self.directory, f), self.budget)
+        self.plugins = found
+        return found
+
+    def get(self, name: str) -> Plugin | None:
+        return self.plugins.get(name)
+
+    def stats(self) -> dict:
+        return {name: p.stats() for name, p in self.plugins.items()}
+
+
+class PluginEffect:
+    """Ambient effect running one Plugin on the render thread."""
+
+    label = "FX"        # status bar mode
+    live = False        # the idle timeout may still hand over to attract mode
+
+    def __init__(self, plugin: Plugin):
+        self.plugin = plugin
+
+    def draw(self, layer, leds, now: float):
+        p = self.plugin
+        p.maybe_reload(now)
+        if p.disabled:
+            if layer.alpha.any():
+                layer.alpha[:] = 0.0  # let the profile show through again
+                return None
+            return False
+        st = p.state
+        st.leds = leds
+        st.num_leds = layer.num_leds
+        if not p.call(now - layer.since, layer.rgb, st):
+            return False
+        np.clip(layer.rgb, 0.0, 255.0, out=layer.rgb)
+        layer.alpha[:] = 1.0
@@ -0,0 +1,187 @@
+"""
+Arcade Commander - ArcadeRecorder
+
+Append-only binary log of the frames the driver actually wrote, plus a
+timing-accurate replayer.
+
+File layout (little endian):
+    header  16 bytes   magic b"ACRF", version u16, num_leds u16, created (unix ns) u64
+    record  8 + 3*num_leds bytes, repeated
+            monotonic timestamp (ns) i64, then the RGB block (90 bytes for 30 LEDs)
+
+Records are fixed size, so the log is memory-mapped and indexed by frame
+number; playback never loads the file into RAM.
+
+Usage:
+    cab.start_recording("show.acr")      # every written frame is appended
+    ...
+    cab.stop_recording()
+
+    python ArcadeRecorder.py info show.acr
+    python ArcadeRecorder.py play show.acr --port COM3 --speed 2
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+MAGIC = b"ACRF"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+TIMESTAMP = struct.Struct("<q")
+
+
+def _record_dtype(num_leds: int):
+    return np.dtype([("t", "<i8"), ("rgb", "u1", (num_leds * 3,))])
+
+
+class FrameRecorder:
+    """Appends (timestamp, RGB) records. Call it like a driver sink: recorder(rgb)."""
+
+    def __init__(self, path: str, num_leds: int):
+        self.path = path
+        self.num_leds = int(num_leds)
+        self.frames = 0
+        self._record = bytearray(TIMESTAMP.size + self.num_leds * 3)
+        self._lock = threading.Lock()
+
+        if os.path.exists(path) and os.path.getsize(path) >= HEADER.size:
+            with open(path, "rb") as f:
+                magic, _version, leds, _created = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC or leds != self.num_leds:
+                raise ValueError(f"{path}: not a {self.num_leds}-LED frame log")
+            self._f = open(path, "ab", buffering=0)
+        else:
+            self._f = open(path, "wb", buffering=0)
+            self._f.write(HEADER.pack(MAGIC, VERSION, self.num_leds, time.time_ns()))
+
+    def append(self, rgb, t_ns: int | None = None):
+        t = time.monotonic_ns() if t_ns is None else t_ns
+        with self._lock:  # sinks may run on several threads at once (groups, async output)
+            if self._f is not None:
+                rec = self._record
+                TIMESTAMP.pack_into(rec, 0, t)
+                rec[TIMESTAMP.size:] = memoryview(rgb)
+                self._f.write(rec)
+                self.frames += 1
+
+    __call__ = append
+
+    def close(self):
+        with self._lock:
+            if self._f is not None:
+                self._f.close()
+                self._f = None
+
+
+class FrameLog:
+    """Read-only, memory-mapped view of a recording."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f = open(path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, self.num_leds, self.created_ns = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path}: not an Arcade frame log")
+        dtype = _record_dtype(self.num_leds)
+        count = (len(self._mm) - HEADER.size) // dtype.itemsize  # ignore a torn last record
+        self.records = np.frombuffer(self._mm, dtype=dtype, count=count, offset=HEADER.size)
+
+    def __len__(self):
+        return len(self.records)
+
+    def frame(self, i: int):
+        """RGB block of frame i (a view into the mapped file)."""
+        return self.records["rgb"][i]
+
+    def timestamp(self, i: int) -> int:
+        return int(self.records["t"][i])
+
+    def duration(self) -> float:
+        if len(self) < 2:
+            return 0.0
+        return (self.timestamp(len(self) - 1) - self.timestamp(0)) / 1e9
+
+    def close(self):
+        self.records = None
+        try:
+            self._mm.close()
+        except (BufferError, ValueError):
+            pass  # a caller still holds a frame view; the map closes with it
+        self._f.close()
+
+
+def replay(log: FrameLog, target, speed: float = 1.0, start: int = 0, end: int | None = None,
+           loop: bool = False, stop: threading.Event | None = None):
+    """
+    Stream frames from `log` at their recorded timing (or `speed` times faster).
+
+    target: anything with load_rgb() + show() (Arcade, ArcadeGroup), or a
+    callable taking the RGB block. At high speeds a sync-mode driver may still
+    throttle frames that land inside its frame_interval.
+    """
+    if not speed > 0:
+        raise ValueError(f"speed must be positive, got {speed}")
+    end = len(log) if end is None else min(end, len(log))
+    if end <= start:
+        return
+    emit = target if callable(target) and not hasattr(target, "show") else None
+    times = log.records["t"]
+    while True:
+        t0 = int(times[start])
+        wall0 = time.perf_counter()
+        for i in range(start, end):
+            if stop is not None and stop.is_set():
+                return
+            due = wall0 + (int(times[i]) - t0) / 1e9 / speed
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            if emit is not None:
+                emit(log.frame(i))
+            else:
+                target.load_rgb(log.frame(i))
+                target.show()
+        if not loop:
+            return
+
+
+def _positive_float(text: str) -> float:
+    value = float(text)
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"must be positive, got {text}")
+    return value
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Arcade Commander frame log tool")
+    ap.add_argument("command", choices=["info", "play"])
+    ap.add_argument("path")
+    ap.add_argument("--port", default=None, help="output port (default: driver DEFAULT_PORT)")
+    ap.add_argument("--speed", type=_positive_float, default=1.0, help="playback speed factor (> 0)")
+    ap.add_argument("--loop", action="store_true")
+    args = ap.parse_args()
+
+    log = FrameLog(args.path)
+    print(f"{args.path}: {len(log)} frames, {log.num_leds} LEDs, {log.duration():.2f}s")
+    if args.command == "play":
+        from ArcadeDriver import Arcade
+        cab = Arcade(port=args.port, num_leds=log.num_leds)
+        try:
+            replay(log, cab, speed=args.speed, loop=args.loop)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            cab.close()
+    log.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Arcade Commander - ArcadeScheduler
+
+All periodic GUI work on one Tk timer. Tasks are kept in a heap ordered by
+deadline and only the earliest one is armed with root.after, so the Tk
+thread wakes exactly when something is due and not at all otherwise.
+
+A task is a function returning the delay (seconds) until it wants to run
+again, or None to suspend. A suspended task costs nothing until wake()
+(Tk thread) or wake_threadsafe() (any thread) brings it back.
+
+Other threads never touch Tk: wake_threadsafe() only drops the name into an
+inbox (a SimpleQueue) that the Tk side drains from the "_inbox" task. That
+task polls every INBOX_POLL[0] s while wakeups keep arriving and backs off
+to INBOX_POLL[1] s once the inbox stays empty:
+
+    sched = Scheduler(root)
+    sched.add("inputs", drain_queue)                # starts suspended: runs on wake
+    sched.add("title", step_animation, delay=0.0)   # returns 0.03 while animating
+    sched.wake_threadsafe("inputs")                 # e.g. from the input thread
+    sched.wake("idle", 600)                         # (re)arm: run 10 min from now
+    sched.stats()                                   # runs / next_in / time spent per task
+"""
+
+import heapq
+import itertools
+import queue
+import time
+
+INBOX_POLL = (0.010, 0.100)     # inbox drain interval: right after a wakeup, fully backed off
+
+
+class Task:
+    """One scheduled function and its bookkeeping."""
+
+    __slots__ = ("name", "fn", "deadline", "entry", "runs", "wakeups", "busy", "worst")
+
+    def __init__(self, name: str, fn):
+        self.name = name
+        self.fn = fn
+        self.deadline = None    # monotonic time it is due, None while suspended
+        self.entry = None       # sequence number of its live heap entry
+        self.runs = 0
+        self.wakeups = 0
+        self.busy = 0.0         # seconds spent in fn() in total ...
+        self.worst = 0.0        # ... and in the longest single call
+
+
+class Scheduler:
+    """Deadline-ordered tasks on a single root.after timer (Tk thread only, except wake_threadsafe)."""
+
+    def __init__(self, root):
+        self.root = root
+        self.tasks = {}
+        self.fires = 0              # times the Tk timer went off
+        self._heap = []             # (deadline, seq, task); entries whose seq != task.entry are stale
+        self._seq = itertools.count()
+        self._after_id = None
+        self._armed_at = None
+        self._inbox = queue.SimpleQueue()   # names woken from other threads ...
+        self._pending = set()               # ... and not yet drained on Tk (coalesces repeats)
+        self._poll = INBOX_POLL[1]
+        self.add("_inbox", self._drain_inbox, delay=self._poll)
+
+    def add(self, name: str, fn, delay: float | None = None) -> Task:
+        """Register fn(); it first runs after `delay` seconds (None: suspended until woken)."""
+        self.cancel(name)
+        task = self.tasks[name] = Task(name, fn)
+        if delay is not None:
+            self._schedule(task, time.monotonic() + delay)
+        return task
+
+    def wake(self, name: str, delay: float = 0.0):
+        """Run the task `delay` seconds from now (earlier or later than it was due)."""
+        task = self.tasks.get(name)
+        if task is None:
+            return
+        task.wakeups += 1
+        self._schedule(task, time.monotonic() + delay)
+
+    def wake_threadsafe(self, name: str):
+        """wake(name) from a non-Tk thread (no Tk calls). Repeats before the next drain coalesce."""
+        if name in self._pending:
+            return
+        self._pending.add(name)
+        self._inbox.put(name)
+
+    def suspend(self, name: str):
+        task = self.tasks.get(name)
+        if task:
+            task.deadline = None
+
+    def cancel(self, name: str):
+        task = self.tasks.pop(name, None)
+        if task:
+            task.deadline = task.entry = None
+
+    def close(self):
+        for name in list(self.tasks):
+            self.cancel(name)
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {"fires": self.fires, "queued": len(self._heap), "tasks": {
+            t.name: {"runs": t.runs, "wakeups": t.wakeups,
+                     "next_in": None if t.deadline is None else round(t.deadline - now, 3),
+                     "busy_ms": round(t.busy * 1000, 2), "worst_ms": round(t.worst * 1000, 3)}
+            for t in self.tasks.values()}}
+
+    # ---------------- Internals ----------------
+    def _drain_inbox(self) -> float:
+        woken = False
+        while True:
+            try:
+                name = self._inbox.get_nowait()
+            except queue.Empty:
+                break
+            self._pending.discard(name)  # before wake(): a later call queues again
+            self.wake(name)
+            woken = True
+        self._poll = INBOX_POLL[0] if woken else min(self._poll * 2, INBOX_POLL[1])
+        return self._poll
+
+    def _schedule(self, task: Task, deadline: float):
+        postpone = task.entry is not None and task.deadline is not None and deadline >= task.deadline
+        task.deadline = deadline
+        if postpone:
+            return  # the existing entry fires first and is pushed back then
+        task.entry = next(self._seq)
+        heapq.heappush(self._heap, (deadline, task.entry, task))
+        self._arm()
+
+    def _arm(self):
+        """Point the Tk timer at the earliest live entry (dropping stale ones)."""
+        heap = self._heap
+        while heap and (heap[0][2].entry != heap[0][1] or heap[0][2].deadline is None):
+            _, seq, task = heapq.heappop(heap)
+            if task.entry == seq:
+                task.entry = None
+        if not heap:
+            return
+        due = heap[0][0]
+        if self._after_id is not None:
+            if self._armed_at <= due:
+                return
+            self.root.after_cancel(self._after_id)
+        self._armed_at = due
+        self._after_id = self.root.after(max(0, int((due - time.monotonic()) * 1000 + 0.999)), self._fire)
+
+    def _fire(self):
+        self._after_id = None
+        self.fires += 1
+        heap = self._heap
+        now = time.monotonic()
+        while heap and heap[0][0] <= now + 0.001:
+            deadline, seq, task = heapq.heappop(heap)
+            if task.entry != seq:
+                continue  # superseded by an earlier entry or cancelled
+            task.entry = None
+            if task.deadline is None:
+                continue  # suspended
+            if task.deadline > deadline:
+                task.entry = next(self._seq)  # postponed while queued
+                heapq.heappush(heap, (task.deadline, task.entry, task))
+                continue
+            task.deadline = None
+            t0 = time.perf_counter()
+            try:
+                delay = task.fn()
+            except Exception as e:
+                print(f"Scheduler task {task.name}: {type(e).__name__}: {e}")
+                delay = None
+            dt = time.perf_counter() - t0
+            task.busy += dt
+            task.worst = max(task.worst, dt)
+            task.runs += 1
+            if delay is not None and task.deadline is None and self.tasks.get(task.name) is task:
+                self._schedule(task, time.monotonic() + delay)
+        self._arm()
@@ -0,0 +1,261 @@
+"""
+Arcade Commander - ArcadeTimeline
+
+Declarative light shows: JSON keyframe timelines compiled once into a dense
+RGBA frame array, cached on disk and streamed at playback.
+
+Format (same style as the profiles):
+
+    {
+      "name": "attract",
+      "fps": 33.3,
+      "duration": 7.65,
+      "loop": true,
+      "groups": {"FIGHT": ["P1_A", "P1_B", "P1_C", "P1_X", "P1_Y", "P1_Z"]},
+      "tracks": [
+        {"target": "FIGHT", "loop": 3.825, "stagger": 0.3,
+         "keys": [{"t": 0.0,   "color": [0, 255, 0]},
+                  {"t": 1.275, "color": [255, 0, 0]},
+                  {"t": 2.55,  "color": [0, 0, 255]},
+                  {"t": 3.825, "color": [0, 255, 0]}]},
+        {"target": "P1_START", "loop": 2.0,
+         "keys": [{"t": 0.0, "color": [0, 0, 0], "ease": "ease_in_out"},
+                  {"t": 1.0, "color": [255, 0, 0], "ease": "ease_in_out"},
+                  {"t": 2.0, "color": [0, 0, 0]}]}
+      ]
+    }
+
+target: an LED name, a driver index, a group (from "groups", or the built-in
+ALL / P1 / P2), or a list of those. Each key's "ease" shapes the segment up
+to the next key (linear, step, ease_in, ease_out, ease_in_out, smooth). A
+track "loop" repeats its keys with that period, otherwise the last color
+holds. "stagger" offsets each LED of the target by that many seconds (chases).
+Colors may carry a 4th alpha value; LEDs no track touches stay transparent
+so the layers below show through. Later tracks draw over earlier ones.
+
+The compiled frames are saved in a per-user cache directory (cache_dir();
+ARCADE_CACHE_DIR overrides it), since a show may sit in a read-only install
+or a frozen bundle, as <file>.<path hash>.<content hash>.timeline.npy and
+memory-mapped on load, so a cabinet only recompiles when the file (or the
+LED map) changes.
+
+    python ArcadeTimeline.py compile assets/attract.show.json
+    python ArcadeTimeline.py play assets/attract.show.json --port COM3
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+
+
+COMPILER_VERSION = 1
+DEFAULT_FPS = 1 / 0.030
+MAX_FRAMES = 20000          # refuse runaway durations (about 10 minutes at 33 FPS)
+
+EASINGS = {
+    "linear": lambda u: u,
+    "step": lambda u: np.zeros_like(u),
+    "ease_in": lambda u: u * u,
+    "ease_out": lambda u: 1 - (1 - u) * (1 - u),
+    "ease_in_out": lambda u: (1 - np.cos(np.pi * u)) / 2,
+    "smooth": lambda u: u * u * (3 - 2 * u),
+}
+
+
+class Timeline:
+    """Compiled show: frames is (F, num_leds, 4) uint8 RGBA, often a read-only memmap."""
+
+    def __init__(self, frames, fps: float, loop: bool = True, name: str = "", path: str | None = None):
+        self.frames = frames
+        self.fps = float(fps)
+        self.loop = bool(loop)
+        self.name = name
+        self.path = path
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def duration(self) -> float:
+        return len(self.frames) / self.fps
+
+    def index_at(self, elapsed: float) -> int:
+        i = int(elapsed * self.fps)
+        if self.loop:
+            return i % len(self.frames)
+        return min(max(i, 0), len(self.frames) - 1)
+
+    def finished(self, elapsed: float) -> bool:
+        return not self.loop and elapsed * self.fps >= len(self.frames)
+
+
+# ---------------- Compiler ----------------
+def _resolve(target, groups: dict, leds_map: dict) -> list:
+    if isinstance(target, list):
+        out = []
+        for t in target:
+            out.extend(_resolve(t, groups, leds_map))
+        return out
+    if isinstance(target, int):
+        return [target]
+    if target in groups:
+        return _resolve(groups[target], groups, leds_map)
+    if target in leds_map:
+        return [int(leds_map[target])]
+    raise ValueError(f"unknown timeline target {target!r}")
+
+
+def _builtin_groups(leds_map: dict) -> dict:
+    names = list(leds_map)
+    return {"ALL": names,
+            "P1": [n for n in names if n.startswith("P1_")],
+            "P2": [n for n in names if n.startswith("P2_")]}
+
+
+def _compile_track(track: dict, times, groups: dict, leds_map: dict, frames):
+    keys = sorted(track["keys"], key=lambda k: float(k["t"]))
+    if not keys:
+        return
+    kt = np.array([float(k["t"]) for k in keys])
+    kc = np.array([list(k["color"]) + [255] * (4 - len(k["color"])) for k in keys], dtype=np.float64)
+    ease = [k.get("ease", track.get("ease", "linear")) for k in keys]
+    for e in ease:
+        if e not in EASINGS:
+            raise ValueError(f"unknown easing {e!r}")
+
+    leds = _resolve(track["target"], groups, leds_map)
+    stagger = float(track.get("stagger", 0.0))
+    t = times[None, :] + (np.arange(len(leds)) * stagger)[:, None]     # (L, F)
+    period = track.get("loop")
+    if period:
+        t = np.mod(t, float(period))
+
+    if len(keys) == 1:
+        colors = np.broadcast_to(kc[0], t.shape + (4,))
+    else:
+        seg = np.clip(np.searchsorted(kt, t, side="right") - 1, 0, len(keys) - 2)
+        span = kt[seg + 1] - kt[seg]
+        u = np.clip((t - kt[seg]) / np.where(span > 0, span, 1.0), 0.0, 1.0)
+        for name in set(ease[:-1]):
+            if name != "linear":
+                sel = np.isin(seg, [i for i, e in enumerate(ease[:-1]) if e == name])
+                u[sel] = EASINGS[name](u[sel])
+        c0, c1 = kc[seg], kc[seg + 1]
+        colors = c0 + (c1 - c0) * u[..., None]
+    frames[:, leds, :] = np.rint(colors).astype(np.uint8).transpose(1, 0, 2)
+
+
+def compile_timeline(spec: dict, leds_map: dict, num_leds: int) -> np.ndarray:
+    """Render every frame of `spec` into an (F, num_leds, 4) uint8 RGBA array."""
+    fps = float(spec.get("fps", DEFAULT_FPS))
+    duration = spec.get("duration")
+    if duration is None:
+        # default: long enough for the slowest track (its loop, or its last key)
+        duration = max((float(tr.get("loop") or max(float(k["t"]) for k in tr["keys"]))
+                        for tr in spec["tracks"] if tr.get("keys")), default=0.0)
+    count = max(1, int(round(float(duration) * fps)))
+    if count > MAX_FRAMES:
+        raise ValueError(f"timeline too long ({count} frames, max {MAX_FRAMES})")
+    groups = _builtin_groups(leds_map)
+    groups.update(spec.get("groups", {}))
+
+    frames = np.zeros((count, num_leds, 4), dtype=np.uint8)
+    times = np.arange(count) / fps
+    for track in spec["tracks"]:
+        _compile_track(track, times, groups, leds_map, frames)
+    return frames
+
+
+def _content_hash(raw: bytes, leds_map: dict, num_leds: int) -> str:
+    h = hashlib.sha1(raw)
+    h.update(json.dumps([COMPILER_VERSION, num_leds, sorted(leds_map.items())]).encode())
+    return h.hexdigest()[:16]
+
+
+def cache_dir() -> str:
+    """Where compiled timelines go: ARCADE_CACHE_DIR, else the user's local cache directory."""
+    base = os.environ.get("ARCADE_CACHE_DIR")
+    if not base:
+        root = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or \
+            os.path.join(os.path.expanduser("~"), ".cache")
+        base = os.path.join(root, "ArcadeCommander", "timelines")
+    return base
+
+
+def load_timeline(path: str, leds_map: dict, num_leds: int, cache: bool = True) -> Timeline:
+    """Parse `path`, reusing its compiled frames from cache_dir() when present (compiling them otherwise)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    spec = json.loads(raw)
+    fps = float(spec.get("fps", DEFAULT_FPS))
+    loop = bool(spec.get("loop", True))
+    name = spec.get("name", os.path.splitext(os.path.basename(path))[0])
+
+    # one cache entry per source file: the path hash keeps same-named shows apart
+    stem = os.path.join(cache_dir(), os.path.basename(path) + "." +
+                        hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8])
+    cached = f"{stem}.{_content_hash(raw, leds_map, num_leds)}.timeline.npy"
+    if cache and os.path.exists(cached):
+        try:
+            frames = np.load(cached, mmap_mode="r")
+            if frames.shape[1:] == (num_leds, 4):
+                return Timeline(frames, fps, loop, name, path)
+        except (OSError, ValueError):
+            pass  # unreadable cache: recompile
+
+    frames = compile_timeline(spec, leds_map, num_leds)
+    if cache:
+        for stale in glob.glob(glob.escape(stem) + ".*.timeline.npy"):
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+        try:
+            os.makedirs(os.path.dirname(cached), exist_ok=True)
+            tmp = cached + ".tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, frames)
+            os.replace(tmp, cached)
+        except OSError as e:
+            print(f"Timeline cache not written: {e}")
+    frames.flags.writeable = False
+    return Timeline(frames, fps, loop, name, path)
+
+
+def main():
+    from ArcadeDriver import Arcade
+
+    ap = argparse.ArgumentParser(description="Arcade Commander timeline tool")
+    ap.add_argument("command", choices=["compile", "play"])
+    ap.add_argument("path")
+    ap.add_argument("--port", default=None, help="output port (default: driver DEFAULT_PORT)")
+    args = ap.parse_args()
+
+    if args.command == "compile":
+        t0 = time.perf_counter()
+        tl = load_timeline(args.path, Arcade.LEDS, 30)
+        print(f"{args.path}: {len(tl)} frames @ {tl.fps:.1f} FPS ({tl.duration:.2f}s) "
+              f"in {(time.perf_counter() - t0) * 1000:.1f} ms")
+        return
+
+    cab = Arcade(port=args.port)
+    tl = load_timeline(args.path, cab.LEDS, cab.num_leds)
+    try:
+        t0 = time.monotonic()
+        while not tl.finished(time.monotonic() - t0):
+            cab.load_rgb(np.ascontiguousarray(tl.frames[tl.index_at(time.monotonic() - t0), :, :3]).ravel())
+            cab.show()
+            time.sleep(1.0 / tl.fps)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        cab.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Arcade Commander - ArcadeTransport
+
+Byte sinks the Arcade driver can write Adalight frames to. The `port` string
+picks the backend:
+
+    COM3, /dev/ttyACM0     pyserial (the PicoCTR)
+    loop://, socket://...  pyserial URL handlers
+    null://                discard, count bytes/frames (profiling, benchmarks)
+    file:///tmp/out.ada    append raw frames to a file or named pipe
+    pty://                 pseudo-terminal pair; a reader attaches to .slave_name
+    tcp://host:port        remote LED bridge over TCP
+
+Every backend looks like the small part of serial.Serial the driver uses:
+write / read / in_waiting / timeout / baudrate / flush / reset_output_buffer /
+close. Write timeouts raise TransportTimeout, which the driver already treats
+like a serial write timeout (skip the frame).
+"""
+
+import os
+import socket
+
+try:
+    import serial
+    from serial import SerialTimeoutException
+    SERIAL_AVAILABLE = True
+except ImportError:
+    serial = None
+    SERIAL_AVAILABLE = False
+
+    class SerialTimeoutException(Exception):
+        pass
+
+
+class TransportTimeout(SerialTimeoutException):
+    """A write did not complete in time (handled like a serial write timeout)."""
+
+
+class Transport:
+    """Base for non-serial backends. Subclasses implement write()."""
+
+    # Arduino-style boards reset when the port opens; nothing here does,
+    # so the driver skips its boot/handshake wait.
+    resets_on_open = False
+
+    def __init__(self, baud: int = 0, timeout: float | None = None, write_timeout: float | None = None):
+        self.baudrate = baud
+        self.timeout = timeout
+        self.write_timeout = write_timeout
+        self.is_open = True
+
+    @property
+    def in_waiting(self) -> int:
+        return 0
+
+    def read(self, size: int = 1) -> bytes:
+        return b""
+
+    def write(self, data) -> int:
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def reset_output_buffer(self):
+        pass
+
+    def close(self):
+        self.is_open = False
+
+
+class NullTransport(Transport):
+    """Discards everything; counts what would have been sent."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.bytes_written = 0
+        self.frames_written = 0
+
+    def write(self, data) -> int:
+        n = len(data)
+        self.bytes_written += n
+        self.frames_written += 1
+        return n
+
+
+class FileTransport(Transport):
+    """Appends raw frames to a file, device node or named pipe."""
+
+    def __init__(self, path: str, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.path = path
+        self._f = open(path, "ab", buffering=0)
+
+    def write(self, data) -> int:
+        return self._f.write(data)
+
+    def flush(self):
+        self._f.flush()
+
+    def close(self):
+        super().close()
+        self._f.close()
+
+
+class PtyTransport(Transport):
+    """
+    Pseudo-terminal pair (POSIX). Frames go to the master side; point any
+    serial tool or a second Arcade consumer at `slave_name`.
+    A full pty buffer (nobody reading) raises TransportTimeout instead of blocking.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._master, self._slave = os.openpty()
+        os.set_blocking(self._master, False)
+        self.slave_name = os.ttyname(self._slave)
+        print(f"PTY transport: attach to {self.slave_name}")
+
+    def write(self, data) -> int:
+        try:
+            return os.write(self._master, data)
+        except BlockingIOError:
+            raise TransportTimeout("pty buffer full")
+
+    def close(self):
+        super().close()
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class TcpTransport(Transport):
+    """Adalight byte stream to a remote LED bridge."""
+
+    def __init__(self, host: str, port: int, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._sock = socket.create_connection((host, port), timeout=5.0)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock.settimeout(self.write_timeout)
+
+    def write(self, data) -> int:
+        try:
+            self._sock.sendall(data)
+        except socket.timeout:
+            raise TransportTimeout("tcp send timed out")
+        return len(data)
+
+    def close(self):
+        super().close()
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+def _split_host(rest: str):
+    host, _, port = rest.rstrip("/").rpartition(":")
+    if not host or not port.isdigit():
+        raise ValueError(f"expected host:port, got {rest!r}")
+    return host, int(port)
+
+
+def open_transport(port: str, baud: int, timeout: float | None = None, write_timeout: float | None = None):
+    """Open the backend named by `port` (see module docstring)."""
+    scheme, sep, rest = str(port).partition("://")
+    if sep:
+        scheme = scheme.lower()
+        if scheme == "null":
+            return NullTransport(baud, timeout, write_timeout)
+        if scheme == "file":
+            return FileTransport(rest, baud, timeout, write_timeout)
+        if scheme == "pty":
+            return PtyTransport(baud, timeout, write_timeout)
+        if scheme == "tcp":
+            host, tcp_port = _split_host(rest)
+            return TcpTransport(host, tcp_port, baud, timeout, write_timeout)
+
+    if not SERIAL_AVAILABLE:
+        raise RuntimeError("pyserial not installed (pip install pyserial)")
+    if sep:
+        # loop://, socket://, rfc2217:// ... handled by pyserial
+        return serial.serial_for_url(port, baud, timeout=timeout, write_timeout=write_timeout)
+    return serial.Serial(port, baud, timeout=timeout, write_timeout=write_timeout)
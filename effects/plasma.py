@@ -0,0 +1,13 @@
+"""Example effect plugin: a slow two-wave plasma across the strip."""
+
+import numpy as np
+
+NAME = "Plasma"
+
+
+def render(t, frame, state):
+    x = np.arange(state.num_leds, dtype=np.float32)
+    v = np.sin(x * 0.35 + t * 1.3) + np.sin(x * 0.13 - t * 0.7)
+    frame[:, 0] = 127.5 + 127.5 * np.sin(v * np.pi)
+    frame[:, 1] = 127.5 + 127.5 * np.sin(v * np.pi + 2.1)
+    frame[:, 2] = 127.5 + 127.5 * np.sin(v * np.pi + 4.2)
@@ -0,0 +1,14 @@
+"""Example effect plugin: the current profile colors, breathing together."""
+
+import numpy as np
+
+NAME = "Profile Breathe"
+
+
+def render(t, frame, state):
+    leds = state.leds
+    if leds is None:
+        return False
+    level = 0.2 + 0.8 * (np.sin(t * 2.0) + 1) / 2
+    frame[:] = 0.0
+    frame[leds.index] = leds.primary * level